@@ -0,0 +1,28 @@
+import pytest
+
+from click_inspect import commands_from, inspect_module, make_command
+
+
+@pytest.mark.parametrize('n', [10, 100])
+@pytest.mark.parametrize('backend', ['napoleon', 'fast'])
+@pytest.mark.benchmark(group='batch')
+def bench_make_command_loop(benchmark, cold, make_service_module, n, backend):
+    module = make_service_module(n)
+    functions = [getattr(module, f'op_{i}') for i in range(n)]
+    benchmark.pedantic(lambda: [make_command(f, docstring_backend=backend) for f in functions],
+                       rounds=5, **cold)
+
+
+@pytest.mark.parametrize('n', [10, 100])
+@pytest.mark.parametrize('backend', ['napoleon', 'fast'])
+@pytest.mark.benchmark(group='batch')
+def bench_commands_from(benchmark, cold, make_service_module, n, backend):
+    module = make_service_module(n)
+    benchmark.pedantic(lambda: commands_from(module, docstring_backend=backend), rounds=5, **cold)
+
+
+@pytest.mark.parametrize('workers', [None, 2, 0])
+@pytest.mark.benchmark(group='batch-workers')
+def bench_inspect_module_workers(benchmark, cold, make_service_module, workers):
+    module = make_service_module(1000)
+    benchmark.pedantic(lambda: inspect_module(module, workers=workers), rounds=3, **cold)
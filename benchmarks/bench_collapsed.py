@@ -0,0 +1,57 @@
+import click
+import pytest
+
+from click_inspect import add_options_from
+
+
+SIZES = [100, 300, 600]
+EXPOSE = 10  # The number of options of their own in collapsed mode.
+MODES = {'options': None, 'collapsed': EXPOSE}
+TYPES = [('int', '1'), ('str', 'a'), ('float', '0.5'), ('bool', 'true')]
+
+
+def make_function(n):
+    """Create a configuration function with `n` annotated and documented keyword-only parameters."""
+    parameters = ', '.join(f'p{i}: {TYPES[i % len(TYPES)][0]} = None' for i in range(n))
+    namespace = {}
+    exec(f'def func(*, {parameters}): pass', namespace)
+    func = namespace['func']
+    func.__doc__ = '\n'.join(['Configure.', '', 'Args:', *(f'    p{i}: Parameter {i}.' for i in range(n))])
+    return func
+
+
+def make_args(n, mode):
+    """Set the first two and three of the last parameters (the latter via `--set` in collapsed mode)."""
+    args = ['--p0', '1', '--p1', 'a']
+    for i in range(n - 4, n - 1):
+        name, value = f'p{i}', TYPES[i % len(TYPES)][1]
+        args.extend([f'--{name}', value] if MODES[mode] is None else ['--set', f'{name}={value}'])
+    return args
+
+
+@pytest.mark.parametrize('n', SIZES)
+@pytest.mark.parametrize('mode', list(MODES))
+@pytest.mark.benchmark(group='collapsed-decorate')
+def bench_decorate(benchmark, n, mode):
+    decorator = add_options_from(make_function(n), expose=MODES[mode])  # Inspection is linear in `n`.
+    command = benchmark(lambda: click.command()(decorator(lambda **kwargs: None)))
+    assert len(command.params) == (n if MODES[mode] is None else EXPOSE + 1)
+
+
+@pytest.mark.parametrize('n', SIZES)
+@pytest.mark.parametrize('mode', list(MODES))
+@pytest.mark.benchmark(group='collapsed-parse')
+def bench_parse(benchmark, n, mode):
+    command = click.command()(add_options_from(make_function(n), expose=MODES[mode])(lambda **kwargs: None))
+    args = make_args(n, mode)
+    ctx = benchmark(lambda: command.make_context('cmd', list(args)))
+    assert ctx.params['p0'] == 1 and ctx.params[f'p{n - 4}'] == 1 and len(ctx.params) == n
+
+
+@pytest.mark.parametrize('n', SIZES)
+@pytest.mark.parametrize('mode', list(MODES))
+@pytest.mark.benchmark(group='collapsed-help')
+def bench_help(benchmark, n, mode):
+    command = click.command()(add_options_from(make_function(n), expose=MODES[mode])(lambda **kwargs: None))
+    ctx = command.make_context('cmd', [], resilient_parsing=True)
+    benchmark(command.get_help, ctx)
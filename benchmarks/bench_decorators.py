@@ -0,0 +1,43 @@
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import click
+from conftest import make_function
+import pytest
+
+from click_inspect import add_options_from
+from click_inspect.decorators import _parse_type_hint_into_kwargs
+
+
+@pytest.mark.parametrize('n', [5, 20, 100])
+@pytest.mark.parametrize('backend', ['napoleon', 'fast'])
+@pytest.mark.benchmark(group='add_options_from')
+def bench_add_options_from(benchmark, cold, n, backend):
+    func = make_function(n)
+
+    def decorate():
+        return click.command()(add_options_from(func, docstring_backend=backend)(lambda **kwargs: None))
+
+    command = benchmark.pedantic(decorate, rounds=20, **cold)
+    assert len(command.params) == n
+
+
+@pytest.mark.parametrize('n', [5, 100])
+@pytest.mark.benchmark(group='add_options_from')
+def bench_add_options_from_cached(benchmark, n):
+    func = make_function(n)
+    add_options_from(func)
+    benchmark(lambda: click.command()(add_options_from(func)(lambda **kwargs: None)))
+
+
+@pytest.mark.parametrize('tp', [
+    int,
+    List[int],
+    Sequence[Tuple[int, str]],
+    Tuple[int, str, float],
+    Optional[List[int]],
+    Union[int, str],
+    Dict[str, List[Tuple[int, int]]],
+], ids=repr)
+@pytest.mark.benchmark(group='type_hints')
+def bench_parse_type_hint_into_kwargs(benchmark, tp):
+    benchmark(_parse_type_hint_into_kwargs, tp)
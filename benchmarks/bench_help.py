@@ -0,0 +1,43 @@
+import click
+from click.testing import CliRunner
+from conftest import make_function
+import pytest
+
+from click_inspect import add_options_from
+
+
+def _make_group(n, *, lazy):
+    group = click.Group('cli')
+    for i in range(n):
+        func = make_function(10)
+
+        @group.command(f'command-{i}', help=f'Command {i}.')
+        @add_options_from(func, lazy=lazy)
+        def command(**kwargs):
+            pass
+    return group
+
+
+@pytest.mark.parametrize('n', [10, 100])
+@pytest.mark.parametrize('lazy', [False, True], ids=['eager', 'lazy'])
+@pytest.mark.benchmark(group='help')
+def bench_group_help(benchmark, cold, n, lazy):
+    runner = CliRunner()
+
+    def run():
+        return runner.invoke(_make_group(n, lazy=lazy), ['--help'])
+
+    result = benchmark.pedantic(run, rounds=5, **cold)
+    assert result.exit_code == 0
+
+
+@pytest.mark.parametrize('n', [10, 100])
+@pytest.mark.benchmark(group='help')
+def bench_command_help(benchmark, cold, n):
+    runner = CliRunner()
+
+    def run():
+        return runner.invoke(_make_group(n, lazy=True), [f'command-{n - 1}', '--help'])
+
+    result = benchmark.pedantic(run, rounds=5, **cold)
+    assert result.exit_code == 0
@@ -0,0 +1,22 @@
+import subprocess
+import sys
+
+import pytest
+
+
+def _python(code):
+    subprocess.run([sys.executable, '-c', code], check=True)
+
+
+@pytest.mark.benchmark(group='import')
+def bench_interpreter_startup(benchmark):
+    benchmark.pedantic(_python, args=('pass',), rounds=10)
+
+
+@pytest.mark.parametrize('statement', [
+    'import click_inspect',
+    'from click_inspect import add_options_from',
+])
+@pytest.mark.benchmark(group='import')
+def bench_import(benchmark, statement):
+    benchmark.pedantic(_python, args=(statement,), rounds=10)
@@ -0,0 +1,15 @@
+from conftest import make_docstring
+import pytest
+
+from click_inspect.parser import parse_docstring
+
+
+@pytest.mark.parametrize('n', [5, 50])
+@pytest.mark.parametrize('style', ['google', 'numpy', 'rest'])
+@pytest.mark.parametrize('backend', ['napoleon', 'fast'])
+@pytest.mark.benchmark(group='parse_docstring')
+def bench_parse_docstring(benchmark, backend, style, n):
+    doc = make_docstring(style, n)
+    parse_docstring(doc, backend=backend)  # Import the backends outside of the measurement.
+    result = benchmark(parse_docstring, doc, backend=backend)
+    assert len(result) == n
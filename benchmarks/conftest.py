@@ -0,0 +1,82 @@
+import sys
+import textwrap
+import types
+
+import pytest
+
+from click_inspect import clear_cache
+
+
+FUNCTION_TEMPLATE = '''
+def op_{index}(name, count=1, *, ratio: float = 0.5, tags=(), verbose=False, limit=None):
+    """Operation {index}.
+
+    Args:
+        name (str): The name.
+        count (int): The count.
+        ratio (float): The ratio.
+        tags (list of str): The tags.
+        verbose (bool): Verbose output.
+        limit (int or None): The limit.
+    """
+'''
+
+# Type strings and annotations which are cycled through for the generated parameters.
+TYPES = [('int', 'int'), ('str', 'str'), ('float', 'float'), ('list of int', 'List[int]'),
+         ('(int, str)', 'Tuple[int, str]'), ('bool', 'bool')]
+
+
+def make_docstring(style, n):
+    """Create a docstring in the given style ('google', 'numpy' or 'rest') with `n` parameters."""
+    lines = ['Short description.', '', 'Long description', 'spanning multiple lines.', '']
+    if style == 'google':
+        lines.append('Args:')
+        lines.extend(f'    p{i} ({TYPES[i % len(TYPES)][0]}): Parameter {i}.' for i in range(n))
+        lines.extend(['', 'Returns:', '    int: The result.'])
+    elif style == 'numpy':
+        lines.extend(['Parameters', '----------'])
+        for i in range(n):
+            lines.extend([f'p{i} : {TYPES[i % len(TYPES)][0]}', f'    Parameter {i}.'])
+        lines.extend(['', 'Returns', '-------', 'int', '    The result.'])
+    elif style == 'rest':
+        for i in range(n):
+            lines.extend([f':param p{i}: Parameter {i}.', f':type p{i}: {TYPES[i % len(TYPES)][0]}'])
+        lines.extend([':returns: The result.', ':rtype: int'])
+    else:
+        raise ValueError(style)
+    return '\n'.join(lines)
+
+
+def make_function(n, *, style='google'):
+    """Create a function with `n` annotated keyword-only parameters (with defaults) and a docstring."""
+    parameters = ', '.join(f'p{i}: {TYPES[i % len(TYPES)][1]} = None' for i in range(n))
+    namespace = {}
+    exec(f'from typing import List, Tuple\ndef func(*, {parameters}): pass', namespace)
+    func = namespace['func']
+    func.__doc__ = make_docstring(style, n)
+    return func
+
+
+@pytest.fixture
+def make_service_module():
+    """Return a function which creates a module with `n` documented functions (`op_0`, `op_1`, ...)."""
+    created = []
+
+    def _make(n):
+        name = f'bench_service_{len(created)}'
+        module = types.ModuleType(name)
+        source = '\n'.join(textwrap.dedent(FUNCTION_TEMPLATE).format(index=i) for i in range(n))
+        exec(source, vars(module))
+        sys.modules[name] = module
+        created.append(name)
+        return module
+
+    yield _make
+    for name in created:
+        del sys.modules[name]
+
+
+@pytest.fixture
+def cold():
+    """Clear all caches before each round so that every round measures a full inspection."""
+    return {'setup': clear_cache}
@@ -3,6 +3,21 @@ import nox
 
 nox.options.sessions = 'lint', 'tests'
 file_locations = 'src',
+benchmark_storage = 'benchmarks/.baselines'
+benchmark_threshold = '25%'  # Maximum regression of the mean time w.r.t. the stored baseline.
+
+
+# Compare against the latest stored run. Store a baseline via `nox -s benchmarks -- --benchmark-save=baseline`
+# and rerun (offline) via `nox -R -s benchmarks`.
+@nox.session(python='3.8')
+def benchmarks(session):
+    benchmark_args = session.posargs or [
+        '--benchmark-compare',
+        f'--benchmark-compare-fail=mean:{benchmark_threshold}',
+    ]
+    session.run('poetry', 'install', external=True)
+    session.install('pytest-benchmark')
+    session.run('pytest', 'benchmarks', f'--benchmark-storage={benchmark_storage}', *benchmark_args)
 
 
 @nox.session(python='3.8')
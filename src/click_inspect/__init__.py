@@ -1,9 +1,37 @@
-try:
-    from importlib.metadata import version  # type: ignore
-except ImportError:
-    from importlib_metadata import version  # type: ignore
+import importlib
 
-__version__ = version(__name__)
 
+# Submodules are imported on first attribute access (PEP 562) so that `import click_inspect`
+# stays cheap for short-lived command line tools.
+_LAZY_ATTRIBUTES = {
+    'add_options_from': 'decorators',
+    'inspect_options': 'decorators',
+    'OptionSpec': 'specs',
+    'commands_from': 'batch',
+    'inspect_module': 'batch',
+    'clear_cache': 'cache',
+    'LazyGroup': 'groups',
+    'make_command': 'commands',
+    'type_cache_info': 'parser',
+}
 
-from .decorators import add_options_from
+
+def __getattr__(name):
+    if name == '__version__':
+        try:
+            from importlib.metadata import version  # type: ignore
+        except ImportError:
+            from importlib_metadata import version  # type: ignore
+        value = version(__name__)
+    else:
+        try:
+            module = _LAZY_ATTRIBUTES[name]
+        except KeyError:
+            raise AttributeError(f'module {__name__!r} has no attribute {name!r}') from None
+        value = getattr(importlib.import_module(f'.{module}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted({*globals(), '__version__', *_LAZY_ATTRIBUTES})
@@ -0,0 +1,4 @@
+from .cli import main
+
+
+main(prog_name='python -m click_inspect')
@@ -0,0 +1,176 @@
+import asyncio
+import atexit
+import inspect
+import os
+import threading
+from typing import Any, Awaitable, Callable, List, Optional
+
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_thread: Optional[threading.Thread] = None
+_lock = threading.Lock()
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """Return the shared event loop, starting it on first use.
+
+    The loop runs in a background thread for the lifetime of the process, so coroutines can be
+    run from any thread (see `run`) without creating a new loop per call. It is a uvloop loop
+    if `uvloop` is installed.
+
+    Returns:
+        asyncio.AbstractEventLoop: The loop.
+    """
+    global _loop, _thread
+    with _lock:
+        if _loop is None:
+            loop = _new_event_loop()
+            ready = threading.Event()
+            thread = threading.Thread(target=_run_forever, args=(loop, ready), name='click-inspect-loop', daemon=True)
+            thread.start()
+            ready.wait()
+            _loop, _thread = loop, thread
+        return _loop
+
+
+def run(awaitable: Awaitable) -> Any:
+    """Run the awaitable on the shared event loop and wait for its result.
+
+    If the waiting thread is interrupted (`KeyboardInterrupt`), the awaitable is cancelled.
+
+    Args:
+        awaitable: The coroutine (or other awaitable).
+
+    Returns:
+        The result of the awaitable.
+
+    Raises:
+        RuntimeError: If called from a coroutine which runs on the shared loop (which would deadlock).
+        KeyboardInterrupt: If interrupted while waiting (after cancelling the awaitable).
+    """
+    loop = get_loop()
+    if _running_loop() is loop:
+        raise RuntimeError('Cannot wait for the shared event loop from within the loop, use await instead')
+    future = asyncio.run_coroutine_threadsafe(_await(awaitable), loop)
+    try:
+        return future.result()
+    except KeyboardInterrupt:
+        future.cancel()
+        raise
+
+
+def gather(*awaitables: Awaitable, limit: Optional[int] = None) -> List[Any]:
+    """Run the awaitables concurrently on the shared event loop and return their results.
+
+    This can be used for running several (inspected) coroutine functions at once, e.g.
+    ``gather(fetch(url=a), fetch(url=b), limit=10)``.
+
+    Args:
+        *awaitables: The coroutines (or other awaitables).
+        limit (int): The maximum number of awaitables which run at the same time (unlimited by default).
+
+    Returns:
+        list: The results in the order of the awaitables.
+    """
+    return run(_gather(awaitables, limit))
+
+
+class AsyncExecutor:
+    """Executor which runs coroutine functions on the shared event loop (see `get_loop`).
+
+    It provides the part of the `concurrent.futures.Executor` interface which is used by
+    :func:`click_inspect.mapping.map_call`.
+
+    Args:
+        max_workers (int): The maximum number of coroutines which run at the same time.
+    """
+
+    def __init__(self, max_workers: int):
+        self._loop = get_loop()
+        self._semaphore = run(_semaphore(max_workers))  # Created on the loop (required for Python < 3.10).
+
+    def submit(self, fn: Callable[..., Any], *args, **kwargs):
+        """Schedule `fn(*args, **kwargs)` and await its result if it is awaitable.
+
+        Args:
+            fn (callable): The (coroutine) function.
+            *args: Positional arguments for `fn`.
+            **kwargs: Keyword arguments for `fn`.
+
+        Returns:
+            concurrent.futures.Future: The future of the result (cancelling it cancels the coroutine).
+        """
+        return asyncio.run_coroutine_threadsafe(self._call(fn, args, kwargs), self._loop)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Nothing to do since the shared loop keeps running (for compatibility with executors)."""
+
+    async def _call(self, fn, args, kwargs):
+        async with self._semaphore:
+            return await _await(fn(*args, **kwargs))
+
+
+def _new_event_loop() -> asyncio.AbstractEventLoop:
+    try:
+        import uvloop  # type: ignore
+    except ImportError:
+        return asyncio.new_event_loop()
+    return uvloop.new_event_loop()
+
+
+def _run_forever(loop: asyncio.AbstractEventLoop, ready: threading.Event) -> None:
+    asyncio.set_event_loop(loop)
+    loop.call_soon(ready.set)
+    try:
+        loop.run_forever()
+    finally:
+        loop.close()
+
+
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+async def _await(awaitable):
+    return await awaitable if inspect.isawaitable(awaitable) else awaitable
+
+
+async def _semaphore(value: int) -> asyncio.Semaphore:
+    return asyncio.Semaphore(value)
+
+
+async def _gather(awaitables, limit: Optional[int]) -> List[Any]:
+    if limit is None:
+        return list(await asyncio.gather(*awaitables))
+    semaphore = asyncio.Semaphore(limit)
+
+    async def _limited(awaitable):
+        async with semaphore:
+            return await awaitable
+
+    return list(await asyncio.gather(*map(_limited, awaitables)))
+
+
+@atexit.register
+def _shutdown() -> None:
+    """Stop the shared loop at exit, so pending callbacks do not run during interpreter shutdown."""
+    global _loop, _thread
+    with _lock:
+        loop, thread, _loop, _thread = _loop, _thread, None, None
+    if loop is not None and thread is not None and not loop.is_closed():
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=1)
+
+
+def _reset_after_fork() -> None:
+    """The loop's thread does not exist in a forked child process (e.g. of the daemon), so start anew."""
+    global _loop, _thread, _lock
+    _loop = _thread = None
+    _lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
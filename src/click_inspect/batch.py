@@ -0,0 +1,169 @@
+from concurrent.futures import ProcessPoolExecutor
+import functools
+import inspect
+import os
+from types import ModuleType
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import click
+
+from .cache import inspect_function, Introspection, is_cached
+from .commands import make_command
+from .errors import UnsupportedDocstringStyle
+from .parser import _extract_fields, _import_napoleon, _import_typestring_parser, type_resolver_for
+
+
+Fields = List[Tuple[str, str, str]]  # `(role, name, text)` of docstring fields.
+
+
+def members(obj, *, predicate: Optional[Callable[[str, Any], bool]] = None) -> List[Tuple[str, Any]]:
+    """Return the public callables of a module or the public methods of a class (or instance).
+
+    For a module only functions which are defined in that module are considered (not imported ones).
+    For a class only static and class methods are considered since instance methods require an
+    instance; pass an instance of the class to consider its (bound) instance methods as well.
+
+    Args:
+        obj (module, class or instance): The object whose members are to be returned.
+        predicate (callable): Receives the name and the callable and returns whether to use it.
+
+    Returns:
+        list: `(name, callable)` pairs in definition order.
+    """
+    if isinstance(obj, ModuleType):
+        candidates = [(name, value) for name, value in vars(obj).items()
+                      if inspect.isfunction(value) and value.__module__ == obj.__name__]
+    else:
+        cls = obj if isinstance(obj, type) else type(obj)
+        candidates = []
+        for name, value in _class_namespace(cls).items():
+            if isinstance(value, (staticmethod, classmethod)) or (inspect.isfunction(value) and obj is not cls):
+                candidates.append((name, getattr(obj, name)))
+    return [(name, value) for name, value in candidates
+            if not name.startswith('_') and (predicate is None or predicate(name, value))]
+
+
+def inspect_module(obj, *,
+                   predicate: Optional[Callable[[str, Any], bool]] = None,
+                   docstring_backend: str = 'napoleon',
+                   workers: Optional[int] = None) -> Dict[str, Introspection]:
+    """Inspect all public callables of a module or all public methods of a class in one pass.
+
+    The results are stored in the same cache which is used by `add_options_from`, so subsequent
+    decorations of the same function objects reuse them.
+
+    For large numbers of functions, the docstrings can be parsed in parallel by worker processes.
+    Type strings which refer to names of the functions' modules are still resolved in the current
+    process. If the worker processes cannot be started, the docstrings are parsed serially.
+
+    Args:
+        obj (module, class or instance): The object whose members are inspected (see `members`).
+        predicate (callable): Receives the name and the callable and returns whether to inspect it.
+        docstring_backend (str): The backend for parsing the docstrings
+                                 (see :func:`click_inspect.parser.parse_docstring`).
+        workers (int): Parse the docstrings in that many worker processes (0 means one per CPU).
+                       By default they are parsed in the current process.
+
+    Returns:
+        dict: Map the names of the callables to their inspection results (in definition order).
+    """
+    return _inspect_members(members(obj, predicate=predicate), backend=docstring_backend, workers=workers)
+
+
+def commands_from(obj, *,
+                  predicate: Optional[Callable[[str, Any], bool]] = None,
+                  cls=click.Command,
+                  workers: Optional[int] = None,
+                  **kwargs) -> List[click.Command]:
+    """Create a command for each public callable of a module or each public method of a class.
+
+    This is equivalent to calling `make_command` for each callable but inspects them in one pass
+    (see `inspect_module`).
+
+    Args:
+        obj (module, class or instance): The object whose members are used (see `members`).
+        predicate (callable): Receives the name and the callable and returns whether to use it.
+        cls (type): The command class.
+        workers (int): Parse the docstrings in that many worker processes (see `inspect_module`).
+        **kwargs: Further keyword arguments for `add_options_from`.
+
+    Returns:
+        list: The commands in definition order.
+    """
+    selected = members(obj, predicate=predicate)
+    _inspect_members(selected, backend=kwargs.get('docstring_backend', 'napoleon'), workers=workers)
+    return [make_command(func, cls=cls, **kwargs) for __, func in selected]
+
+
+def _inspect_members(selected: List[Tuple[str, Any]], *, backend: str,
+                     workers: Optional[int] = None) -> Dict[str, Introspection]:
+    fields: Dict[str, Fields] = {}
+    if workers is not None and workers != 1:
+        docs = {doc: None for doc in (inspect.getdoc(func) for __, func in selected
+                                      if not is_cached(func, backend=backend)) if doc}
+        fields, memo = _parse_in_workers(list(docs), backend=backend, workers=workers)
+        resolvers = {id(r): r for r in (type_resolver_for(func) for __, func in selected) if r is not None}
+        for resolver in resolvers.values():
+            for text, result in memo.items():
+                resolver.add_builtin(text, result)
+    return {name: inspect_function(func, backend=backend, fields=fields.get(inspect.getdoc(func)))  # type: ignore
+            for name, func in selected}
+
+
+def _parse_in_workers(docs: List[str], *, backend: str, workers: int) -> Tuple[Dict[str, Fields], Dict[str, Any]]:
+    """Extract the fields of the docstrings and resolve the type strings as far as possible in worker processes."""
+    if not docs:
+        return {}, {}
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, len(docs) // (4 * workers))
+    _import_typestring_parser()  # Import before forking, so the workers do not have to.
+    if backend == 'napoleon':
+        _import_napoleon()
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            parsed = list(executor.map(functools.partial(_parse_in_worker, backend=backend), docs,
+                                       chunksize=chunksize))
+    except Exception:  # Pool unavailable (or broken), fall back to parsing in the current process.
+        return {}, {}
+    fields: Dict[str, Fields] = {}
+    memo: Dict[str, Any] = {}
+    for doc, (doc_fields, doc_memo) in zip(docs, parsed):
+        if doc_fields is not None:
+            fields[doc] = doc_fields
+        memo.update(doc_memo)
+    return fields, memo
+
+
+def _parse_in_worker(doc: str, *, backend: str) -> Tuple[Optional[Fields], Dict[str, Any]]:
+    """Return the fields of the docstring and the type strings which can be resolved without a namespace."""
+    try:
+        fields = _extract_fields(doc, backend=backend)
+    except UnsupportedDocstringStyle:
+        return None, {}
+    memo = {}
+    for role, __, text in fields:
+        if role == 'type':
+            result = _resolve_without_namespace(text)
+            if result is not None:
+                memo[text] = result
+    return fields, memo
+
+
+@functools.lru_cache(maxsize=None)
+def _resolve_without_namespace(text: str) -> Any:
+    """Resolve the type string if it refers to builtins only (the result is None otherwise)."""
+    typstr_parse, UnsupportedTypeString = _import_typestring_parser()
+    try:
+        return typstr_parse(text)
+    except NameError:  # Refers to names of the function's module.
+        return None
+    except UnsupportedTypeString as err:
+        return err.with_traceback(None)
+
+
+def _class_namespace(cls: type) -> Dict[str, Any]:
+    """Merge the namespaces of the class and its bases, keeping the definition order of the base classes."""
+    namespace: Dict[str, Any] = {}
+    for base in reversed(cls.__mro__[:-1]):  # Exclude `object`.
+        namespace.update(vars(base))
+    return namespace
@@ -0,0 +1,227 @@
+from collections import defaultdict
+import functools
+import inspect
+import sys
+from typing import Any, Callable, Container, DefaultDict, Dict, get_type_hints, List, Optional, Tuple
+import warnings
+import weakref
+
+from . import profiling
+from .errors import UnsupportedDocstringStyle
+from .parser import (
+    _extract_fields,
+    _import_typestring_parser,
+    check_backend,
+    clear_type_cache,
+    resolve_type_string,
+    type_resolver_for,
+)
+
+
+# Attributes of a function which influence the result of the inspection.
+FINGERPRINT_ATTRIBUTES = ('__code__', '__doc__', '__annotations__', '__defaults__', '__kwdefaults__')
+
+
+class Introspection:
+    """The result of inspecting a function, independent of how it is used afterwards.
+
+    Docstring type strings are resolved on first use, so only the types of parameters
+    which are actually used are resolved.
+
+    Args:
+        func (callable): The inspected function (only a weak reference is kept, if possible).
+        signature (inspect.Signature): The signature of the function.
+        type_hints (dict): The type hints of the function (None if `typing.get_type_hints` raised TypeError).
+        fields (list): The `(role, name, text)` fields of the docstring.
+        resolve (callable): Resolves docstring type strings (defaults to the resolver which is
+                            shared by the functions of the same module, see `parser.type_resolver_for`).
+    """
+
+    __slots__ = ('signature', 'type_hints', 'help_texts', 'type_strings', '_func', '_resolve', '_types')
+
+    def __init__(self, func, signature: inspect.Signature, type_hints: Optional[Dict[str, Any]],
+                 fields: List[Tuple[str, str, str]], resolve: Optional[Callable[[str], Any]] = None):
+        self.signature = signature
+        self.type_hints = type_hints
+        self.help_texts: Dict[str, str] = {}
+        self.type_strings: Dict[str, str] = {}
+        for role, name, text in fields:
+            (self.help_texts if role == 'param' else self.type_strings)[name] = text
+        try:
+            self._func = weakref.ref(func)
+        except TypeError:  # Not weak-referenceable, but then it is not cached either.
+            self._func = lambda: func
+        self._resolve = resolve
+        self._types: Dict[str, Tuple[bool, Any]] = {}
+
+    @property
+    def docstring(self) -> Dict[str, Dict[str, Any]]:
+        """Per parameter specification containing 'help' and 'type' (if provided and resolved)."""
+        return dict(self._docstring_parameters(ignore=frozenset(), include=None)[0])
+
+    @property
+    def resolved_types(self) -> Dict[str, Any]:
+        """Docstring types which have been resolved so far, per parameter (resolution happens on demand)."""
+        return {name: value for name, (resolved, value) in self._types.items() if resolved}
+
+    @property
+    def unresolved(self) -> Dict[str, str]:
+        """Warning messages for docstring type strings which cannot be resolved, per parameter."""
+        return self._docstring_parameters(ignore=frozenset(), include=None)[1]
+
+    def docstring_parameters(self, *,
+                             ignore: Container[str] = frozenset(),
+                             include: Optional[Container[str]] = None) -> DefaultDict[str, Dict[str, Any]]:
+        """Return the parsed docstring with the type information of `ignore` parameters removed.
+
+        Args:
+            ignore (set): Ignore the type hint string of those parameters.
+            include (set): Return only those parameters (defaults to all parameters).
+
+        Returns:
+            DefaultDict: Per parameter specification containing 'help' and 'type' (if provided).
+
+        Warns:
+            UserWarning: If the docstring type of a parameter, which is not ignored, cannot be resolved.
+        """
+        parameters, unresolved = self._docstring_parameters(ignore=ignore, include=include)
+        for message in unresolved.values():
+            warnings.warn(message)
+        return parameters
+
+    def _docstring_parameters(self, *, ignore, include) -> Tuple[DefaultDict[str, Dict[str, Any]], Dict[str, str]]:
+        parameters: DefaultDict[str, Dict[str, Any]] = defaultdict(dict)
+        unresolved: Dict[str, str] = {}
+        for name, text in self.help_texts.items():
+            if include is None or name in include:
+                parameters[name]['help'] = text
+        for name in self.type_strings:
+            if name in ignore or include is not None and name not in include:
+                continue
+            resolved, value = self._resolve_type(name)
+            if resolved:
+                parameters[name]['type'] = value
+            elif value is not None:
+                unresolved[name] = value
+        return parameters, unresolved
+
+    def _resolve_type(self, name: str) -> Tuple[bool, Any]:
+        try:
+            return self._types[name]
+        except KeyError:
+            pass
+        func, resolve = self._func(), self._resolve
+        if resolve is None:
+            resolve = type_resolver_for(func)
+        if resolve is None:  # E.g. classes, which have no global namespace.
+            resolve = functools.partial(_import_typestring_parser()[0], func=func)
+        result = self._types[name] = resolve_type_string(self.type_strings[name], resolve, func=func)
+        return result
+
+    def __eq__(self, other):
+        if not isinstance(other, Introspection):
+            return NotImplemented
+        return ((self.signature, self.type_hints, self.docstring, self.unresolved)
+                == (other.signature, other.type_hints, other.docstring, other.unresolved))
+
+    __hash__ = None  # type: ignore
+
+    def __repr__(self):
+        return (f'{type(self).__name__}(signature={self.signature}, type_hints={self.type_hints!r}, '
+                f'help_texts={self.help_texts!r}, type_strings={self.type_strings!r})')
+
+
+_cache: 'weakref.WeakKeyDictionary[Any, Tuple[Tuple[Any, ...], Dict[str, Introspection]]]' = \
+    weakref.WeakKeyDictionary()
+
+
+def inspect_function(func, *, backend: str = 'napoleon',
+                     resolve: Optional[Callable[[str], Any]] = None,
+                     fields: Optional[List[Tuple[str, str, str]]] = None) -> Introspection:
+    """Inspect signature, type hints and docstring of `func`, reusing previous results.
+
+    Results are cached per function object (without keeping it alive) and are recomputed
+    if the code, docstring, annotations or defaults of the function have changed since.
+
+    Args:
+        func (callable): The function to be inspected.
+        backend (str): The backend for parsing the docstring.
+        resolve (callable): Resolves docstring type strings
+                            (see :class:`click_inspect.parser.TypeResolver`).
+        fields (list): The `(role, name, text)` fields of the docstring if they have been
+                       extracted already (e.g. in a worker process).
+
+    Returns:
+        Introspection: The inspection result.
+
+    Raises:
+        TypeError: If `typing.get_type_hints` raises TypeError on Python >= 3.9.
+    """
+    fingerprint, results = _lookup(func)
+    try:
+        result = results[backend]
+    except KeyError:
+        profiling.count(func, 'cache_misses')
+    else:
+        profiling.count(func, 'cache_hits')
+        return result
+    result = results[backend] = _inspect_function(func, backend=backend, resolve=resolve, fields=fields)
+    try:
+        _cache[func] = (fingerprint, results)
+    except TypeError:
+        pass
+    return result
+
+
+def is_cached(func, *, backend: str = 'napoleon') -> bool:
+    """Check whether an up-to-date inspection result of `func` is cached.
+
+    Args:
+        func (callable): The function.
+        backend (str): The backend for parsing the docstring.
+
+    Returns:
+        bool: Whether `inspect_function` would return a cached result.
+    """
+    return backend in _lookup(func)[1]
+
+
+def clear_cache() -> None:
+    """Clear the cached inspection results of all functions and the resolved docstring type strings."""
+    _cache.clear()
+    clear_type_cache()
+
+
+def _lookup(func) -> Tuple[Tuple[Any, ...], Dict[str, Introspection]]:
+    """Return the current fingerprint of `func` and its cached results which are still valid."""
+    fingerprint = tuple(getattr(func, name, None) for name in FINGERPRINT_ATTRIBUTES)
+    try:
+        cached_fingerprint, results = _cache[func]
+    except (KeyError, TypeError):  # TypeError if `func` is not hashable or not weak-referenceable.
+        return fingerprint, {}
+    if any(a is not b for a, b in zip(cached_fingerprint, fingerprint)):
+        return fingerprint, {}
+    return fingerprint, results
+
+
+def _inspect_function(func, *, backend: str,
+                      resolve: Optional[Callable[[str], Any]] = None,
+                      fields: Optional[List[Tuple[str, str, str]]] = None) -> Introspection:
+    check_backend(backend)
+    if fields is None:
+        doc = inspect.getdoc(func)
+        try:
+            with profiling.phase(func, 'parse_docstring'):
+                fields = _extract_fields(doc, backend=backend) if doc is not None else []
+        except UnsupportedDocstringStyle:
+            fields = []
+    try:
+        with profiling.phase(func, 'get_type_hints'):
+            type_hints: Optional[Dict[str, Any]] = get_type_hints(func)
+    except TypeError:  # `from __future__ import annotations` with e.g. `list[int]` on Python < 3.9.
+        if sys.version_info >= (3, 9):
+            raise  # pragma: no cover
+        type_hints = None
+    with profiling.phase(func, 'signature'):
+        signature = inspect.signature(func)
+    return Introspection(func, signature, type_hints, fields, resolve)
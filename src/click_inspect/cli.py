@@ -0,0 +1,130 @@
+import json
+import os
+import sys
+
+import click
+
+from . import codegen as _codegen, completion as _completion, daemon as _daemon, persistent
+
+
+@click.group()
+def main():
+    """Command line utilities for click-inspect."""
+
+
+@main.group()
+def cache():
+    """Inspect and purge the persistent cache."""
+
+
+@cache.command()
+def path():
+    """Print the cache directory."""
+    click.echo(_get_cache_directory())
+
+
+@cache.command()
+def info():
+    """List the cached functions."""
+    directory = _get_cache_directory()
+    count = 0
+    for path, entry in persistent.entries(directory):
+        count += 1
+        status = 'stale' if persistent.is_stale(entry) else 'valid'
+        if entry is None:
+            click.echo(f'{path.name}  {status}  <corrupt>')
+        else:
+            size = path.stat().st_size
+            click.echo(f'{entry.function}  {status}  {len(entry.values)} variant(s), {size} bytes')
+    click.echo(f'{count} cache file(s) in {directory}')
+
+
+@cache.command()
+@click.option('--stale', is_flag=True, help='Remove only outdated entries.')
+def purge(stale):
+    """Remove cache files."""
+    count = persistent.purge(_get_cache_directory(), stale_only=stale)
+    click.echo(f'Removed {count} cache file(s).')
+
+
+@main.command()
+@click.argument('module')
+@click.option('-o', '--output', type=click.Path(dir_okay=False), help='Write the module to this file.')
+@click.option('--check', is_flag=True, help='Check that OUTPUT is up-to-date instead of writing it.')
+def codegen(module, output, check):
+    """Generate a module with precompiled options for all commands in MODULE.
+
+    Importing the generated module before MODULE makes `add_options_from` use the precompiled
+    options instead of inspecting functions at runtime.
+    """
+    if os.getcwd() not in sys.path:
+        sys.path.insert(0, os.getcwd())
+    source = _codegen.generate(module)
+    if check:
+        if output is None:
+            raise click.UsageError('--check requires --output')
+        try:
+            with open(output) as fh:
+                current = fh.read()
+        except FileNotFoundError:
+            current = None
+        if current != source:
+            raise click.ClickException(f'{output} is outdated, regenerate it via '
+                                       f'`click-inspect codegen {module} -o {output}`.')
+        click.echo(f'{output} is up-to-date.')
+    elif output is None:
+        click.echo(source, nl=False)
+    else:
+        with open(output, 'w') as fh:
+            fh.write(source)
+
+
+@main.command('completion-index')
+@click.argument('target')
+@click.option('-o', '--output', type=click.Path(dir_okay=False), help='Write the index to this file.')
+def completion_index(target, output):
+    """Write the shell completion index for the command TARGET ("package.module:qualname").
+
+    Tools can answer completion requests from the index via `click_inspect.completion.handle`
+    without importing their commands.
+    """
+    from .commands import resolve_target
+
+    if os.getcwd() not in sys.path:
+        sys.path.insert(0, os.getcwd())
+    command = resolve_target(target)
+    if not isinstance(command, click.Command):
+        raise click.ClickException(f'{target} is not a click command')
+    if output is None:
+        click.echo(json.dumps(_completion.build_index(command)))
+    else:
+        _completion.write_index(command, output)
+
+
+@main.command()
+@click.argument('target')
+@click.option('--socket', 'socket_path', type=click.Path(dir_okay=False),
+              help='The socket path (defaults to a per-user runtime directory). Its directory must be '
+                   'owned by the current user and not be accessible by others (mode 0700).')
+def daemon(target, socket_path):
+    """Serve invocations of the command TARGET ("package.module:qualname") over a Unix socket.
+
+    Clients use `click_inspect.daemon.run` which falls back to executing the command
+    in-process if the daemon is not running.
+    """
+    if os.getcwd() not in sys.path:
+        sys.path.insert(0, os.getcwd())
+    path = socket_path or _daemon.socket_path(target)
+    try:
+        _daemon.serve(target, path, ready=lambda: click.echo(f'Listening on {path}', err=True))
+    except (RuntimeError, TypeError, ImportError, AttributeError, PermissionError) as err:
+        raise click.ClickException(str(err))
+    except KeyboardInterrupt:
+        pass
+
+
+def _get_cache_directory():
+    directory = persistent.get_directory()
+    if directory is None:
+        raise click.ClickException(f'The persistent cache is disabled (see ${persistent.ENV_VARIABLE}).')
+    return directory
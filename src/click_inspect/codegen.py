@@ -0,0 +1,261 @@
+import builtins
+import enum
+import functools
+import hashlib
+import importlib
+import inspect
+import pickle
+import sys
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Set, Tuple
+import warnings
+
+import click
+
+from .errors import UnsupportedValue
+from .persistent import arguments_key, function_identity
+from .specs import OptionSpec
+
+
+# Map `(module:qualname, arguments key)` of inspected functions to their precompiled option specs.
+_registry: Dict[Tuple[str, str], List[OptionSpec]] = {}
+
+
+def register(specs: Mapping[Tuple[str, str], List[OptionSpec]]) -> None:
+    """Register precompiled option specs which will be used by `add_options_from` instead of inspecting.
+
+    This is called by the modules created via `generate`.
+
+    Args:
+        specs (dict): Map `(module:qualname, arguments key)` to the option specs.
+    """
+    _registry.update(specs)
+
+
+def unregister_all() -> None:
+    """Remove all precompiled option specs."""
+    _registry.clear()
+
+
+def lookup(func, arguments: Dict[str, Any]) -> Optional[List[OptionSpec]]:
+    """Return the precompiled option specs for `func` and the arguments of `add_options_from` (if any).
+
+    Args:
+        func (callable): The inspected function.
+        arguments (dict): The keyword arguments of `add_options_from`.
+
+    Returns:
+        list: The option specs or None if there are no precompiled specs.
+    """
+    if not _registry:
+        return None
+    identity = function_identity(func)
+    key = arguments_key(arguments)
+    if identity is None or key is None:
+        return None
+    return _registry.get((identity, key))
+
+
+def fingerprint(func) -> str:
+    """Compute a fingerprint of the source code of `func`, for detecting outdated precompiled specs.
+
+    Args:
+        func (callable): The inspected function.
+
+    Returns:
+        str: The fingerprint.
+    """
+    try:
+        source = inspect.getsource(func)
+    except (OSError, TypeError):
+        source = repr((getattr(func, '__doc__', None), getattr(func, '__annotations__', None)))
+    return hashlib.sha1(source.encode()).hexdigest()
+
+
+def stale_functions(fingerprints: Mapping[str, str]) -> List[str]:
+    """Return the functions whose source code has changed since the fingerprints were computed.
+
+    Args:
+        fingerprints (dict): Map `module:qualname` to fingerprints (as stored in generated modules).
+
+    Returns:
+        list: The `module:qualname` of outdated (or missing) functions.
+    """
+    from .commands import resolve_target
+    stale = []
+    for identity, expected in fingerprints.items():
+        try:
+            func = resolve_target(identity)
+        except (ImportError, AttributeError):
+            stale.append(identity)
+            continue
+        if fingerprint(func) != expected:
+            stale.append(identity)
+    return stale
+
+
+def iter_commands(obj) -> Iterator[click.Command]:
+    """Iterate over all commands of a module (or group), including the subcommands of groups.
+
+    Args:
+        obj (module or click.Command): The module or command.
+
+    Yields:
+        click.Command: The commands.
+    """
+    seen: Set[int] = set()
+    stack = [obj] if isinstance(obj, click.Command) else [
+        x for name, x in sorted(vars(obj).items()) if isinstance(x, click.Command)]
+    stack.reverse()
+    while stack:
+        command = stack.pop()
+        if id(command) in seen:
+            continue
+        seen.add(id(command))
+        yield command
+        if isinstance(command, click.MultiCommand):
+            subcommands = (command.get_command(None, name) for name in command.list_commands(None))
+            stack.extend(reversed([x for x in subcommands if x is not None]))
+
+
+def generate(module_name: str) -> str:
+    """Generate the source code of a module with precompiled option specs for all commands in `module_name`.
+
+    The generated module registers the specs on import, so it needs to be imported before the
+    commands in `module_name` are created.
+
+    Args:
+        module_name (str): The module containing the commands (and groups) which use `add_options_from`.
+
+    Returns:
+        str: The source code of the generated module.
+
+    Warns:
+        UserWarning: If the options of a function cannot be precompiled, e.g. because a default value
+                     cannot be represented as source code (these functions are inspected at runtime).
+    """
+    from . import __version__
+    from .decorators import _compute_option_specs, get_records
+
+    module = importlib.import_module(module_name)
+    imports: Set[str] = set()
+    entries: Dict[Tuple[str, str], str] = {}
+    fingerprints: Dict[str, str] = {}
+    for command in iter_commands(module):
+        for func, arguments in get_records(command):
+            identity, key = function_identity(func), arguments_key(arguments)
+            if identity is None or key is None:
+                warnings.warn(f'Cannot precompile options for {func!r} used in command {command.name!r} '
+                              f'(local functions and arguments without a stable repr are not supported).')
+                continue
+            if (identity, key) in entries:
+                continue
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore')
+                specs = _compute_option_specs(func, **arguments)
+            try:
+                rendered: Set[str] = set()
+                entries[identity, key] = _render(specs, rendered, module=func.__module__)
+            except UnsupportedValue as err:
+                warnings.warn(f'Cannot precompile options for {func!r} used in command {command.name!r} ({err}).')
+                continue
+            imports |= rendered
+            fingerprints[identity] = fingerprint(func)
+
+    lines = [
+        f'# Generated by click-inspect {__version__} from {module_name}. Do not edit.',
+        f'# Regenerate via `click-inspect codegen {module_name}`.',
+        *sorted(f'import {name}' for name in imports),
+        'from click_inspect.codegen import register',
+        '',
+        '',
+        'SPECS = {',
+        *(f'    ({identity!r}, {key!r}): {source},' for (identity, key), source in sorted(entries.items())),
+        '}',
+        '',
+        'FINGERPRINTS = {',
+        *(f'    {identity!r}: {value!r},' for identity, value in sorted(fingerprints.items())),
+        '}',
+        '',
+        'register(SPECS)',
+        '',
+    ]
+    return '\n'.join(lines)
+
+
+def _render(value: Any, imports: Set[str], *, pickled: bool = True, module: Optional[str] = None) -> str:
+    """Render `value` as source code, collecting the imports (pickle only if `pickled`, see `_instance_reference`)."""
+    render = functools.partial(_render, imports=imports, pickled=pickled, module=module)
+    tp = type(value)
+    if tp is OptionSpec:
+        # Defaults are passed to the function, which may compare them by identity (e.g. sentinels).
+        kwargs = ', '.join(f'{k!r}: {_render(v, imports, pickled=(k != "default"), module=module)}'
+                           for k, v in value.kwargs.items())
+        return f'{render(tp)}({value.name!r}, {render(value.opts)}, {{{kwargs}}})'
+    elif isinstance(value, enum.Enum):
+        return f'{render(tp)}.{value.name}'
+    elif value is None or tp in (bool, int, str, bytes):
+        return repr(value)
+    elif tp is float:
+        return repr(value) if value == value and abs(value) != float('inf') else f"float('{value}')"
+    elif tp is tuple:
+        items = [render(x) for x in value]
+        return f'({items[0]},)' if len(items) == 1 else f'({", ".join(items)})'
+    elif tp is list:
+        return f'[{", ".join(render(x) for x in value)}]'
+    elif tp in (set, frozenset):
+        items = ', '.join(sorted(render(x) for x in value))
+        if tp is set and items:
+            return f'{{{items}}}'
+        return f'{tp.__name__}({{{items}}})' if items else f'{tp.__name__}()'
+    elif tp is dict:
+        return f'{{{", ".join(f"{render(k)}: {render(v)}" for k, v in value.items())}}}'
+    reference = _reference(value)
+    if reference is not None:
+        name, qualname = reference
+        if name == builtins.__name__:
+            return qualname
+        imports.add(name)
+        return f'{name}.{qualname}'
+    reference = _instance_reference(value, module)
+    if reference is not None:
+        imports.add(reference[0])
+        return '.'.join(reference)
+    if not pickled:
+        raise UnsupportedValue(f'Cannot represent {value!r} as source code')
+    try:
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception:
+        raise UnsupportedValue(f'Cannot represent {value!r} as source code') from None
+    imports.add('pickle')
+    return f'pickle.loads({data!r})'
+
+
+def _reference(obj) -> Optional[Tuple[str, str]]:
+    """Return `(module, qualname)` if `obj` can be retrieved by that path."""
+    module, qualname = getattr(obj, '__module__', None), getattr(obj, '__qualname__', None)
+    if not isinstance(module, str) or not isinstance(qualname, str) or '<' in qualname:
+        return None
+    try:
+        target = importlib.import_module(module)
+        for name in qualname.split('.'):
+            target = getattr(target, name)
+    except (ImportError, AttributeError):
+        return None
+    return (module, qualname) if target is obj else None
+
+
+def _instance_reference(obj, module: Optional[str] = None) -> Optional[Tuple[str, str]]:
+    """Return `(module, name)` if `obj` is a module-level instance such as `click.INT` or a sentinel in `module`."""
+    namespace = vars(sys.modules[module]) if module in sys.modules else {}
+    for name, value in namespace.items():
+        if value is obj:  # Private names are fine for the module of the inspected function.
+            return module, name  # type: ignore
+    module = getattr(type(obj), '__module__', None)
+    namespace = vars(sys.modules[module]) if module in sys.modules else {}
+    for name, value in namespace.items():
+        if value is obj and not name.startswith('_'):
+            public = module.partition('.')[0]  # Prefer the public alias, e.g. `click.INT` over `click.types.INT`.
+            if getattr(sys.modules.get(public), name, None) is obj:
+                return public, name
+            return module, name
+    return None
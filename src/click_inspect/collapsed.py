@@ -0,0 +1,144 @@
+import difflib
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import click
+
+from .specs import OptionSpec
+
+
+# The keyword arguments of `add_options_from` which configure collapsed options.
+COLLAPSE_ARGUMENTS = ('expose', 'set_option')
+
+
+class CollapsedOption(click.Option):
+    """A single option which sets any of the given parameters via ``NAME=VALUE`` (and can be repeated).
+
+    Each parameter is converted like the option which the spec describes (type, multiple values, flags
+    and tuples as comma-separated values), but that option is only created when the parameter is set.
+    Parameters which are not set receive their default value (without conversion) and required ones must
+    be set. Dashes in names are treated as underscores and flags can be set by their name alone.
+
+    Args:
+        param_decls (list): The option names (e.g. ``['--set']``).
+        specs (list): The specs of the options which are collapsed.
+        **kwargs: Further keyword arguments for `click.Option`.
+    """
+
+    MAX_HELP_NAMES = 240  # Characters of the parameter names shown in the help text.
+
+    def __init__(self, param_decls=None, *, specs: Iterable[OptionSpec] = (), **kwargs):
+        self.specs: Dict[str, OptionSpec] = {spec.name: spec for spec in specs}
+        kwargs.setdefault('metavar', 'NAME=VALUE')
+        kwargs.setdefault('help', self._help_text())
+        super().__init__(param_decls, multiple=True, expose_value=False, **kwargs)
+        self._options: Dict[str, click.Option] = {}
+        self._defaults: Optional[Dict[str, Any]] = None
+        self._required: Tuple[str, ...] = ()
+
+    def handle_parse_result(self, ctx, opts, args):
+        """Set the values of all collapsed parameters in `ctx.params` (defaults for the ones which are not set).
+
+        Args:
+            ctx (click.Context): The context.
+            opts (dict): The parsed options.
+            args (list): The remaining arguments.
+
+        Returns:
+            tuple: The value of this option (the ``NAME=VALUE`` strings) and the remaining arguments.
+
+        Raises:
+            click.UsageError: If a parameter is unknown, cannot be converted or is required but not set.
+        """
+        value, args = super().handle_parse_result(ctx, opts, args)
+        try:
+            ctx.params.update(self._values(ctx, value or ()))
+        except click.UsageError:
+            if not ctx.resilient_parsing:
+                raise
+        return value, args
+
+    def option(self, name: str) -> click.Option:
+        """Return the option of a collapsed parameter, which is used for converting its values.
+
+        Args:
+            name (str): The name of the parameter.
+
+        Returns:
+            click.Option: The option (created on first use).
+        """
+        try:
+            return self._options[name]
+        except KeyError:
+            spec = self.specs[name]
+            option = self._options[name] = click.Option(spec.opts, **spec.kwargs)
+            return option
+
+    def _values(self, ctx: click.Context, items: Sequence[str]) -> Dict[str, Any]:
+        given: Dict[str, Any] = {}
+        for item in items:
+            name, sep, text = item.partition('=')
+            name = name.strip().replace('-', '_')
+            if name not in self.specs:
+                raise click.BadParameter(f'No such parameter: {name!r}.{_suggestion(name, self.specs)}', ctx, self)
+            option = self.option(name)
+            if not sep:
+                if not option.is_flag:
+                    raise click.BadParameter(f'{item!r} is not of the form NAME=VALUE.', ctx, self)
+                text = 'true'
+            raw = tuple(text.split(',')) if option.nargs != 1 else text
+            if option.multiple:
+                given.setdefault(name, []).append(raw)
+            else:
+                given[name] = raw
+        if self._defaults is None:  # Computed once, so parsing does not scale with the number of parameters.
+            self._defaults = {name: spec.get('default', () if spec.get('multiple') else None)
+                              for name, spec in self.specs.items()}
+            self._required = tuple(name for name, spec in self.specs.items() if spec.get('required'))
+        for name in self._required:
+            if name not in given:
+                raise click.BadParameter(f'{name}=... is required.', ctx, self)
+        values = dict(self._defaults)
+        for name, raw in given.items():
+            try:
+                values[name] = self.option(name).type_cast_value(ctx, raw)
+            except click.BadParameter as err:
+                raise click.BadParameter(f'{name}={err.message}', ctx, self) from None
+        return values
+
+    def _help_text(self) -> str:
+        names: List[str] = []
+        length = 0
+        for name in self.specs:  # Only the first names are considered, so this does not scale with the number.
+            length += len(name) + 2
+            if length > self.MAX_HELP_NAMES:
+                names.append('...')
+                break
+            names.append(name)
+        return f'Set any of the following {len(self.specs)} parameters (can be repeated): {", ".join(names)}'
+
+
+def collapse(option_specs: List[OptionSpec], expose, opts: Sequence[str] = ('--set',)) -> List[OptionSpec]:
+    """Keep the exposed options and collapse the others into a single `CollapsedOption`.
+
+    Args:
+        option_specs (list): The specs of the options in display order.
+        expose (int or set): The number of options to keep (the first ones) or the names of the parameters.
+        opts (list): The names of the collapsed option.
+
+    Returns:
+        list: The specs of the exposed options followed by the spec of the collapsed option (if any).
+    """
+    if isinstance(expose, int):
+        exposed, collapsed = option_specs[:expose], option_specs[expose:]
+    else:
+        exposed = [spec for spec in option_specs if spec.name in expose]
+        collapsed = [spec for spec in option_specs if spec.name not in expose]
+    if not collapsed:
+        return exposed
+    name = click.Option(opts).name
+    return [*exposed, OptionSpec(name, opts, dict(cls=CollapsedOption, specs=tuple(collapsed)))]
+
+
+def _suggestion(name: str, names: Iterable[str]) -> str:
+    matches = difflib.get_close_matches(name, list(names), n=3)
+    return f' Did you mean {", ".join(matches)}?' if matches else ''
@@ -0,0 +1,175 @@
+import functools
+import importlib
+import inspect
+from inspect import Parameter
+from typing import Any, Callable, Dict, Optional
+import warnings
+
+import click
+
+from . import persistent
+from .collapsed import COLLAPSE_ARGUMENTS
+from .decorators import _apply_pipeline, add_options_from, inspect_options
+from .mapping import MAP_ARGUMENTS
+from .static import find_source_file, split_target, static_function, summarize
+
+
+def make_command(func, *, name=None, cls=click.Command, **kwargs) -> click.Command:
+    """Create a click command which calls `func` with all of its parameters exposed as options.
+
+    The command echoes the return value of `func` unless it is None. In map mode (see `add_options_from`),
+    it echoes each result. Coroutine functions (`async def`) are run on the shared event loop of
+    :mod:`click_inspect.aio`.
+
+    Args:
+        func (callable): The function to be wrapped.
+        name (str): The name of the command (defaults to the name of `func` with dashes).
+        cls (type): The command class.
+        **kwargs: Further keyword arguments for `add_options_from`.
+
+    Returns:
+        click.Command: The command.
+    """
+    parameters = inspect.signature(func).parameters
+    positional_only = [p.name for p in parameters.values() if p.kind is Parameter.POSITIONAL_ONLY]
+    kwargs = _with_default_include(func, kwargs)
+    map_over = kwargs.get('map_over')
+
+    def callback(**options):
+        if map_over is not None:
+            results = options[map_over]
+        else:
+            args = [options.pop(n) for n in positional_only if n in options]
+            result = func(*args, **options)
+            if inspect.isawaitable(result):
+                from .aio import run
+                result = run(result)
+            results = [result]
+        for result in results:
+            if result is not None:
+                click.echo(result)
+
+    callback.__name__ = func.__name__
+    if name is None:
+        name = func.__name__.lower().replace('_', '-')
+    return click.command(name, cls=cls, help=_help_text(func))(add_options_from(func, **kwargs)(callback))
+
+
+def make_static_command(target: str, *, name=None, cls=click.Command, **kwargs) -> Optional[click.Command]:
+    """Create the command of `make_command` for a function without importing the function's module.
+
+    The options are derived from the source code of the function (see
+    :func:`click_inspect.static.static_function`). The module is imported only when the command
+    is executed; showing the help text or completing the command line does not import it.
+    The result is cached in the persistent cache (if enabled).
+
+    Args:
+        target (str): The function in the form `"package.module:qualname"`.
+        name (str): The name of the command (defaults to the name of the function with dashes).
+        cls (type): The command class which is used for executing the command.
+        **kwargs: Further keyword arguments for `add_options_from`.
+
+    Returns:
+        click.Command: The command or None if the function cannot be inspected statically
+        (then `make_command` needs to be used).
+    """
+    module, qualname = split_target(target)
+    path = find_source_file(module)
+    if path is None:
+        return None
+
+    def _compute():
+        func = static_function(path, module, qualname)
+        if func is None:
+            return None
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')  # Warnings are issued when the command is executed.
+            return _help_text(func), inspect_options(func, **_with_default_include(func, option_arguments))
+
+    option_arguments = {k: v for k, v in kwargs.items() if k not in MAP_ARGUMENTS and k not in COLLAPSE_ARGUMENTS}
+    result = persistent.load_or_compute_for_source(target, path, {'static': option_arguments}, _compute)
+    if result is None:
+        return None
+    help_text, option_specs = result
+    if name is None:
+        name = qualname.rpartition('.')[2].lower().replace('_', '-')
+    load = functools.partial(_load_command, target, name=name, cls=cls, **kwargs)
+
+    def callback(**options):
+        pass  # The loaded command is invoked instead.
+
+    option_specs = _apply_pipeline(option_specs, map_over=kwargs.get('map_over'), expose=kwargs.get('expose'),
+                                   set_option=kwargs.get('set_option', ('--set',)))
+    for spec in reversed(option_specs):
+        spec.decorator()(callback)
+    return click.command(name, cls=StaticCommand, help=help_text, load=load)(callback)
+
+
+class StaticCommand(click.Command):
+    """A command whose parameters are only used for help texts and completion.
+
+    For executing the command, the actual command is loaded and the command line is parsed by it.
+
+    Args:
+        *args: Positional arguments for `click.Command`.
+        load (callable): Returns the actual command.
+        **kwargs: Keyword arguments for `click.Command`.
+    """
+
+    def __init__(self, *args, load: Callable[[], click.Command], **kwargs):
+        super().__init__(*args, **kwargs)
+        self._load = load
+        self._command: Optional[click.Command] = None
+
+    def load(self) -> click.Command:
+        """Return the actual command, importing its module on first use."""
+        if self._command is None:
+            self._command = self._load()
+        return self._command
+
+    def make_context(self, info_name, args, parent=None, **extra):
+        """Create the context via the actual command, unless for showing the help text or completion."""
+        ctx = click.Context(self, info_name=info_name, parent=parent, **extra)
+        if ctx.resilient_parsing or not set(args).isdisjoint(self.get_help_option_names(ctx)):
+            return super().make_context(info_name, args, parent=parent, **extra)
+        return self.load().make_context(info_name, args, parent=parent, **extra)
+
+    def invoke(self, ctx):
+        """Invoke the actual command (whose context was created by `make_context`)."""
+        if ctx.command is not self:
+            return ctx.command.invoke(ctx)
+        return self.load().invoke(ctx)
+
+
+def resolve_target(target: str) -> Any:
+    """Import the module of the given target and return the target object.
+
+    Args:
+        target (str): The target in the form `"package.module:qualname"`.
+
+    Returns:
+        The target object.
+    """
+    module, qualname = split_target(target)
+    obj = importlib.import_module(module)
+    for name in qualname.split('.'):
+        obj = getattr(obj, name)
+    return obj
+
+
+def _load_command(target: str, *, name: str, cls=click.Command, **kwargs) -> click.Command:
+    obj = resolve_target(target)
+    return obj if isinstance(obj, click.Command) else make_command(obj, name=name, cls=cls, **kwargs)
+
+
+def _with_default_include(func, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """Include all parameters of `func` (except `*args` and `**kwargs`) unless specified otherwise."""
+    if 'include' in kwargs:
+        return kwargs
+    parameters = inspect.signature(func).parameters.values()
+    return {**kwargs, 'include': {p.name for p in parameters
+                                  if p.kind not in (Parameter.VAR_POSITIONAL, Parameter.VAR_KEYWORD)}}
+
+
+def _help_text(func) -> Optional[str]:
+    return summarize(inspect.getdoc(func) or '') or None
@@ -0,0 +1,225 @@
+import json
+import os
+import shlex
+import sys
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+
+FORMAT_VERSION = 1
+WORDBREAK = '='
+
+
+def build_index(command) -> Dict[str, Any]:
+    """Build the completion index of a command, including its subcommands (recursively).
+
+    The index contains everything which is needed for completing the command line (option names,
+    flags, choices and short help texts of the subcommands), so completions can be computed
+    without importing the command's modules (see `complete`).
+
+    Args:
+        command (click.Command): The command.
+
+    Returns:
+        dict: The index, which can be serialized as JSON.
+    """
+    return {'version': FORMAT_VERSION, 'command': _index_command(command)}
+
+
+def write_index(command, path) -> None:
+    """Build the completion index of a command and write it to a JSON file.
+
+    Args:
+        command (click.Command): The command.
+        path (str or Path): The file.
+    """
+    with open(path, 'w') as fh:
+        json.dump(build_index(command), fh, separators=(',', ':'))
+
+
+def load_index(path) -> Optional[Dict[str, Any]]:
+    """Load a completion index from a JSON file.
+
+    Args:
+        path (str or Path): The file.
+
+    Returns:
+        dict: The index or None if the file is missing, corrupt or of a different format version.
+    """
+    try:
+        with open(path) as fh:
+            index = json.load(fh)
+    except (OSError, ValueError):
+        return None
+    return index if isinstance(index, dict) and index.get('version') == FORMAT_VERSION else None
+
+
+def complete(index: Dict[str, Any], args: Sequence[str], incomplete: str) -> List[Tuple[str, Optional[str]]]:
+    """Compute the completions from the index, like click's shell completion does from the commands.
+
+    Args:
+        index (dict): The completion index (see `build_index`).
+        args (list): The command line arguments before the one which is completed.
+        incomplete (str): The argument which is completed.
+
+    Returns:
+        list: `(value, help)` pairs.
+    """
+    all_args = list(args)
+    node, positional = _resolve(index['command'], all_args)
+    if incomplete.startswith('-') and WORDBREAK in incomplete:  # Bash partitions long options at '='.
+        option, __, incomplete = incomplete.partition(WORDBREAK)
+        all_args.append(option)
+    elif incomplete == WORDBREAK:
+        incomplete = ''
+
+    if '--' not in all_args and incomplete.startswith('-'):
+        return [(opt, option['help']) for option in node['options'] if not option['hidden']
+                for opt in option['opts'] + option['secondary_opts']
+                if (opt not in all_args or option['multiple']) and opt.startswith(incomplete)]
+    for option in node['options']:
+        if _is_incomplete_option(all_args, option):
+            return _choices(option, incomplete)
+    for argument in node['arguments']:
+        nargs = argument['nargs']
+        if nargs == -1 or positional < nargs:
+            return _choices(argument, incomplete)
+        positional -= nargs
+    return sorted((name, sub['short_help']) for name, sub in node['commands'].items()
+                  if name.startswith(incomplete) and not sub['hidden'])
+
+
+def handle(index_path, prog_name: str, complete_var: Optional[str] = None) -> None:
+    """Answer a shell completion request from the index and exit, if the command line is being completed.
+
+    This is meant to be called at the very start of a command line tool, before the commands
+    are imported. It supports the completion protocol of click for bash, zsh and fish
+    (`_PROG_COMPLETE=complete`, `complete_zsh` or `complete_fish`). If no completion is requested,
+    if the completion script is requested or if the index cannot be loaded, it returns and the tool
+    proceeds as usual::
+
+        from click_inspect.completion import handle
+
+        handle('/path/to/completion.json', 'myapp')
+
+        from myapp.cli import main
+        main()
+
+    Args:
+        index_path (str or Path): The completion index (see `write_index`).
+        prog_name (str): The name of the program, as used by click for the environment variable.
+        complete_var (str): The environment variable (defaults to `_{PROG_NAME}_COMPLETE`).
+    """
+    if complete_var is None:
+        complete_var = f'_{prog_name.replace("-", "_").upper()}_COMPLETE'
+    instruction = os.environ.get(complete_var)
+    if instruction not in ('complete', 'complete_bash', 'complete_zsh', 'complete_fish'):
+        return
+    index = load_index(index_path)
+    if index is None:
+        return
+    words = _split_arg_string(os.environ.get('COMP_WORDS', ''))
+    if instruction == 'complete_fish':
+        args, incomplete = words[1:], os.environ.get('COMP_CWORD', '')
+    else:
+        cword = int(os.environ.get('COMP_CWORD', '0'))
+        args, incomplete = words[1:cword], (words[cword] if cword < len(words) else '')
+    lines = []
+    for value, help_text in complete(index, args, incomplete):
+        if instruction == 'complete_fish':
+            lines.append(f'{value}\t{help_text}' if help_text else value)
+        else:
+            lines.append(value)
+            if instruction == 'complete_zsh':
+                lines.append(help_text or '_')
+    sys.stdout.write(''.join(f'{line}\n' for line in lines))
+    sys.stdout.flush()
+    sys.exit(1)  # Like click.
+
+
+def _index_command(command) -> Dict[str, Any]:
+    import click
+
+    options, arguments = [], []
+    for param in command.params:
+        choices = [str(c) for c in param.type.choices] if isinstance(param.type, click.Choice) else None
+        if isinstance(param, click.Option):
+            options.append(dict(opts=list(param.opts), secondary_opts=list(param.secondary_opts),
+                                help=param.help, is_flag=bool(param.is_flag), multiple=bool(param.multiple),
+                                nargs=param.nargs, required=bool(param.required), hidden=bool(param.hidden),
+                                choices=choices))
+        elif isinstance(param, click.Argument):
+            arguments.append(dict(name=param.name, nargs=param.nargs, required=bool(param.required),
+                                  choices=choices))
+    commands = {}
+    if isinstance(command, click.MultiCommand):
+        ctx = click.Context(command)
+        for name in command.list_commands(ctx):
+            subcommand = command.get_command(ctx, name)
+            if subcommand is not None:
+                commands[name] = _index_command(subcommand)
+    return dict(short_help=command.get_short_help_str(), hidden=bool(command.hidden),
+                options=options, arguments=arguments, commands=commands)
+
+
+def _resolve(node: Dict[str, Any], args: List[str]) -> Tuple[Dict[str, Any], int]:
+    """Return the (sub)command which is selected by the arguments and the number of its positional arguments."""
+    positional = 0
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        i += 1
+        if arg == '--':
+            positional += len(args) - i
+            break
+        if arg.startswith('-') and len(arg) > 1:
+            name, sep, __ = arg.partition('=')
+            option = _find_option(node, name)
+            if option is not None and not option['is_flag'] and not sep:
+                i += option['nargs']
+        elif arg in node['commands'] and positional >= _required_arguments(node):
+            node, positional = node['commands'][arg], 0
+        else:
+            positional += 1
+    return node, positional
+
+
+def _find_option(node: Dict[str, Any], name: str) -> Optional[Dict[str, Any]]:
+    for option in node['options']:
+        if name in option['opts'] or name in option['secondary_opts']:
+            return option
+    return None
+
+
+def _required_arguments(node: Dict[str, Any]) -> int:
+    return sum(max(argument['nargs'], 0) for argument in node['arguments'])
+
+
+def _is_incomplete_option(all_args: List[str], option: Dict[str, Any]) -> bool:
+    """Whether the last option on the command line is `option` and it still accepts values."""
+    if option['is_flag']:
+        return False
+    last_option = None
+    for index, arg in enumerate(reversed([arg for arg in all_args if arg != WORDBREAK])):
+        if index + 1 > option['nargs']:
+            break
+        if arg.startswith('-'):
+            last_option = arg
+    return last_option is not None and last_option in option['opts']
+
+
+def _choices(param: Dict[str, Any], incomplete: str) -> List[Tuple[str, Optional[str]]]:
+    return [(choice, None) for choice in param['choices'] or () if choice.startswith(incomplete)]
+
+
+def _split_arg_string(string: str) -> List[str]:
+    """Split the command line like a shell does, tolerating incomplete quotes."""
+    lexer = shlex.shlex(string, posix=True)
+    lexer.whitespace_split = True
+    lexer.commenters = ''
+    words = []
+    try:
+        for word in lexer:
+            words.append(word)
+    except ValueError:  # Unterminated quote.
+        words.append(lexer.token)
+    return words
@@ -0,0 +1,188 @@
+import collections.abc
+import enum
+from typing import Any, BinaryIO, Callable, Dict, Tuple, Union
+try:
+    from typing import get_args, get_origin             # type: ignore
+except ImportError:                                     # pragma: no cover
+    from typing_extensions import get_args, get_origin  # pragma: no cover
+try:
+    from typing import Literal                          # type: ignore
+except ImportError:                                     # pragma: no cover
+    from typing_extensions import Literal               # type: ignore  # pragma: no cover
+
+from .types import ArrayType, BinaryInput, EnumChoice, MappedChoice
+
+
+# Converters take a type hint and return the corresponding keyword arguments for `click.option`.
+Converter = Callable[[Any], Dict[str, Any]]
+
+# Map origins of generic type hints (e.g. `list` for `List[int]`) or classes to converters.
+_converters: Dict[Any, Converter] = {}
+
+# Incremented by each change of the registry (part of the key of persistently cached option specs).
+_generation = 0
+
+# Map (hashable) type hints and their `repr` (`Union[int, str] == Union[str, int]`, but the first
+# member is used) to their converted keyword arguments; the oldest entry is evicted when full.
+_memo: Dict[Tuple[Any, str], Dict[str, Any]] = {}
+_MEMO_SIZE = 1024
+
+
+def register(key, converter=None):
+    """Register a converter for type hints of the given origin or class.
+
+    Converters are looked up by the type hint itself, then by its origin (e.g. `dict` for
+    `Dict[str, int]` or `typing.Literal` for `Literal['a', 'b']`) and finally, if the
+    type hint is a class, by its base classes. They can call `convert` for nested type hints.
+    Classes of optional dependencies can be specified by their qualified name (e.g. `'numpy.ndarray'`),
+    so they do not need to be imported for registering the converter.
+
+    Can be used as a decorator if `converter` is omitted::
+
+        @register(pathlib.Path)
+        def _convert_path(tp_hint):
+            return dict(type=click.Path())
+
+    Args:
+        key: The origin or the class (which applies to subclasses as well), or its qualified name.
+        converter (callable): Takes the type hint and returns keyword arguments for `click.option`.
+
+    Returns:
+        The converter (or a decorator which registers the converter if it was omitted).
+    """
+    global _generation
+    if converter is None:
+        return lambda f: register(key, f)
+    _converters[key] = converter
+    _memo.clear()
+    _generation += 1
+    return converter
+
+
+def unregister(key) -> None:
+    """Remove the converter for the given origin or class.
+
+    Args:
+        key: The origin or the class.
+    """
+    global _generation
+    _converters.pop(key, None)
+    _memo.clear()
+    _generation += 1
+
+
+def generation() -> int:
+    """Return the number of changes of the registry (`register` and `unregister` calls) in this process."""
+    return _generation
+
+
+def convert(tp_hint) -> Dict[str, Any]:
+    """Convert the given type hint to keyword arguments for `click.option` via the registered converters.
+
+    Results are memoized per (hashable) type hint. Type hints without a matching converter
+    are used as the option's type directly (or their origin for generic type hints).
+
+    Args:
+        tp_hint: The type hint.
+
+    Returns:
+        dict: Keyword arguments for `click.option` (at least 'type').
+    """
+    key = tp_hint, repr(tp_hint)
+    try:
+        return dict(_memo[key])
+    except KeyError:
+        hashable = True
+    except TypeError:  # E.g. `Annotated` with unhashable metadata.
+        hashable = False
+    converter = _lookup(tp_hint)
+    kwargs = converter(tp_hint) if converter is not None else dict(type=(get_origin(tp_hint) or tp_hint))
+    if hashable:
+        if len(_memo) >= _MEMO_SIZE:
+            del _memo[next(iter(_memo))]
+        _memo[key] = kwargs
+    return dict(kwargs)
+
+
+def _lookup(tp_hint):
+    try:
+        return _converters[tp_hint]
+    except (KeyError, TypeError):  # TypeError for unhashable type hints.
+        pass
+    origin = get_origin(tp_hint)
+    if origin is not None:
+        try:
+            return _converters[origin]
+        except (KeyError, TypeError):
+            pass
+    cls = tp_hint if isinstance(tp_hint, type) else origin
+    if isinstance(cls, type):
+        for base in cls.__mro__:
+            if base in _converters:
+                return _converters[base]
+            name = f'{base.__module__}.{base.__qualname__}'
+            if name in _converters:
+                return _converters[name]
+    return None
+
+
+def _convert_bool(tp_hint):
+    return dict(is_flag=True, type=bool)
+
+
+def _convert_sequence(tp_hint):
+    if isinstance(tp_hint, type):  # E.g. `list` or a subclass, but not `List` or `List[int]`.
+        return _convert_plain(tp_hint)
+    args = get_args(tp_hint)
+    return dict(multiple=True, type=convert(args[0])['type']) if args else dict(multiple=True)
+
+
+def _convert_tuple(tp_hint):
+    args = get_args(tp_hint)
+    return dict(type=tuple(convert(x)['type'] for x in args)) if args else _convert_plain(tp_hint)
+
+
+def _convert_plain(tp_hint):
+    """Use classes (e.g. `tuple` or a `NamedTuple`) directly, like type hints without a converter."""
+    return dict(type=(get_origin(tp_hint) or tp_hint))
+
+
+def _convert_union(tp_hint):
+    return convert(get_args(tp_hint)[0])
+
+
+def _convert_literal(tp_hint):
+    return dict(type=MappedChoice({str(x): x for x in get_args(tp_hint)}))
+
+
+def _convert_enum(tp_hint):
+    return dict(type=EnumChoice(tp_hint))
+
+
+def _convert_ndarray(tp_hint):
+    """Convert `numpy.ndarray` as well as `numpy.typing.NDArray[dtype]`, which is `ndarray[Any, dtype[...]]`."""
+    args = get_args(tp_hint)
+    dtype_args = get_args(args[1]) if len(args) == 2 else ()
+    dtype = dtype_args[0] if dtype_args and isinstance(dtype_args[0], type) else None
+    return dict(type=ArrayType(dtype))
+
+
+def _convert_binary(tp_hint):
+    return dict(type=BinaryInput())
+
+
+def _convert_binary_stream(tp_hint):
+    return dict(type=BinaryInput(stream=True))
+
+
+register(bool, _convert_bool)
+register(list, _convert_sequence)
+register(collections.abc.Sequence, _convert_sequence)
+register(tuple, _convert_tuple)
+register(Union, _convert_union)
+register(enum.Enum, _convert_enum)
+register(Literal, _convert_literal)
+register('numpy.ndarray', _convert_ndarray)
+register(bytes, _convert_binary)
+register(memoryview, _convert_binary)
+register(BinaryIO, _convert_binary_stream)
@@ -0,0 +1,303 @@
+import array
+import hashlib
+import json
+import os
+from pathlib import Path
+import signal
+import socket
+import stat
+import struct
+import sys
+import tempfile
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import warnings
+
+
+ENV_VARIABLE = 'CLICK_INSPECT_DAEMON'
+
+_HEADER = struct.Struct('!I')  # Length of the request.
+_STATUS = struct.Struct('!i')  # Process id of the worker, then the exit status.
+_FDS = 3  # stdin, stdout and stderr of the client.
+
+
+def socket_path(target: str) -> Path:
+    """Return the default socket path of the daemon for the given command.
+
+    The socket is placed in a directory which is accessible by the current user only
+    (``$XDG_RUNTIME_DIR/click-inspect`` or a per-user directory in the temporary directory).
+
+    Args:
+        target (str): The command in the form `"package.module:qualname"`.
+
+    Returns:
+        Path: The socket path.
+    """
+    runtime = os.environ.get('XDG_RUNTIME_DIR')
+    base = Path(runtime) if runtime else Path(tempfile.gettempdir()) / f'click-inspect-{os.getuid()}'
+    name = hashlib.sha1(target.encode()).hexdigest()[:16]
+    return (base / 'click-inspect' if runtime else base) / f'{name}.sock'
+
+
+def is_available() -> bool:
+    """Check whether the platform supports the daemon (Unix sockets and `os.fork`)."""
+    return hasattr(socket, 'AF_UNIX') and hasattr(os, 'fork') and hasattr(socket.socket, 'sendmsg')
+
+
+def serve(target: str, path=None, *, ready=None) -> None:
+    """Serve invocations of the given command over a Unix socket until interrupted.
+
+    The command (together with all of its subcommands and their options) is imported and inspected
+    once. Each invocation is executed in a forked process, which receives the arguments, environment
+    and working directory of the client as well as its standard streams, so invocations are isolated
+    from each other and from the daemon.
+
+    Args:
+        target (str): The command in the form `"package.module:qualname"`.
+        path (str or Path): The socket path (defaults to `socket_path`).
+        ready (callable): Called without arguments when the daemon accepts connections.
+
+    Raises:
+        RuntimeError: If the platform does not support the daemon.
+        PermissionError: If the directory of the socket is not private to the current user.
+    """
+    if not is_available():
+        raise RuntimeError('The daemon requires Unix sockets and os.fork')
+    path = Path(path) if path is not None else socket_path(target)
+    path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    _check_directory(path.parent)
+    command = _load(target)
+    _warm_up(command)
+    if path.exists():
+        path.unlink()
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    previous = {
+        signal.SIGCHLD: signal.signal(signal.SIGCHLD, signal.SIG_IGN),  # Reap the workers automatically.
+        signal.SIGTERM: signal.signal(signal.SIGTERM, _terminate),  # Remove the socket when terminated.
+    }
+    try:
+        umask = os.umask(0o177)  # The socket is created accessible by the current user only.
+        try:
+            server.bind(str(path))
+        finally:
+            os.umask(umask)
+        server.listen(64)
+        if ready is not None:
+            ready()
+        while True:
+            connection, __ = server.accept()
+            try:
+                request, fds = _receive_request(connection)
+            except (OSError, ValueError):  # Malformed request.
+                connection.close()
+                continue
+            for stream in (sys.stdout, sys.stderr):
+                stream.flush()
+            if os.fork() == 0:
+                server.close()
+                for signum in previous:
+                    signal.signal(signum, signal.SIG_DFL)
+                _serve_request(command, connection, request, fds)  # Does not return.
+            connection.close()
+            for fd in fds:
+                os.close(fd)
+    finally:
+        for signum, handler in previous.items():
+            signal.signal(signum, handler)
+        server.close()
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def call(path, args: Sequence[str], *, prog_name: Optional[str] = None) -> int:
+    """Invoke the command of the daemon which listens on the given socket.
+
+    The daemon uses the standard streams, environment and working directory of the current process,
+    so the socket must be in a directory which is private to the current user and (where the platform
+    supports checking it) the daemon must run as the current user.
+
+    Args:
+        path (str or Path): The socket path.
+        args (list): The command line arguments.
+        prog_name (str): The program name (defaults to the name of the current script).
+
+    Returns:
+        int: The exit status of the invocation.
+
+    Raises:
+        OSError: If the daemon is not running (e.g. `FileNotFoundError` or `ConnectionRefusedError`).
+        PermissionError: If the directory of the socket is not private or the daemon runs as another user.
+    """
+    _check_directory(Path(path).parent)
+    request = json.dumps(dict(args=list(args), prog_name=prog_name or os.path.basename(sys.argv[0]),
+                              env=dict(os.environ), cwd=os.getcwd())).encode()
+    for stream in (sys.stdout, sys.stderr):
+        stream.flush()
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.connect(str(path))
+        _check_peer(connection)
+        fds = array.array('i', [0, 1, 2])
+        connection.sendmsg([_HEADER.pack(len(request)) + request],
+                           [(socket.SOL_SOCKET, socket.SCM_RIGHTS, fds)])
+        pid, = _STATUS.unpack(_receive_exactly(connection, _STATUS.size))
+        try:
+            status, = _STATUS.unpack(_receive_exactly(connection, _STATUS.size))
+        except KeyboardInterrupt:
+            os.kill(pid, signal.SIGINT)
+            status, = _STATUS.unpack(_receive_exactly(connection, _STATUS.size))
+    return status
+
+
+def run(target: str, args: Optional[Sequence[str]] = None, *, path=None, prog_name: Optional[str] = None):
+    """Invoke the command via its daemon if it is running, otherwise in the current process, then exit.
+
+    This is meant as the entry point of a thin client script, which only needs to import this
+    module as long as the daemon is running::
+
+        from click_inspect.daemon import run
+
+        if __name__ == '__main__':
+            run('myapp.cli:main')
+
+    The daemon can be disabled by setting the environment variable `CLICK_INSPECT_DAEMON` to `0`.
+
+    Args:
+        target (str): The command in the form `"package.module:qualname"`.
+        args (list): The command line arguments (defaults to `sys.argv[1:]`).
+        path (str or Path): The socket path (defaults to `socket_path`).
+        prog_name (str): The program name (defaults to the name of the current script).
+
+    Warns:
+        UserWarning: If the daemon is not used because its socket is not private to the current user.
+    """
+    args = sys.argv[1:] if args is None else list(args)
+    if is_available() and os.environ.get(ENV_VARIABLE, '').lower() not in ('0', 'false', 'no', 'off'):
+        try:
+            status = call(path if path is not None else socket_path(target), args, prog_name=prog_name)
+        except (FileNotFoundError, ConnectionRefusedError):
+            pass
+        except PermissionError as err:
+            warnings.warn(f'Not using the daemon: {err}')
+        else:
+            sys.exit(status)
+    _load(target).main(args=args, prog_name=prog_name)
+
+
+def _check_directory(directory: Path) -> None:
+    """Make sure that no other user can place or access sockets in the directory (e.g. in `/tmp`)."""
+    try:
+        info = os.lstat(directory)
+    except FileNotFoundError:
+        return  # There is no socket either.
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o077:
+        raise PermissionError(f'The socket directory {str(directory)!r} must be a directory which is '
+                              f'owned by the current user and not accessible by others')
+
+
+def _check_peer(connection: socket.socket) -> None:
+    """Make sure that the daemon runs as the current user (on platforms which provide `SO_PEERCRED`)."""
+    if not hasattr(socket, 'SO_PEERCRED'):
+        return
+    credentials = struct.Struct('3i')  # pid, uid, gid
+    __, uid, __ = credentials.unpack(connection.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED,
+                                                           credentials.size))
+    if uid != os.getuid():
+        raise PermissionError(f'The daemon runs as another user (uid {uid})')
+
+
+def _terminate(signum, frame):
+    sys.exit(128 + signum)
+
+
+def _load(target: str):
+    import click
+
+    from .commands import resolve_target
+
+    command = resolve_target(target)
+    if not isinstance(command, click.Command):
+        raise TypeError(f'{target} is not a click command')
+    return command
+
+
+def _warm_up(command) -> None:
+    """Load all subcommands and create their options, so the workers do not have to."""
+    from .codegen import iter_commands
+
+    for subcommand in iter_commands(command):
+        list(subcommand.params)
+
+
+def _serve_request(command, connection: socket.socket, request: Dict[str, Any], fds: List[int]) -> None:
+    """Execute the request in the forked worker process and exit."""
+    status = 1
+    try:
+        connection.sendall(_STATUS.pack(os.getpid()))
+        for fd, target in zip(fds, (0, 1, 2)):
+            os.dup2(fd, target)
+            os.close(fd)
+        os.chdir(request['cwd'])
+        os.environ.clear()
+        os.environ.update(request['env'])
+        sys.argv = [request['prog_name'], *request['args']]
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+        try:
+            command.main(args=request['args'], prog_name=request['prog_name'])
+            status = 0
+        except SystemExit as exc:
+            status = _exit_status(exc)
+        except BaseException:
+            import traceback
+            traceback.print_exc()
+    finally:
+        for stream in (sys.stdout, sys.stderr):
+            try:
+                stream.flush()
+            except Exception:  # E.g. a closed pipe.
+                pass
+        try:
+            connection.sendall(_STATUS.pack(status))
+        finally:
+            os._exit(status)
+
+
+def _exit_status(exc: SystemExit) -> int:
+    """Mimic the exit status of the interpreter for `SystemExit`."""
+    if exc.code is None:
+        return 0
+    if isinstance(exc.code, int):
+        return exc.code
+    print(exc.code, file=sys.stderr)
+    return 1
+
+
+def _receive_request(connection: socket.socket) -> Tuple[Dict[str, Any], List[int]]:
+    fds = array.array('i')
+    data, ancillary, __, __ = connection.recvmsg(4096, socket.CMSG_LEN(_FDS * fds.itemsize))
+    for level, kind, payload in ancillary:
+        if level == socket.SOL_SOCKET and kind == socket.SCM_RIGHTS:
+            fds.frombytes(payload[:len(payload) - (len(payload) % fds.itemsize)])
+    try:
+        if len(fds) != _FDS or len(data) < _HEADER.size:
+            raise ValueError('Malformed request')
+        length, = _HEADER.unpack(data[:_HEADER.size])
+        data = data[_HEADER.size:]
+        if len(data) < length:
+            data += _receive_exactly(connection, length - len(data))
+        return json.loads(data.decode()), list(fds)
+    except BaseException:
+        for fd in fds:
+            os.close(fd)
+        raise
+
+
+def _receive_exactly(connection: socket.socket, size: int) -> bytes:
+    chunks = []
+    while size > 0:
+        chunk = connection.recv(size)
+        if not chunk:
+            raise ConnectionError('The connection was closed')
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b''.join(chunks)
@@ -1,20 +1,15 @@
-from collections import defaultdict
-import collections.abc
+import functools
 import inspect
 from inspect import Parameter
 import sys
-from types import MappingProxyType
-from typing import Any, Collection, Container, Mapping, Sequence, Union, get_type_hints
-try:
-    from typing import get_args, get_origin             # type: ignore
-except ImportError:                                     # pragma: no cover
-    from typing_extensions import get_args, get_origin  # pragma: no cover
+from types import MappingProxyType, SimpleNamespace
+from typing import Any, Collection, Container, Dict, List, Mapping, Optional, Sequence, Set, Tuple, Union
 import warnings
 
 import click
 
-from .errors import UnsupportedDocstringStyle
-from .parser import parse_docstring
+# Further submodules are imported where they are used, so importing `add_options_from` stays cheap.
+from .specs import OptionSpec
 
 
 POSITIONAL_OR_KEYWORD = Parameter.POSITIONAL_OR_KEYWORD
@@ -27,21 +22,59 @@ def add_options_from(func,
                      names: Mapping[str, Sequence[str]] = MappingProxyType({}),
                      include: Collection[str] = frozenset(),
                      exclude: Container[str] = frozenset(),
-                     custom: Mapping[str, Mapping[str, Any]] = MappingProxyType({})):
+                     custom: Mapping[str, Mapping[str, Any]] = MappingProxyType({}),
+                     docstring_backend: str = 'napoleon',
+                     lazy: bool = False,
+                     map_over: Optional[str] = None,
+                     workers: Optional[int] = None,
+                     executor: Optional[str] = None,
+                     ordered: bool = True,
+                     fail_fast: bool = True,
+                     expose: Union[int, Collection[str], None] = None,
+                     set_option: Sequence[str] = ('--set',)):
     """Inspect `func` and add corresponding options to the decorated function.
 
+    For functions with many parameters, `expose` selects the parameters which become options of their own,
+    while all others are collapsed into a single option (``--set NAME=VALUE``, which can be repeated).
+    Their values are converted according to the same type information and are passed to the decorated
+    function like the values of the other options (see :class:`click_inspect.collapsed.CollapsedOption`).
+
+    In map mode (`map_over`), the option of the given parameter accepts multiple values (if it does not
+    already) and the decorated function receives an iterator over the results of calling `func` once per
+    value instead of the values themselves. The calls are executed concurrently by the given number of
+    workers, with all other options being passed to each call (see :func:`click_inspect.mapping.map_call`).
+
+    If the decorated function is a coroutine function (`async def`), it is run on the shared event loop
+    of :mod:`click_inspect.aio` when the command is invoked.
+
     Args:
         func (callable): The function which provides the options through inspection.
         names (dict): Map parameter names in `func` to `click.option` names.
         include (set): Parameter names to be used from `func`.
         exclude (set): Parameter names to be excluded from `func`.
         custom (dict): Map parameter names to custom kwargs for the corresponding option.
+        docstring_backend (str): The backend for parsing the docstring of `func`
+                                 (see :func:`click_inspect.parser.parse_docstring`).
+        lazy (bool): Defer the inspection of `func` and the creation of options until the parameters
+                     of the command are accessed (e.g. when it is invoked or its help is shown).
+        map_over (str): The name of the parameter whose values are mapped over.
+        workers (int): The number of workers for the map mode (None or 0 means one per CPU).
+        executor (str): Run the calls of the map mode in a `'thread'` or `'process'` pool or as coroutines
+                        on the shared event loop (`'async'`, the default for coroutine functions).
+        ordered (bool): Whether the results of the map mode are in the order of the values
+                        (otherwise in the order of completion).
+        fail_fast (bool): Whether the first exception of the map mode is raised immediately.
+                          Otherwise :class:`click_inspect.errors.MapError` is raised after all calls.
+        expose (int or set): The number of (leading) parameters or the names of the parameters which become
+                             options of their own; the others are collapsed. By default all are exposed.
+        set_option (list): The names of the collapsed option.
 
     Returns:
         callable: A decorator which will add the requested options to the decorated function.
 
     Raises:
         TypeError: If `typing.get_type_hints` raises TypeError on Python >= 3.9.
+        ValueError: If `map_over` is not the name of an option or `executor` is not supported.
 
     Warns:
         UserWarning: If a parameter of `func` has no default and no type information can be
@@ -49,91 +82,308 @@ def add_options_from(func,
                      If `func` type hints contain standard collections as type hinting generics
                      for Python < 3.9 (e.g. `list[int]`).
     """
+    arguments = dict(names=names, include=include, exclude=exclude, custom=custom,
+                     docstring_backend=docstring_backend)
+    if map_over is not None:
+        from .mapping import EXECUTORS
+        if executor is not None and executor not in EXECUTORS:
+            raise ValueError(f'executor must be one of {EXECUTORS}, not {executor!r}')
+        map_options = dict(workers=workers, executor=executor, ordered=ordered, fail_fast=fail_fast)
+    else:
+        map_options = None
+
+    pipeline = dict(map_over=map_over, expose=expose, set_option=tuple(set_option))
+
+    if lazy:
+        from .lazy import defer
+
+        def _decorator(f):
+            f = _synchronous(f)
+            if map_options is not None:
+                f = _map_over(f, func, arguments, map_over, map_options)
+            _record(f, func, arguments, pipeline)
+            return defer(f, lambda: _create_options(func, _apply_pipeline(_get_option_specs(func, arguments),
+                                                                          **pipeline)))
+    else:
+        option_specs = _get_option_specs(func, arguments)
+        if map_over is not None and not any(spec.name == map_over for spec in option_specs):
+            raise ValueError(f'Cannot map over {map_over!r}, there is no such option')
+        option_specs = _apply_pipeline(option_specs, **pipeline)
+
+        def _decorator(f):
+            from . import profiling
+            f = _synchronous(f)
+            if map_options is not None:
+                f = _map_over(f, func, arguments, map_over, map_options)
+            _record(f, func, arguments, pipeline)
+            with profiling.phase(func, 'create_options'):
+                for spec in reversed(option_specs):
+                    spec.decorator()(f)
+            return f
+
+    return _decorator
+
+
+def inspect_options(func,
+                    *,
+                    names: Mapping[str, Sequence[str]] = MappingProxyType({}),
+                    include: Collection[str] = frozenset(),
+                    exclude: Container[str] = frozenset(),
+                    custom: Mapping[str, Mapping[str, Any]] = MappingProxyType({}),
+                    docstring_backend: str = 'napoleon') -> List[OptionSpec]:
+    """Inspect `func` and return the specifications of the options which `add_options_from` would add.
+
+    The arguments have the same meaning as for `add_options_from`. The specs can be turned into
+    options via `OptionSpec.decorator`.
+
+    Args:
+        func (callable): The function which provides the options through inspection.
+        names (dict): Map parameter names in `func` to `click.option` names.
+        include (set): Parameter names to be used from `func`.
+        exclude (set): Parameter names to be excluded from `func`.
+        custom (dict): Map parameter names to custom kwargs for the corresponding option.
+        docstring_backend (str): The backend for parsing the docstring of `func`
+                                 (see :func:`click_inspect.parser.parse_docstring`).
+
+    Returns:
+        list: The option specs in display order.
+
+    Raises:
+        TypeError: If `typing.get_type_hints` raises TypeError on Python >= 3.9.
+
+    Warns:
+        UserWarning: See `add_options_from`.
+    """
+    arguments = dict(names=names, include=include, exclude=exclude, custom=custom,
+                     docstring_backend=docstring_backend)
+    return list(_get_option_specs(func, arguments))
+
+
+def get_records(command) -> List[Tuple[Any, Dict[str, Any]]]:
+    """Return `(func, arguments)` for each usage of `add_options_from` on the given command or function.
+
+    Args:
+        command (click.Command or callable): The command or the decorated function.
+
+    Returns:
+        list: The inspected functions together with the keyword arguments of `add_options_from`.
+    """
+    return [(func, arguments) for func, arguments, __ in _get_full_records(command)]
+
+
+def _get_full_records(command) -> List[Tuple[Any, Dict[str, Any], Dict[str, Any]]]:
+    """Like `get_records` but including the arguments of the pipeline after the inspection (see `_apply_pipeline`)."""
+    f = command.callback if isinstance(command, click.Command) else command
+    return list(getattr(f, '__click_inspect__', ()))
+
+
+def _record(f, func, arguments, pipeline):
+    """Remember which functions have been inspected for `f` (used for code generation and reloading)."""
+    target = f.callback if isinstance(f, click.Command) else f
     try:
-        p_doc = parse_docstring(func, ignore=exclude)
-    except UnsupportedDocstringStyle:
-        p_doc = defaultdict(dict)
-    try:
-        type_hints = get_type_hints(func)
-    except TypeError:  # `from __future__ import annotations` with e.g. `list[int]` on Python < 3.9.
-        if sys.version_info < (3, 9):
-            warnings.warn('This decorator attempts to retrieve type hints via `typing.get_type_hints`. '
-                          'This however is not compatible with `from __future__ import annotations` '
-                          'and standard collections as type hinting generics (e.g. `list[int]`). '
-                          'Please use the typing collections instead (e.g. `typing.List[int]`). '
-                          'This decorator continues to work however no type information from '
-                          'annotations will be used. This might lead to unexpected results.')
-        else:
-            raise  # pragma: no cover
-        type_hints = {}
+        target.__dict__.setdefault('__click_inspect__', []).append((func, arguments, pipeline))
+    except AttributeError:  # Objects without `__dict__`.
+        pass
 
-    all_parameters = inspect.signature(func).parameters
-    to_be_used = {name for name in (include or all_parameters.keys()) if name not in exclude}
-    parameters = [(name, parameter) for name, parameter in all_parameters.items()
-                  if name in to_be_used]
 
-    include = set(include) | names.keys() | custom.keys()
+def _apply_pipeline(option_specs: List[OptionSpec], *, map_over: Optional[str] = None,
+                    expose: Union[int, Collection[str], None] = None,
+                    set_option: Sequence[str] = ('--set',)) -> List[OptionSpec]:
+    """Adjust the inspected specs for the map mode and collapse the ones which are not exposed."""
+    option_specs = _mapped_specs(option_specs, map_over)
+    if expose is None:
+        return option_specs
+    from .collapsed import collapse
+    return collapse(option_specs, expose, tuple(set_option))
+
+
+def _mapped_specs(option_specs: List[OptionSpec], name: Optional[str]) -> List[OptionSpec]:
+    """Let the option which is mapped over accept multiple values (a single default value is kept)."""
+    if name is None:
+        return option_specs
+    mapped = []
+    for spec in option_specs:
+        if spec.name == name and not spec.get('multiple'):
+            kwargs = {**spec.kwargs, 'multiple': True}
+            if kwargs.get('default') is not None:
+                kwargs['default'] = (kwargs['default'],)
+            spec = OptionSpec(spec.name, spec.opts, kwargs)
+        mapped.append(spec)
+    return mapped
+
+
+def _synchronous(f):
+    """Wrap a coroutine function, so it is run on the shared event loop when called."""
+    if not inspect.iscoroutinefunction(f):
+        return f
+
+    @functools.wraps(f)
+    def wrapper(*args, **kwargs):
+        from .aio import run
+        return run(f(*args, **kwargs))
+
+    return wrapper
+
+
+def _map_over(f, func, arguments: Dict[str, Any], name: str, map_options: Dict[str, Any]):
+    """Wrap the callback, so it receives the results of mapping `func` over the values of the option `name`."""
+    if isinstance(f, click.Command):
+        f.callback = _map_over(f.callback, func, arguments, name, map_options)
+        return f
+
+    @functools.wraps(f)
+    def wrapper(*args, **options):
+        from .mapping import map_call
+        # Options are passed by their destination names, which differ from the parameter names if renamed.
+        destinations = {spec.name: click.Option(spec.opts).name for spec in _get_option_specs(func, arguments)}
+        kwargs = {n: options[d] for n, d in destinations.items() if n != name and d in options}
+        mapped = destinations[name]
+        options[mapped] = map_call(func, name, options[mapped], kwargs, **map_options)
+        return f(*args, **options)
+
+    return wrapper
+
+
+def _get_option_specs(func, arguments: Dict[str, Any]) -> List[OptionSpec]:
+    from . import profiling
+    codegen = sys.modules.get(f'{__package__}.codegen')  # Imported by generated modules.
+    option_specs = codegen.lookup(func, arguments) if codegen is not None else None
+    if option_specs is not None:
+        profiling.count(func, 'precompiled')
+        return option_specs
+    with profiling.phase(func, 'compute_specs'), profiling.count_warnings(func):
+        option_specs = _load_option_specs(func, arguments)
+    profiling.count(func, 'parameters', len(option_specs))
+    return option_specs
+
+
+def _load_option_specs(func, arguments: Dict[str, Any]) -> List[OptionSpec]:
+    """Compute the option specs or load them from the persistent cache (with the original default objects)."""
+    from . import converters, persistent
+    if persistent.get_directory() is None:
+        return _compute_option_specs(func, **arguments)
+    # Converters which are (un)registered at import time change the specs without changing the source of `func`.
+    key = {**arguments, 'converters': converters.generation()}
+    option_specs = persistent.load_or_compute(func, key, lambda: _compute_option_specs(func, **arguments),
+                                              dependencies=lambda __: _type_sources(func, arguments))
+    return _restore_defaults(func, option_specs, arguments['custom'])
 
-    def _decorator(f):
-        for name, parameter in reversed(parameters):
-            has_default = parameter.default is not EMPTY
-            condition = (  # Whether to use this parameter or not.
-                name in include
-                or parameter.kind is KEYWORD_ONLY
-                or parameter.kind is POSITIONAL_OR_KEYWORD and has_default
-            )
-            if not condition:
-                continue
-
-            kwargs = {}
-            if 'help' in p_doc[name]:
-                kwargs['help'] = p_doc[name]['help']
-
-            if has_default:
-                kwargs['default'] = parameter.default
-            else:
-                kwargs['required'] = True
 
+def _type_sources(func, arguments: Dict[str, Any]) -> Set[str]:
+    """Return the source files of the modules which define the types of the options (e.g. enums)."""
+    from . import converters
+    from .cache import inspect_function
+    introspection = inspect_function(func, backend=arguments['docstring_backend'])
+    hints = [*(introspection.type_hints or {}).values(), *introspection.resolved_types.values(),
+             *(kwargs['type'] for kwargs in arguments['custom'].values() if 'type' in kwargs)]
+    sources = set()
+    while hints:
+        hint = hints.pop()
+        hints.extend(converters.get_args(hint))
+        for obj in (hint, converters.get_origin(hint)):
+            module = sys.modules.get(getattr(obj, '__module__', None) or '')
+            path = getattr(module, '__file__', None)
+            if isinstance(obj, type) and path is not None:
+                sources.add(path)
+    return sources
+
+
+def _restore_defaults(func, option_specs: List[OptionSpec],
+                      custom: Mapping[str, Mapping[str, Any]]) -> List[OptionSpec]:
+    """Replace the defaults of cached specs, which are unpickled copies, by the objects of the signature."""
+    parameters = inspect.signature(func).parameters
+    restored = []
+    for spec in option_specs:
+        if 'default' in spec.kwargs:
             try:
-                kwargs['type'] = custom[name]['type']
+                default = custom[spec.name]['default']
             except KeyError:
-                try:
-                    tp_hint = type_hints[name]
-                except KeyError:
-                    try:
-                        tp_hint = p_doc[name]['type']
-                    except KeyError:
-                        tp_hint = None
-                        if parameter.default is EMPTY:
-                            warnings.warn(f'No type hint for parameter {name!r}')
-                if tp_hint is not None:
-                    kwargs.update(_parse_type_hint_into_kwargs(tp_hint))
+                default = parameters[spec.name].default
+            if default is not spec.kwargs['default']:
+                spec = OptionSpec(spec.name, spec.opts, {**spec.kwargs, 'default': default})
+        restored.append(spec)
+    return restored
+
+
+def _create_options(func, option_specs: List[OptionSpec]) -> List[click.Parameter]:
+    """Create the options via `click.option` (in display order) without attaching them to a function."""
+    from . import profiling
+    holder = SimpleNamespace()
+    with profiling.phase(func, 'create_options'):
+        for spec in reversed(option_specs):
+            spec.decorator()(holder)
+    return holder.__click_params__[::-1] if option_specs else []
+
+
+def _compute_option_specs(func, *, names, include, exclude, custom, docstring_backend) -> List[OptionSpec]:
+    from .cache import inspect_function
+    introspection = inspect_function(func, backend=docstring_backend)
+    all_parameters = introspection.signature.parameters
+    to_be_used = {name for name in (include or all_parameters.keys()) if name not in exclude}
+    include = set(include) | names.keys() | custom.keys()
+    parameters = [
+        (name, parameter) for name, parameter in all_parameters.items()
+        if name in to_be_used and (  # Whether to use this parameter or not.
+            name in include
+            or parameter.kind is KEYWORD_ONLY
+            or parameter.kind is POSITIONAL_OR_KEYWORD and parameter.default is not EMPTY
+        )
+    ]
 
-            kwargs.update(custom.get(name, {}))
+    # Only the docstring types of the used parameters are resolved.
+    p_doc = introspection.docstring_parameters(include={name for name, __ in parameters})
+    type_hints = introspection.type_hints
+    if type_hints is None:
+        warnings.warn('This decorator attempts to retrieve type hints via `typing.get_type_hints`. '
+                      'This however is not compatible with `from __future__ import annotations` '
+                      'and standard collections as type hinting generics (e.g. `list[int]`). '
+                      'Please use the typing collections instead (e.g. `typing.List[int]`). '
+                      'This decorator continues to work however no type information from '
+                      'annotations will be used. This might lead to unexpected results.')
+        type_hints = {}
+
+    option_specs = []
+    for name, parameter in parameters:
+        has_default = parameter.default is not EMPTY
+        kwargs = {}
+        if 'help' in p_doc[name]:
+            kwargs['help'] = p_doc[name]['help']
 
+        if has_default:
+            kwargs['default'] = parameter.default
+        else:
+            kwargs['required'] = True
+
+        try:
+            kwargs['type'] = custom[name]['type']
+        except KeyError:
             try:
-                opt_names = names[name]
+                tp_hint = type_hints[name]
             except KeyError:
-                opt_name = name.replace("_", "-")
-                if kwargs.get('is_flag', False):
-                    opt_names = [f'--{opt_name}/--no-{opt_name}']
-                else:
-                    opt_names = [f'--{opt_name}']
+                try:
+                    tp_hint = p_doc[name]['type']
+                except KeyError:
+                    tp_hint = None
+                    if parameter.default is EMPTY:
+                        warnings.warn(f'No type hint for parameter {name!r}')
+            if tp_hint is not None:
+                kwargs.update(_parse_type_hint_into_kwargs(tp_hint))
 
-            click.option(*opt_names, **kwargs)(f)
-        return f
+        kwargs.update(custom.get(name, {}))
 
-    return _decorator
+        try:
+            opt_names = tuple(names[name])
+        except KeyError:
+            opt_name = name.replace("_", "-")
+            if kwargs.get('is_flag', False):
+                opt_names = (f'--{opt_name}/--no-{opt_name}',)
+            else:
+                opt_names = (f'--{opt_name}',)
+
+        option_specs.append(OptionSpec(name, opt_names, kwargs))
+    return option_specs
 
 
 def _parse_type_hint_into_kwargs(tp_hint):
-    args, origin = get_args(tp_hint), get_origin(tp_hint)
-    if tp_hint is bool:
-        return dict(is_flag=True, type=bool)
-    elif origin in (list, collections.abc.Sequence):
-        return dict(multiple=True, type=_parse_type_hint_into_kwargs(args[0])['type'])
-    elif origin is tuple:
-        return dict(type=tuple(_parse_type_hint_into_kwargs(x)['type'] for x in args))
-    elif origin is Union:
-        return _parse_type_hint_into_kwargs(args[0])
-    return dict(type=(origin or tp_hint))
+    from .converters import convert
+    return convert(tp_hint)
@@ -9,3 +9,20 @@ class UnsupportedDocstringStyle(Exception):
     def __init__(self, doc: str):
         width = self.MAX_WIDTH - len(self.__class__.__name__) - 2  # Account for ": ".
         super().__init__(textwrap.shorten(doc, width=width, placeholder='...'))
+
+
+class UnsupportedValue(Exception):
+    """Use this error if a value cannot be represented as source code."""
+
+
+class MapError(Exception):
+    """Use this error if calls failed in map mode (see :func:`click_inspect.mapping.map_call`).
+
+    Args:
+        failures (list): `(item, exception)` pairs in the order of the items.
+    """
+
+    def __init__(self, failures):
+        item, exc = failures[0]
+        super().__init__(f'{len(failures)} call(s) failed, the first for {item!r}: {exc!r}')
+        self.failures = failures
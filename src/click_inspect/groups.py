@@ -0,0 +1,85 @@
+from typing import Mapping
+
+import click
+
+from .commands import make_command, make_static_command, resolve_target
+from .static import get_summary
+
+
+class LazyGroup(click.Group):
+    """A click group which imports its commands from `"package.module:qualname"` targets on demand.
+
+    A target either refers to a `click.Command` or to a function which is then wrapped via `make_command`.
+    The target modules are only imported when the corresponding command is selected; listing the
+    commands in the help text uses the docstrings that are extracted from the source files statically.
+
+    With `static=True` the commands for functions are created from their source code as well
+    (see `make_static_command`), so the target modules are only imported when a command is executed,
+    not for showing its help text or completing its options.
+
+    Args:
+        *args: Positional arguments for `click.Group`.
+        lazy_commands (dict): Map command names to targets.
+        static (bool): Create the commands for functions without importing their modules (if possible).
+        **kwargs: Keyword arguments for `click.Group`.
+    """
+
+    def __init__(self, *args, lazy_commands: Mapping[str, str] = None, static: bool = False, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lazy_commands = dict(lazy_commands or {})
+        self.static = static
+
+    def add_lazy_command(self, name: str, target: str) -> None:
+        """Register a command which is loaded from the given target on demand.
+
+        Args:
+            name (str): The name of the command.
+            target (str): The target in the form `"package.module:qualname"`.
+        """
+        self.commands.pop(name, None)
+        self.lazy_commands[name] = target
+
+    def list_commands(self, ctx):
+        """List loaded as well as lazy commands."""
+        return sorted(self.commands.keys() | self.lazy_commands.keys())
+
+    def get_command(self, ctx, cmd_name):
+        """Return the command with the given name, loading it from its target if necessary."""
+        try:
+            return self.commands[cmd_name]
+        except KeyError:
+            pass
+        try:
+            target = self.lazy_commands[cmd_name]
+        except KeyError:
+            return None
+        command = make_static_command(target, name=cmd_name) if self.static else None
+        if command is None:
+            obj = resolve_target(target)
+            command = obj if isinstance(obj, click.Command) else make_command(obj, name=cmd_name)
+        self.commands[cmd_name] = command
+        return command
+
+    def format_commands(self, ctx, formatter):
+        """List the commands with their short help, without loading lazy commands if possible."""
+        rows = []
+        for name in self.list_commands(ctx):
+            if name in self.commands:
+                command = self.commands[name]
+                if command.hidden:
+                    continue
+                rows.append((name, command))
+            else:
+                summary = get_summary(self.lazy_commands[name])
+                rows.append((name, summary if summary is not None else self.get_command(ctx, name)))
+        if rows:
+            limit = formatter.width - 6 - max(len(name) for name, __ in rows)
+            rows = [(name, _short_help(x, limit)) for name, x in rows if not getattr(x, 'hidden', False)]
+            with formatter.section('Commands'):
+                formatter.write_dl(rows)
+
+
+def _short_help(command_or_summary, limit):
+    if isinstance(command_or_summary, click.Command):
+        return command_or_summary.get_short_help_str(limit)
+    return click.utils.make_default_short_help(command_or_summary, limit)
@@ -0,0 +1,73 @@
+from typing import Any, Dict, Optional, Tuple
+
+import click
+
+from . import persistent
+from .decorators import get_records
+
+
+class CachedHelpMixin:
+    """Cache the formatted help text of a command per command path and terminal width.
+
+    The help text is cached in-process and in the persistent cache (if enabled), where it is
+    invalidated when the source file of the command or of any function which provides options
+    via `add_options_from` changes.
+    """
+
+    def get_help(self, ctx: click.Context) -> str:
+        """Return the formatted help text, rendering it only if it is not cached.
+
+        Args:
+            ctx (click.Context): The context.
+
+        Returns:
+            str: The help text.
+        """
+        formatter = ctx.make_formatter()
+        params = tuple(list.__iter__(self.params))  # Placeholders of lazy params are not expanded.
+        key = (ctx.command_path, formatter.width, self.help, tuple(map(id, params)))
+        cache: Dict[Tuple[Any, ...], Tuple[Tuple[Any, ...], str]] = self.__dict__.setdefault('_help_cache', {})
+        try:
+            return cache[key][1]
+        except KeyError:
+            pass
+
+        def _render():
+            self.format_help(ctx, formatter)
+            return formatter.getvalue().rstrip('\n')
+
+        if persistent.get_directory() is None:
+            text = _render()
+        else:
+            identity, path = _owner(self)
+            text = persistent.load_or_compute_for_source(
+                identity, path, {'help': (ctx.command_path, formatter.width), 'sources': _sources(self)}, _render)
+        cache[key] = params, text  # The params are kept alive, so their ids are not reused.
+        return text
+
+
+class CachedHelpCommand(CachedHelpMixin, click.Command):
+    """A `click.Command` which caches its formatted help text (see `CachedHelpMixin`)."""
+
+
+def _owner(command) -> Tuple[Optional[str], Optional[str]]:
+    """Return identity and source file of the callback, or of the first inspected function (e.g. `make_command`)."""
+    candidates = [getattr(command, 'callback', None), *(func for func, __ in get_records(command))]
+    for func in candidates:
+        identity = persistent.function_identity(func)
+        if identity is not None:
+            return identity, _source_file(func)
+    return None, None
+
+
+def _source_file(func) -> Optional[str]:
+    return getattr(getattr(func, '__code__', None), 'co_filename', None)
+
+
+def _sources(command) -> Tuple[Any, ...]:
+    """Identify the functions which provide options and the state of their source files."""
+    sources = []
+    for func, arguments in get_records(command):
+        path = _source_file(func)
+        sources.append((persistent.function_identity(func), arguments, path and persistent._source_stat(path)))
+    return tuple(sources)
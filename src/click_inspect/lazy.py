@@ -0,0 +1,136 @@
+import threading
+from typing import Callable, List
+
+import click
+
+
+class Deferred:
+    """Placeholder for parameters which are created on first access of the containing `LazyParams`.
+
+    Args:
+        create (callable): Returns the parameters in display order.
+        reverse (bool): Whether the parameters are to be inserted in reverse order.
+                        This is the case for `__click_params__` which are reversed by `click.command`.
+    """
+
+    def __init__(self, create: Callable[[], List[click.Parameter]], *, reverse: bool):
+        self.create = create
+        self.reverse = reverse
+
+    def expand(self) -> List[click.Parameter]:
+        """Create the parameters in the order in which they are to be inserted."""
+        params = self.create()
+        return params[::-1] if self.reverse else params
+
+
+def _materializing(name):
+    method = getattr(list, name)
+
+    def wrapper(self, *args, **kwargs):
+        self.materialize()
+        return method(self, *args, **kwargs)
+
+    wrapper.__name__ = name
+    return wrapper
+
+
+class LazyParams(list):
+    """List of click parameters which expands `Deferred` placeholders when its content is accessed.
+
+    Appending, reversing and truth testing do not expand the placeholders, so the list can pass
+    through `click.option` and `click.command` without triggering the creation of parameters.
+    """
+
+    def __init__(self, iterable=()):
+        super().__init__(iterable)
+        self._lock = threading.Lock()
+        self._pending = any(isinstance(x, Deferred) for x in list.__iter__(self))
+
+    def append(self, item):
+        """Append without expanding placeholders."""
+        if isinstance(item, Deferred):
+            self._pending = True
+        super().append(item)
+
+    def reverse(self):
+        """Reverse without expanding placeholders."""
+        for item in list.__iter__(self):
+            if isinstance(item, Deferred):
+                item.reverse = not item.reverse
+        super().reverse()
+
+    def __bool__(self):
+        return list.__len__(self) > 0
+
+    def materialize(self) -> None:
+        """Expand all `Deferred` placeholders in-place."""
+        if not self._pending:
+            return
+        with self._lock:
+            if not self._pending:
+                return
+            items = []
+            for item in list.__iter__(self):
+                if isinstance(item, Deferred):
+                    items.extend(item.expand())
+                else:
+                    items.append(item)
+            list.__setitem__(self, slice(None), items)
+            self._pending = False
+
+    def __reduce_ex__(self, protocol):
+        self.materialize()
+        return list, (list(list.__iter__(self)),)
+
+    def __radd__(self, other):
+        self.materialize()
+        return other + list(list.__iter__(self))
+
+    __iter__ = _materializing('__iter__')
+    __len__ = _materializing('__len__')
+    __getitem__ = _materializing('__getitem__')
+    __setitem__ = _materializing('__setitem__')
+    __delitem__ = _materializing('__delitem__')
+    __contains__ = _materializing('__contains__')
+    __reversed__ = _materializing('__reversed__')
+    __add__ = _materializing('__add__')
+    __iadd__ = _materializing('__iadd__')
+    __mul__ = _materializing('__mul__')
+    __rmul__ = _materializing('__rmul__')
+    __imul__ = _materializing('__imul__')
+    __eq__ = _materializing('__eq__')
+    __ne__ = _materializing('__ne__')
+    __repr__ = _materializing('__repr__')
+    copy = _materializing('copy')
+    count = _materializing('count')
+    index = _materializing('index')
+    insert = _materializing('insert')
+    pop = _materializing('pop')
+    remove = _materializing('remove')
+    sort = _materializing('sort')
+    extend = _materializing('extend')
+    clear = _materializing('clear')
+
+
+def defer(f, create: Callable[[], List[click.Parameter]]):
+    """Add a placeholder to `f` that creates the parameters when they are accessed.
+
+    Args:
+        f (callable or click.Command): The function or command to which the parameters will be added.
+        create (callable): Returns the parameters in display order.
+
+    Returns:
+        The function or command `f`.
+    """
+    placeholder = Deferred(create, reverse=True)  # Mimic the order of repeated `click.option` calls.
+    if isinstance(f, click.Command):
+        f.params = _as_lazy_params(f.params)
+        f.params.append(placeholder)
+    else:
+        f.__click_params__ = _as_lazy_params(getattr(f, '__click_params__', []))
+        f.__click_params__.append(placeholder)
+    return f
+
+
+def _as_lazy_params(params: List) -> LazyParams:
+    return params if isinstance(params, LazyParams) else LazyParams(params)
@@ -0,0 +1,146 @@
+import functools
+import inspect
+from inspect import Parameter
+import os
+import signal
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .errors import MapError
+
+
+EXECUTORS = ('thread', 'process', 'async')
+
+# The keyword arguments of `add_options_from` which configure the map mode.
+MAP_ARGUMENTS = ('map_over', 'workers', 'executor', 'ordered', 'fail_fast')
+
+_FAILED = object()  # Placeholder for the results of failed calls.
+
+
+def map_call(func, name: str, items: Iterable[Any], kwargs: Dict[str, Any], *,
+             workers: Optional[int] = None,
+             executor: Optional[str] = None,
+             ordered: bool = True,
+             fail_fast: bool = True) -> Iterator[Any]:
+    """Call `func` once per item concurrently and yield the results as they become available.
+
+    Each item is passed as the keyword argument `name`, together with `kwargs`. At most twice as many
+    calls as there are workers are in flight (including results which wait for being yielded in order),
+    so `items` can be a (long) iterator. The calls only start when the results are consumed.
+
+    If the caller is interrupted (`KeyboardInterrupt`) or stops consuming the results, the pending
+    calls are cancelled; worker processes are interrupted as well (threads finish their current call).
+
+    Args:
+        func (callable): The function to be called; must be picklable for `executor='process'`.
+        name (str): The name of the parameter which receives the items.
+        items (iterable): The items.
+        kwargs (dict): Further keyword arguments for each call.
+        workers (int): The number of workers (None or 0 means one per CPU). For `executor='async'`
+                       this is the maximum number of coroutines which run at the same time.
+        executor (str): Either `'thread'`, `'process'` or `'async'` (for coroutine functions, which run on
+                        the shared event loop of :mod:`click_inspect.aio`). Defaults to `'async'` for
+                        coroutine functions and `'thread'` otherwise.
+        ordered (bool): Whether to yield the results in the order of the items
+                        (otherwise they are yielded in the order of completion).
+        fail_fast (bool): Whether to raise the first exception immediately (cancelling the pending calls).
+                          Otherwise the remaining calls proceed and `MapError` is raised at the end.
+
+    Returns:
+        iterator: The results.
+
+    Raises:
+        ValueError: If `executor` is not supported (or not `'async'` for a coroutine function).
+    """
+    if executor is not None and executor not in EXECUTORS:
+        raise ValueError(f'executor must be one of {EXECUTORS}, not {executor!r}')
+    if _is_coroutine_function(func):
+        if executor not in (None, 'async'):
+            raise ValueError(f"Coroutine functions require executor='async', not {executor!r}")
+        executor = 'async'
+    workers = workers or os.cpu_count() or 1
+    positional_only = tuple(p.name for p in inspect.signature(func).parameters.values()
+                            if p.kind is Parameter.POSITIONAL_ONLY)
+    call = functools.partial(_call, func, positional_only, dict(kwargs), name)
+    if executor == 'async':
+        from .aio import AsyncExecutor
+        pool = AsyncExecutor
+    else:  # Imported here, as importing `concurrent.futures.process` is slow (see `_map`).
+        from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+        pool = ProcessPoolExecutor if executor == 'process' else ThreadPoolExecutor
+    return _map(call, items, make_executor=functools.partial(pool, max_workers=workers),
+                max_pending=2 * workers, ordered=ordered, fail_fast=fail_fast)
+
+
+def _map(call: Callable[[Any], Any], items: Iterable[Any], *, make_executor, max_pending: int,
+         ordered: bool, fail_fast: bool) -> Iterator[Any]:
+    from concurrent.futures import FIRST_COMPLETED, wait  # Only when map mode is used.
+    indexed = enumerate(items)
+    pending: Dict[Any, Tuple[int, Any]] = {}  # Map futures to the index and the item.
+    results: Dict[int, Any] = {}  # Completed calls whose results have not been yielded yet.
+    failures: List[Tuple[int, Any, Exception]] = []
+    next_index = 0
+    exhausted = completed = False
+    pool = make_executor()
+    try:
+        while True:
+            while not exhausted and len(pending) + len(results) < max_pending:
+                try:
+                    index, item = next(indexed)
+                except StopIteration:
+                    exhausted = True
+                else:
+                    pending[pool.submit(call, item)] = index, item
+            if not pending and not results:
+                break
+            finished, __ = wait(pending, return_when=FIRST_COMPLETED) if pending else ((), None)
+            for future in finished:
+                index, item = pending.pop(future)
+                exc = future.exception()
+                if exc is None:
+                    results[index] = future.result()
+                elif fail_fast or not isinstance(exc, Exception):  # E.g. `KeyboardInterrupt` of a worker.
+                    raise exc
+                else:
+                    failures.append((index, item, exc))
+                    results[index] = _FAILED
+            if ordered:
+                while next_index in results:
+                    result = results.pop(next_index)
+                    next_index += 1
+                    if result is not _FAILED:
+                        yield result
+            else:
+                for result in list(results.values()):
+                    if result is not _FAILED:
+                        yield result
+                results.clear()
+        completed = True
+    except KeyboardInterrupt:
+        _interrupt(pool)
+        raise
+    finally:
+        for future in pending:
+            future.cancel()
+        pool.shutdown(wait=completed)
+    if failures:
+        raise MapError([(item, exc) for __, item, exc in sorted(failures, key=lambda failure: failure[0])])
+
+
+def _call(func, positional_only: Sequence[str], kwargs: Dict[str, Any], name: str, item: Any) -> Any:
+    kwargs = {**kwargs, name: item}
+    args = [kwargs.pop(n) for n in positional_only if n in kwargs]
+    return func(*args, **kwargs)
+
+
+def _is_coroutine_function(func) -> bool:
+    """Whether `func` is a coroutine function or an object with an `async def __call__`."""
+    return inspect.iscoroutinefunction(func) or inspect.iscoroutinefunction(getattr(func, '__call__', None))
+
+
+def _interrupt(pool) -> None:
+    """Interrupt the worker processes of the pool (if any), like Ctrl-C does for the process group."""
+    for process in list((getattr(pool, '_processes', None) or {}).values()):
+        try:
+            os.kill(process.pid, signal.SIGINT)
+        except (OSError, AttributeError):  # Already exited.
+            pass
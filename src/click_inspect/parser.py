@@ -1,66 +1,394 @@
 from __future__ import annotations
 
 from collections import defaultdict
+import functools
 import inspect
-from typing import Any, Container, DefaultDict, Dict
+import re
+from types import SimpleNamespace
+from typing import Any, Callable, Container, DefaultDict, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
 import warnings
 
-from sphinx.ext.napoleon import Config, GoogleDocstring, NumpyDocstring  # type: ignore
-from typestring_parser import parse as typstr_parse                      # type: ignore
-from typestring_parser.errors import UnsupportedTypeString               # type: ignore
-
+from . import profiling
 from .errors import UnsupportedDocstringStyle
 
 
-CONFIG = Config(napoleon_use_param=True)
 GOOGLE_HEADER = 'Args:'
 NUMPY_HEADER = 'Parameters\n----------'
 
+BACKENDS = ('napoleon', 'fast')
+GOOGLE_PARAMETER_SECTIONS = frozenset({'args', 'arguments', 'parameters', 'other parameters'})
+NUMPY_PARAMETER_SECTIONS = frozenset({'parameters', 'other parameters'})
+
+_GOOGLE_SECTION_REGEX = re.compile(r'^(\s|\w)+:\s*$')
+_GOOGLE_TYPED_ARG_REGEX = re.compile(r'(.+?)\(\s*(.*[^\s]+)\s*\)')
+_NUMPY_UNDERLINE_REGEX = re.compile(r'^[=\-`:\'"~^_*+#<>]{2,}\s*$')
+_SINGLE_COLON_REGEX = re.compile(r'(?<!:):(?!:)')
+_BULLET_LIST_REGEX = re.compile(r'^(\*|\+|\-)(\s+\S|\s*$)')
+_ENUMERATED_LIST_REGEX = re.compile(r'^(?P<paren>\()?(\d+|#|[ivxlcdm]+|[IVXLCDM]+|[a-zA-Z])(?(paren)\)|\.)(\s+\S|\s*$)')
+
 
-def parse_docstring(obj, *, ignore: Container[str] = frozenset()) -> Dict[str, Dict[str, Any]]:
+def parse_docstring(obj, *,
+                    ignore: Container[str] = frozenset(),
+                    backend: str = 'napoleon',
+                    include: Optional[Container[str]] = None) -> Dict[str, Dict[str, Any]]:
     """Parse the given docstring or the given obj's docstring.
 
     Args:
         obj (function or str): Parse the docstring from the given object.
         ignore (set): Ignore the type hint string of those parameters.
+        backend (str): Either 'napoleon' for converting Google- and Numpy-style docstrings via
+                       `sphinx.ext.napoleon` or 'fast' for using the built-in parser which
+                       does not require Sphinx.
+        include (set): Parse only those parameters (defaults to all parameters). The type hint
+                       strings of other parameters are not resolved.
 
     Returns:
         DefaultDict: Per parameter specification containing 'help' and 'type' (if provided).
 
     Raises:
         UnsupportedDocstringStyle: If the given docstring contains no parameter section.
+        ValueError: If the given backend is not supported.
     """
+    parameters, unresolved = _parse_docstring(obj, ignore=ignore, backend=backend, include=include)
+    for message in unresolved.values():
+        warnings.warn(message)
+    return parameters
+
+
+def _parse_docstring(obj, *,
+                     ignore: Container[str],
+                     backend: str,
+                     include: Optional[Container[str]] = None,
+                     ) -> Tuple[DefaultDict[str, Dict[str, Any]], Dict[str, str]]:
+    """Like `parse_docstring` but return the warning messages for unresolved type hints per parameter."""
+    check_backend(backend)
+    parameters: DefaultDict[str, Dict[str, Any]] = defaultdict(dict)
+    unresolved: Dict[str, str] = {}
     if isinstance(obj, str):
         doc, func = inspect.cleandoc(obj), None
     else:
         doc, func = inspect.getdoc(obj), obj  # type: ignore
         if doc is None:
-            return defaultdict(dict)
+            return parameters, unresolved
+    resolve = type_resolver_for(func) if func is not None else None
+    if resolve is None:  # String docstrings and classes, which have no global namespace.
+        resolve = functools.partial(_import_typestring_parser()[0], func=func)
+    for role, name, text in _extract_fields(doc, backend=backend):
+        if include is not None and name not in include:
+            continue
+        if role == 'param':
+            parameters[name]['help'] = text
+        elif name not in ignore:
+            resolved, value = resolve_type_string(text, resolve, func=func)
+            if resolved:
+                parameters[name]['type'] = value
+            elif value is not None:
+                unresolved[name] = value
+    return parameters, unresolved
+
+
+def check_backend(backend: str) -> None:
+    """Check that the given docstring backend is supported.
+
+    Args:
+        backend (str): The backend.
+
+    Raises:
+        ValueError: If the given backend is not supported.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f'Unsupported backend {backend!r} (must be one of {BACKENDS})')
+
+
+def resolve_type_string(text: str, resolve: Callable[[str], Any], *, func=None) -> Tuple[bool, Any]:
+    """Resolve the given docstring type string.
+
+    Args:
+        text (str): The type string.
+        resolve (callable): Resolves the type string (see `TypeResolver`).
+        func (callable): The function to which the type string belongs (for profiling).
+
+    Returns:
+        tuple: `(True, type)` if the type string was resolved, `(False, message)` if it refers to
+               names which cannot be resolved, or `(False, None)` if its syntax is not supported.
+    """
+    UnsupportedTypeString = _import_typestring_parser()[1]
+    try:
+        with profiling.phase(func, 'resolve_types'):
+            return True, resolve(text)
+    except NameError as err:
+        _name = str(err).split("'")[1]
+        return False, (f'Type hint {_name!r} cannot be resolved. '
+                       'Continuing as if no type information was provided.')
+    except UnsupportedTypeString:
+        return False, None
+
+
+def _extract_fields(doc: str, *, backend: str) -> List[Tuple[str, str, str]]:
+    """Return `(role, name, text)` of the parameter fields in the (cleaned) docstring."""
     if NUMPY_HEADER in doc:
-        lines = NumpyDocstring(doc, config=CONFIG).lines()
+        fields = _iter_numpy_fields(doc) if backend == 'fast' else _iter_napoleon_fields(doc, numpy=True)
     elif GOOGLE_HEADER in doc:
-        lines = GoogleDocstring(doc, config=CONFIG).lines()
+        fields = _iter_google_fields(doc) if backend == 'fast' else _iter_napoleon_fields(doc, numpy=False)
     elif ':param' in doc:  # reST-style
-        lines = doc.splitlines()
+        fields = _iter_rest_fields(doc.splitlines())
     else:
         raise UnsupportedDocstringStyle(doc)
-    parameters: DefaultDict[str, Dict[str, Any]] = defaultdict(dict)
+    return list(fields)
+
+
+class TypeCacheInfo(NamedTuple):
+    """Statistics of the module-scoped type string resolution cache."""
+
+    hits: int
+    misses: int
+    invalidations: int  # Misses because a name, which the type string refers to, was rebound.
+    modules: int
+    size: int           # Total number of memoized type strings.
+
+
+class TypeResolver:
+    """Resolves docstring type strings in a global namespace, memoizing the results.
+
+    A memoized result (or error) is reused as long as all names which the type string
+    refers to are still bound to the same objects in the namespace.
+
+    Args:
+        namespace (dict): The global namespace, e.g. `func.__globals__`.
+    """
+
+    __slots__ = ('namespace', '_scope', '_memo')
+
+    def __init__(self, namespace: Dict[str, Any]):
+        self.namespace = namespace
+        self._scope = SimpleNamespace(__globals__=namespace, __annotations__={})
+        self._memo: Dict[str, Tuple[Tuple[Any, ...], Any]] = {}
+
+    def __call__(self, text: str) -> Any:
+        """Resolve the given type string.
+
+        Args:
+            text (str): The type string.
+
+        Returns:
+            The corresponding type (hint).
+
+        Raises:
+            NameError: If the type string refers to names which cannot be resolved.
+            UnsupportedTypeString: If the syntax of the type string is not supported.
+        """
+        snapshot = self._snapshot(text)
+        try:
+            cached_snapshot, result = self._memo[text]
+        except KeyError:
+            result = self._resolve(text, snapshot)
+        else:
+            if all(a is b for a, b in zip(cached_snapshot, snapshot)):
+                _type_cache_stats['hits'] += 1
+            else:
+                _type_cache_stats['invalidations'] += 1
+                result = self._resolve(text, snapshot)
+        return _unwrap(result)
+
+    def __len__(self):
+        return len(self._memo)
+
+    def add_builtin(self, text: str, result: Any) -> None:
+        """Memoize a result which has been resolved without namespace (i.e. it refers to builtins only).
+
+        The result is discarded if the namespace binds any of the names which the type string refers to.
+
+        Args:
+            text (str): The type string.
+            result: The type (hint) or the `UnsupportedTypeString` error.
+        """
+        snapshot = self._snapshot(text)
+        if text not in self._memo and all(x is _UNBOUND for x in snapshot):
+            self._memo[text] = snapshot, result
+
+    def _resolve(self, text: str, snapshot: Tuple[Any, ...]) -> Any:
+        _type_cache_stats['misses'] += 1
+        typstr_parse, UnsupportedTypeString = _import_typestring_parser()
+        try:
+            result = typstr_parse(text, func=self._scope)
+        except (NameError, UnsupportedTypeString) as err:
+            result = err.with_traceback(None)
+        self._memo[text] = snapshot, result
+        return result
+
+    def _snapshot(self, text: str) -> Tuple[Any, ...]:
+        get = self.namespace.get
+        return tuple(get(name, _UNBOUND) for name in _type_string_names(text))
+
+
+_UNBOUND = object()
+_TYPE_STRING_KEYWORDS = frozenset({'of', 'or'})
+_IDENTIFIER_REGEX = re.compile(r'[^\W\d]\w*')
+
+# Map modules to the resolvers which are shared by all their functions.
+_type_resolvers: Dict[str, TypeResolver] = {}
+_type_cache_stats = dict(hits=0, misses=0, invalidations=0)
+
+
+def _unwrap(result: Any) -> Any:
+    """Raise the memoized result if it is an error."""
+    if isinstance(result, Exception):
+        raise result
+    return result
+
+
+@functools.lru_cache(maxsize=1024)
+def _type_string_names(text: str) -> Tuple[str, ...]:
+    return tuple(sorted(set(_IDENTIFIER_REGEX.findall(text)) - _TYPE_STRING_KEYWORDS))
+
+
+def type_resolver_for(func) -> Optional[TypeResolver]:
+    """Return the type string resolver which is shared by all functions of the module that defines `func`.
+
+    Args:
+        func (callable): The function.
+
+    Returns:
+        TypeResolver: The resolver or None if `func` has no global namespace (e.g. classes).
+    """
+    namespace = getattr(inspect.unwrap(func), '__globals__', None)
+    if not isinstance(namespace, dict):
+        return None
+    key = namespace.get('__name__') or f'<namespace at {id(namespace):#x}>'
+    resolver = _type_resolvers.get(key)
+    if resolver is None or resolver.namespace is not namespace:  # E.g. a module which was created anew.
+        resolver = _type_resolvers[key] = TypeResolver(namespace)
+    return resolver
+
+
+def type_cache_info() -> TypeCacheInfo:
+    """Return statistics of the module-scoped type string resolution cache."""
+    return TypeCacheInfo(modules=len(_type_resolvers), size=sum(map(len, _type_resolvers.values())),
+                         **_type_cache_stats)
+
+
+def clear_type_cache() -> None:
+    """Clear the module-scoped type string resolution cache and its statistics."""
+    _type_resolvers.clear()
+    _type_cache_stats.update(hits=0, misses=0, invalidations=0)
+
+
+def _iter_rest_fields(lines: Iterable[str]) -> Iterator[Tuple[str, str, str]]:
+    """Yield `(role, name, text)` for each `:param` and `:type` line."""
     for line in lines:
         if line.startswith(':param '):
-            name, parameters[name]['help'] = _find_name_and_remainder(line)
+            yield ('param', *_find_name_and_remainder(line))
         elif line.startswith(':type'):
-            name, type_string = _find_name_and_remainder(line)
-            if name in ignore:
-                continue
-            try:
-                parameters[name]['type'] = typstr_parse(type_string, func=func)
-            except NameError as err:
-                _name = str(err).split("'")[1]
-                warnings.warn(f'Type hint {_name!r} cannot be resolved. '
-                               'Continuing as if no type information was provided.')
-            except UnsupportedTypeString:
-                pass
-    return parameters
+            yield ('type', *_find_name_and_remainder(line))
+
+
+def _iter_napoleon_fields(doc: str, *, numpy: bool) -> Iterator[Tuple[str, str, str]]:
+    config, GoogleDocstring, NumpyDocstring = _import_napoleon()
+    converter = NumpyDocstring if numpy else GoogleDocstring
+    return _iter_rest_fields(converter(doc, config=config).lines())
+
+
+def _iter_google_fields(doc: str) -> Iterator[Tuple[str, str, str]]:
+    """Yield `(role, name, text)` for the parameters of a Google-style docstring in a single pass."""
+    # This mimics the output of `sphinx.ext.napoleon.GoogleDocstring`, i.e. the help text
+    # is the first line of the description.
+    section_indent: Optional[int] = None
+    field_indent: Optional[int] = None
+    names: List[str] = []
+    help_text: Optional[str] = None
+    for line in doc.splitlines():
+        stripped = line.strip()
+        if not stripped:
+            continue
+        indent = len(line) - len(line.lstrip())
+        if section_indent is not None and indent <= section_indent:
+            yield from _param_fields(names, help_text)
+            names, section_indent = [], None
+        if section_indent is None:
+            if _GOOGLE_SECTION_REGEX.match(line) and stripped[:-1].lower() in GOOGLE_PARAMETER_SECTIONS:
+                section_indent, field_indent = indent, None
+            continue
+        if field_indent is None:
+            field_indent = indent
+        if indent == field_indent:
+            yield from _param_fields(names, help_text)
+            before, __, help_text = (x.strip() for x in _partition_on_colon(stripped))
+            match = _GOOGLE_TYPED_ARG_REGEX.match(before)
+            if match:
+                before, type_string = match.group(1).strip(), match.group(2)
+            else:
+                type_string = ''
+            names = [name.strip() for name in before.split(',')]
+            if type_string:
+                yield from (('type', name, type_string) for name in names)
+        elif not help_text and names:
+            help_text = stripped
+    yield from _param_fields(names, help_text)
+
+
+def _iter_numpy_fields(doc: str) -> Iterator[Tuple[str, str, str]]:
+    """Yield `(role, name, text)` for the parameters of a Numpy-style docstring in a single pass."""
+    # This mimics the output of `sphinx.ext.napoleon.NumpyDocstring`, i.e. the help text
+    # is the first line of the description.
+    lines = doc.splitlines()
+    in_section = False
+    names: List[str] = []
+    help_text = None
+    for i, line in enumerate(lines):
+        if i + 1 < len(lines) and _NUMPY_UNDERLINE_REGEX.match(lines[i+1]) and line.strip():
+            yield from _param_fields(names, help_text)
+            names, in_section = [], line.strip().lower() in NUMPY_PARAMETER_SECTIONS
+            continue
+        if not in_section or not line.strip() or _NUMPY_UNDERLINE_REGEX.match(line):
+            continue
+        if not line[0].isspace():
+            yield from _param_fields(names, help_text)
+            name, __, type_string = (x.strip() for x in _partition_on_colon(line))
+            names, help_text = [x.strip() for x in name.split(',')], None
+            if type_string:
+                yield from (('type', name, type_string) for name in names)
+        elif help_text is None and names:
+            help_text = line.strip()
+    yield from _param_fields(names, help_text)
+
+
+def _param_fields(names: List[str], help_text: Optional[str]) -> Iterator[Tuple[str, str, str]]:
+    return (('param', name, _fix_help_text(help_text)) for name in names if name)
+
+
+def _partition_on_colon(s: str) -> Tuple[str, str, str]:
+    match = _SINGLE_COLON_REGEX.search(s)
+    if match is None:
+        return s, '', ''
+    return s[:match.start()], ':', s[match.end():]
+
+
+def _fix_help_text(text: Optional[str]) -> str:
+    """Napoleon moves descriptions which start with a list or a literal block to the next line."""
+    if not text or _BULLET_LIST_REGEX.match(text) or _ENUMERATED_LIST_REGEX.match(text) or text.endswith('::'):
+        return ''
+    return text
+
+
+@functools.lru_cache(maxsize=None)
+def _import_napoleon():
+    """Import `sphinx.ext.napoleon` on first use since it pulls in most of Sphinx."""
+    from sphinx.ext.napoleon import Config, GoogleDocstring, NumpyDocstring  # type: ignore
+    return Config(napoleon_use_param=True), GoogleDocstring, NumpyDocstring
+
+
+@functools.lru_cache(maxsize=None)
+def _import_typestring_parser():
+    """Import `typestring_parser` on first use since it pulls in `pyparsing`."""
+    from typestring_parser import parse                         # type: ignore
+    from typestring_parser.errors import UnsupportedTypeString  # type: ignore
+    return parse, UnsupportedTypeString
+
+
+def __getattr__(name):
+    if name == 'CONFIG':  # Kept for backwards compatibility, the config is created lazily now.
+        return _import_napoleon()[0]
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
 
 
 def _find_name_and_remainder(s):
@@ -0,0 +1,276 @@
+from collections.abc import Mapping, Set
+import functools
+import hashlib
+import os
+from pathlib import Path
+import pickle
+import tempfile
+from typing import Any, Callable, Dict, Iterable, Iterator, NamedTuple, Optional, Tuple, TypeVar
+import warnings
+
+
+ENV_VARIABLE = 'CLICK_INSPECT_CACHE'
+SUFFIX = '.pickle'
+
+T = TypeVar('T')
+
+_directory: Optional[Path] = None
+_enabled: Optional[bool] = None  # None means defer to the environment variable.
+
+
+class Entry(NamedTuple):
+    """The content of a cache file, holding the cached values for a single function."""
+
+    function: str                 # `module:qualname`
+    version: str                  # Version of click-inspect.
+    source: Tuple[str, int, int]  # Path, modification time (ns) and size of the source file.
+    values: Dict[str, Any]        # Map argument keys to the cached values (with warnings and dependencies).
+
+
+def enable(directory=None) -> None:
+    """Enable the persistent cache for this process.
+
+    Args:
+        directory (str or Path): The cache directory (defaults to ``$XDG_CACHE_HOME/click-inspect``).
+    """
+    global _directory, _enabled
+    _directory, _enabled = (Path(directory) if directory is not None else None), True
+
+
+def disable() -> None:
+    """Disable the persistent cache for this process."""
+    global _directory, _enabled
+    _directory, _enabled = None, False
+
+
+def get_directory() -> Optional[Path]:
+    """Return the cache directory or None if the persistent cache is disabled."""
+    if _enabled is None:
+        setting = os.environ.get(ENV_VARIABLE, '')
+        if setting.lower() in ('', '0', 'false', 'no', 'off'):
+            return None
+        if setting.lower() not in ('1', 'true', 'yes', 'on'):
+            return Path(setting)
+    elif not _enabled:
+        return None
+    if _directory is not None:
+        return _directory
+    return Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache') / 'click-inspect'
+
+
+def load_or_compute(func, arguments: Dict[str, Any], compute: Callable[[], T], *,
+                    dependencies: Optional[Callable[[T], Iterable[str]]] = None) -> T:
+    """Load the value for `func` and `arguments` from the cache or compute and store it.
+
+    Warnings which are issued by `compute` are stored alongside the value and reissued when
+    the value is loaded from the cache.
+
+    Args:
+        func (callable): The function to which the value belongs.
+        arguments (dict): Further arguments that identify the value.
+        compute (callable): Computes the value if it is not found in the cache.
+        dependencies (callable): Returns further source files for a computed value; the cached
+                                 value is only used as long as these files have not changed either.
+
+    Returns:
+        The cached or computed value.
+    """
+    if get_directory() is None:
+        return compute()
+    path = getattr(getattr(func, '__code__', None), 'co_filename', None)
+    return load_or_compute_for_source(function_identity(func), path, arguments, compute, dependencies=dependencies)
+
+
+def load_or_compute_for_source(identity: Optional[str], path: Optional[str],
+                               arguments: Dict[str, Any], compute: Callable[[], T], *,
+                               dependencies: Optional[Callable[[T], Iterable[str]]] = None) -> T:
+    """Like `load_or_compute` but for an object that is identified by `module:qualname` and its source file.
+
+    Args:
+        identity (str): The `module:qualname` of the object (None disables caching).
+        path (str): The source file of the object (None disables caching).
+        arguments (dict): Further arguments that identify the value.
+        compute (callable): Computes the value if it is not found in the cache.
+        dependencies (callable): See `load_or_compute`.
+
+    Returns:
+        The cached or computed value.
+    """
+    directory = get_directory()
+    if directory is None or identity is None or path is None:
+        return compute()
+    key, source = arguments_key(arguments), _source_stat(path)
+    if key is None or source is None:
+        return compute()
+    cache_file = directory / f'{_hash(identity)}{SUFFIX}'
+    entry = _read(cache_file)
+    if not _is_valid(entry, identity, source):
+        entry = None
+    try:
+        value, messages, stats = entry.values[key]  # type: ignore
+    except (AttributeError, KeyError, ValueError):
+        stats = None
+    if stats is None or any(_source_stat(stat[0]) != tuple(stat) for stat in stats):
+        with warnings.catch_warnings(record=True) as records:
+            warnings.simplefilter('always')
+            value = compute()
+        messages = [(record.message, record.category) for record in records]
+        paths = sorted(set(dependencies(value)) - {path}) if dependencies is not None else []
+        stats = tuple(filter(None, map(_source_stat, paths)))
+        values = dict(entry.values) if entry is not None else {}
+        values[key] = value, messages, stats
+        _write(cache_file, Entry(identity, _version(), source, values))
+    for message, category in messages:
+        warnings.warn(message, category)
+    return value
+
+
+def entries(directory: Optional[Path] = None) -> Iterator[Tuple[Path, Optional[Entry]]]:
+    """Iterate over the cache files and their content (None if the file is corrupt).
+
+    Args:
+        directory (Path): The cache directory (defaults to `get_directory`).
+
+    Yields:
+        tuple: The path of the cache file and its content.
+    """
+    directory = directory or get_directory()
+    if directory is None or not directory.is_dir():
+        return
+    for path in sorted(directory.glob(f'*{SUFFIX}')):
+        yield path, _read(path)
+
+
+def is_stale(entry: Optional[Entry]) -> bool:
+    """Check whether the given cache entry is outdated.
+
+    Args:
+        entry (Entry): The cache entry (None means a corrupt file).
+
+    Returns:
+        bool: Whether the entry is outdated (or corrupt).
+    """
+    if entry is None or entry.version != _version():
+        return True
+    return _source_stat(entry.source[0]) != tuple(entry.source)
+
+
+def purge(directory: Optional[Path] = None, *, stale_only: bool = False) -> int:
+    """Remove cache files.
+
+    Args:
+        directory (Path): The cache directory (defaults to `get_directory`).
+        stale_only (bool): Remove only entries which are outdated (see `is_stale`).
+
+    Returns:
+        int: The number of removed files.
+    """
+    count = 0
+    for path, entry in entries(directory):
+        if stale_only and not is_stale(entry):
+            continue
+        try:
+            path.unlink()
+        except FileNotFoundError:  # Removed concurrently.
+            continue
+        count += 1
+    return count
+
+
+def function_identity(func) -> Optional[str]:
+    """Return `module:qualname` of `func` or None if that does not identify it across processes.
+
+    Args:
+        func (callable): The function.
+
+    Returns:
+        str: The identity of the function (or None).
+    """
+    module, qualname = getattr(func, '__module__', None), getattr(func, '__qualname__', None)
+    if not module or not qualname or '<locals>' in qualname or '<lambda>' in qualname:
+        return None
+    return f'{module}:{qualname}'
+
+
+def arguments_key(arguments: Any) -> Optional[str]:
+    """Compute a key for the given arguments which is stable across processes.
+
+    Args:
+        arguments: Nested mappings, collections and other objects with a stable `repr`.
+
+    Returns:
+        str: The key or None if the arguments have no stable representation.
+    """
+    try:
+        return _hash(repr(_normalize(arguments)))
+    except ValueError:
+        return None
+
+
+def _normalize(obj):
+    if isinstance(obj, Mapping):
+        return tuple(sorted(((_normalize(k), _normalize(v)) for k, v in obj.items()), key=repr))
+    elif isinstance(obj, Set):
+        return ('set', tuple(sorted((_normalize(x) for x in obj), key=repr)))
+    elif isinstance(obj, (list, tuple)):
+        return tuple(_normalize(x) for x in obj)
+    elif isinstance(obj, type):
+        return f'{obj.__module__}.{obj.__qualname__}'
+    rep = repr(obj)
+    if ' at 0x' in rep or ' object at ' in rep:  # Default `repr` contains the memory address.
+        raise ValueError(rep)
+    return rep
+
+
+def _hash(s: str) -> str:
+    return hashlib.sha1(s.encode()).hexdigest()
+
+
+def _source_stat(path: str) -> Optional[Tuple[str, int, int]]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return path, stat.st_mtime_ns, stat.st_size
+
+
+@functools.lru_cache(maxsize=None)
+def _version() -> str:
+    import click_inspect
+    return click_inspect.__version__
+
+
+def _is_valid(entry: Optional[Entry], identity: str, source: Tuple[str, int, int]) -> bool:
+    return (entry is not None
+            and entry.function == identity
+            and entry.version == _version()
+            and tuple(entry.source) == source)
+
+
+def _read(path: Path) -> Optional[Entry]:
+    try:
+        with open(path, 'rb') as fh:
+            entry = pickle.load(fh)
+    except Exception:  # Missing or corrupt file, or types which cannot be resolved anymore.
+        return None
+    return entry if isinstance(entry, Entry) else None
+
+
+def _write(path: Path, entry: Entry) -> None:
+    """Write the entry atomically so that concurrent processes never observe partial files."""
+    try:
+        data = pickle.dumps(entry, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception:  # Values cannot be pickled (e.g. local classes as option types).
+        return
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.stem, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as fh:
+                fh.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+    except OSError:  # The cache is best effort only.
+        pass
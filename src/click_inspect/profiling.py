@@ -0,0 +1,214 @@
+from collections import Counter, defaultdict
+import contextlib
+import os
+import sys
+import time
+from typing import Any, DefaultDict, Dict, Iterator, List, Optional
+import warnings
+
+
+ENV_VARIABLE = 'CLICK_INSPECT_PROFILE'
+
+# Top-level phases per inspected function; their sum is the total time.
+TOP_LEVEL_PHASES = ('compute_specs', 'create_options')
+# Phases which are nested in `compute_specs`: the first three are part of `cache.inspect_function`
+# (and only run on cache misses), while the docstring types of the used parameters are resolved
+# afterwards (on demand, each type once per function).
+NESTED_PHASES = ('signature', 'get_type_hints', 'parse_docstring', 'resolve_types')
+COUNTERS = ('parameters', 'warnings', 'cache_hits', 'cache_misses', 'precompiled')
+
+_profile: Optional['Profile'] = None
+
+
+class Profile:
+    """Per function wall times of the phases of `add_options_from` as well as counters."""
+
+    def __init__(self):
+        self.timings: DefaultDict[str, DefaultDict[str, float]] = defaultdict(lambda: defaultdict(float))
+        self.counters: DefaultDict[str, Counter] = defaultdict(Counter)
+
+    def add_time(self, target: str, phase: str, seconds: float) -> None:
+        """Add the time spent in the given phase for the given function.
+
+        Args:
+            target (str): The function (`module:qualname`).
+            phase (str): The phase.
+            seconds (float): The time.
+        """
+        self.timings[target][phase] += seconds
+
+    def count(self, target: str, name: str, n: int = 1) -> None:
+        """Increment the counter of the given function.
+
+        Args:
+            target (str): The function (`module:qualname`).
+            name (str): The counter.
+            n (int): The increment.
+        """
+        self.counters[target][name] += n
+
+    def total(self, target: str) -> float:
+        """Return the total time spent for the given function (in seconds).
+
+        Args:
+            target (str): The function (`module:qualname`).
+
+        Returns:
+            float: The sum of the top-level phases.
+        """
+        return sum(self.timings[target].get(phase, 0.) for phase in TOP_LEVEL_PHASES)
+
+    def targets(self) -> List[str]:
+        """Return the recorded functions, sorted by decreasing total time."""
+        return sorted({*self.timings, *self.counters}, key=lambda t: (-self.total(t), t))
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the recorded data per function (times in seconds), sorted by decreasing total time."""
+        return {
+            target: {
+                'total': self.total(target),
+                'phases': dict(self.timings.get(target, {})),
+                'counters': dict(self.counters.get(target, {})),
+            }
+            for target in self.targets()
+        }
+
+    def to_json(self, **kwargs) -> str:
+        """Serialize the recorded data (see `as_dict`) as JSON.
+
+        Args:
+            **kwargs: Keyword arguments for `json.dumps`.
+
+        Returns:
+            str: The JSON document.
+        """
+        import json
+        return json.dumps(self.as_dict(), **kwargs)
+
+    def report(self) -> str:
+        """Format the recorded data as a table, sorted by decreasing total time (times in milliseconds)."""
+        # The nested phases directly follow the top-level phase which contains them.
+        compute_specs, create_options = TOP_LEVEL_PHASES
+        phases = ('total', compute_specs, *NESTED_PHASES, create_options)
+        header = ['function', *phases, *COUNTERS]
+        rows = [header]
+        for target, data in self.as_dict().items():
+            times = {'total': data['total'], **data['phases']}
+            rows.append([target,
+                         *(f'{1e3 * times.get(p, 0.):.2f}' for p in phases),
+                         *(str(data['counters'].get(c, 0)) for c in COUNTERS)])
+        widths = [max(len(row[i]) for row in rows) for i in range(len(header))]
+        lines = ['  '.join(x.ljust(w) if i == 0 else x.rjust(w) for i, (x, w) in enumerate(zip(row, widths)))
+                 for row in rows]
+        return '\n'.join(['click-inspect profile (times in ms)', *lines])
+
+
+class _Phase:
+    __slots__ = ('profile', 'target', 'name', 'start')
+
+    def __init__(self, profile: Profile, target: str, name: str):
+        self.profile, self.target, self.name = profile, target, name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        self.profile.add_time(self.target, self.name, time.perf_counter() - self.start)
+
+
+_NULL = contextlib.nullcontext()
+
+
+@contextlib.contextmanager
+def profile() -> Iterator[Profile]:
+    """Record the phases of `add_options_from` within the context.
+
+    Yields:
+        Profile: The recorded data.
+    """
+    global _profile
+    previous, _profile = _profile, Profile()
+    try:
+        yield _profile
+    finally:
+        _profile = previous
+
+
+def phase(func, name: str):
+    """Return a context manager which records the time spent in the phase `name`, if profiling is active.
+
+    Args:
+        func (callable): The inspected function.
+        name (str): The phase.
+
+    Returns:
+        A context manager.
+    """
+    if _profile is None:
+        return _NULL
+    return _Phase(_profile, _identity(func), name)
+
+
+def count(func, name: str, n: int = 1) -> None:
+    """Increment the counter of the given function (if profiling is active).
+
+    Args:
+        func (callable): The inspected function.
+        name (str): The counter.
+        n (int): The increment.
+    """
+    if _profile is not None:
+        _profile.count(_identity(func), name, n)
+
+
+def count_warnings(func):
+    """Return a context manager which counts the `UserWarning`s issued within the context, if profiling is active.
+
+    The warnings are reissued when the context is left.
+
+    Args:
+        func (callable): The inspected function.
+
+    Returns:
+        A context manager.
+    """
+    if _profile is None:
+        return _NULL
+    return _count_warnings(_profile, _identity(func))
+
+
+@contextlib.contextmanager
+def _count_warnings(profile: Profile, target: str) -> Iterator[None]:
+    with warnings.catch_warnings(record=True) as records:
+        warnings.simplefilter('always')
+        yield
+    profile.count(target, 'warnings', sum(issubclass(r.category, UserWarning) for r in records))
+    for record in records:
+        warnings.warn(record.message, record.category)
+
+
+def _identity(func) -> str:
+    module, qualname = getattr(func, '__module__', None), getattr(func, '__qualname__', None)
+    return f'{module}:{qualname}' if module and qualname else repr(func)
+
+
+def _dump(profile: Profile, destination: str) -> None:
+    """Write the report to stderr or, if `destination` is a `.json` path, the JSON document to that file."""
+    if destination.lower().endswith('.json'):
+        with open(destination, 'w') as fh:
+            fh.write(profile.to_json(indent=2))
+    else:
+        print(profile.report(), file=sys.stderr)
+
+
+def _enable_from_environment() -> None:
+    global _profile
+    setting = os.environ.get(ENV_VARIABLE, '')
+    if setting.lower() in ('', '0', 'false', 'no', 'off'):
+        return
+    import atexit
+    _profile = Profile()
+    atexit.register(_dump, _profile, setting)
+
+
+_enable_from_environment()
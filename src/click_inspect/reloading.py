@@ -0,0 +1,209 @@
+import importlib
+import sys
+import threading
+from types import CodeType, FunctionType
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+import warnings
+
+import click
+
+from . import persistent
+from .cache import FINGERPRINT_ATTRIBUTES
+from .codegen import iter_commands
+from .decorators import _apply_pipeline, _compute_option_specs, _create_options, _get_full_records, _load_option_specs
+
+
+class Reloader:
+    """Re-inspect the functions which provide options to a command when their source code changes.
+
+    The state of the source files of the functions which were passed to `add_options_from` for the
+    command (and its subcommands) is remembered on creation. `reload` re-executes the modules whose
+    files have changed since (like `importlib.reload`) and updates the existing function objects in
+    place, so references to them (e.g. in callbacks) use the new code. Only the functions whose code,
+    docstring, annotations or defaults actually changed are inspected again; their options are then
+    replaced in the parameters of the command in one step, leaving the other options untouched::
+
+        reloader = Reloader(cli)
+        while True:
+            args = shlex.split(input('> '))
+            reloader.reload()
+            cli.main(args, standalone_mode=False)
+
+    Alternatively, `watch` checks the files periodically in a background thread.
+
+    Args:
+        command (click.Command): The command (or group).
+    """
+
+    def __init__(self, command: click.Command):
+        self.command = command
+        self._stats: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._stop: Optional[threading.Event] = None
+        self._thread: Optional[threading.Thread] = None
+        for func in self._usages():
+            path = _module_file(sys.modules.get(func.__module__))
+            if path is not None:
+                self._stats[path] = persistent._source_stat(path)
+
+    def reload(self) -> List[Any]:
+        """Reload the changed modules and replace the options of the functions which changed.
+
+        A module which fails to execute (e.g. because of a syntax error while it is being edited)
+        is skipped with a warning until its file changes again.
+
+        Returns:
+            list: The functions whose options were replaced.
+
+        Warns:
+            UserWarning: If a changed module cannot be reloaded.
+        """
+        with self._lock:
+            usages = self._usages()
+            reloaded = self._reload_modules({func.__module__ for func in usages})
+            changed = []
+            for func, records in usages.items():
+                if func.__module__ not in reloaded:
+                    continue
+                new = _lookup(reloaded[func.__module__], func.__qualname__)
+                if new is None or new is func or _unchanged(func, new):
+                    continue
+                old_params = [_param_names(func, arguments, pipeline) for __, arguments, pipeline in records]
+                current = _update(func, new)
+                for (command, arguments, pipeline), names in zip(records, old_params):
+                    _replace_params(command, names, _inspect(current, arguments, pipeline))
+                    if current is not func:
+                        _replace_record(command, func, current)
+                changed.append(current)
+            return changed
+
+    def watch(self, *, interval: float = 1.0, on_reload: Optional[Callable[[List[Any]], None]] = None) -> 'Reloader':
+        """Check the source files periodically in a background thread (see `reload`).
+
+        Args:
+            interval (float): The interval between checks in seconds.
+            on_reload (callable): Receives the functions whose options were replaced (if any).
+
+        Returns:
+            Reloader: This reloader, which can be used as a context manager for stopping the thread.
+        """
+        self.stop()
+        self._stop = stop = threading.Event()
+
+        def _poll():
+            while not stop.wait(interval):
+                changed = self.reload()
+                if changed and on_reload is not None:
+                    on_reload(changed)
+
+        self._thread = threading.Thread(target=_poll, name='click-inspect-reloader', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop watching the source files."""
+        if self._stop is not None and self._thread is not None:
+            self._stop.set()
+            if self._thread is not threading.current_thread():
+                self._thread.join()
+        self._stop = self._thread = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _usages(self) -> Dict[Any, List[Tuple[click.Command, Dict[str, Any], Dict[str, Any]]]]:
+        """Map the inspected functions to the commands and arguments (and pipelines) with which they are used."""
+        usages: Dict[Any, List[Tuple[click.Command, Dict[str, Any], Dict[str, Any]]]] = {}
+        for command in iter_commands(self.command):
+            for func, arguments, pipeline in _get_full_records(command):
+                if isinstance(func, FunctionType):
+                    usages.setdefault(func, []).append((command, arguments, pipeline))
+        return usages
+
+    def _reload_modules(self, names: Set[str]) -> Dict[str, Any]:
+        reloaded = {}
+        for name in sorted(names):
+            module = sys.modules.get(name)
+            path = _module_file(module)
+            if path is None:
+                continue
+            stat = persistent._source_stat(path)
+            if self._stats.get(path) == stat:
+                continue
+            self._stats[path] = stat
+            try:
+                reloaded[name] = importlib.reload(module)
+            except Exception as err:
+                warnings.warn(f'Cannot reload {name!r}: {err!r}')
+        return reloaded
+
+
+def _module_file(module) -> Optional[str]:
+    path = getattr(module, '__file__', None)
+    return path if path and path.endswith('.py') else None
+
+
+def _lookup(module, qualname: str) -> Optional[FunctionType]:
+    obj = module
+    for name in qualname.split('.'):
+        obj = getattr(obj, name, None)
+    return obj if isinstance(obj, FunctionType) else None
+
+
+def _unchanged(func, new) -> bool:
+    try:
+        return bool(_state(func) == _state(new))
+    except Exception:  # E.g. defaults which cannot be compared.
+        return False
+
+
+def _state(func) -> Tuple[Any, ...]:
+    """The attributes which influence the options (code is compared regardless of line numbers)."""
+    return (_code_state(func.__code__), *(getattr(func, name) for name in FINGERPRINT_ATTRIBUTES[1:]))
+
+
+def _code_state(code: CodeType) -> Tuple[Any, ...]:
+    consts = tuple(_code_state(c) if isinstance(c, CodeType) else c for c in code.co_consts)
+    return (code.co_code, consts, code.co_names, code.co_varnames, code.co_freevars,
+            code.co_argcount, code.co_kwonlyargcount, code.co_flags)
+
+
+def _update(func: FunctionType, new: FunctionType) -> FunctionType:
+    """Update the function in place, or return the new function if that is not possible (e.g. closures)."""
+    try:
+        func.__code__ = new.__code__
+    except ValueError:  # The number of free variables differs.
+        return new
+    for name in FINGERPRINT_ATTRIBUTES[1:]:
+        setattr(func, name, getattr(new, name))
+    return func
+
+
+def _inspect(func, arguments: Dict[str, Any], pipeline: Dict[str, Any]) -> List[click.Parameter]:
+    """Create the options from scratch, bypassing precompiled specs (which are outdated)."""
+    return _create_options(func, _apply_pipeline(_load_option_specs(func, arguments), **pipeline))
+
+
+def _param_names(func, arguments: Dict[str, Any], pipeline: Dict[str, Any]) -> Set[str]:
+    """Return the names of the current options (not via the persistent cache, which is keyed by the changed file)."""
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')  # Have been issued already.
+        option_specs = _apply_pipeline(_compute_option_specs(func, **arguments), **pipeline)
+        return {param.name for param in _create_options(func, option_specs)}
+
+
+def _replace_params(command: click.Command, names: Set[str], params: List[click.Parameter]) -> None:
+    current = list(command.params)
+    positions = [i for i, param in enumerate(current) if param.name in names]
+    position = positions[0] if positions else len(current)
+    kept = [param for param in current if param.name not in names]
+    position -= sum(1 for i in positions if i < position)
+    command.params = kept[:position] + params + kept[position:]  # Replaced in one step.
+
+
+def _replace_record(command: click.Command, func, new) -> None:
+    records = getattr(command.callback, '__click_inspect__', [])
+    records[:] = [(new if f is func else f, arguments, pipeline) for f, arguments, pipeline in records]
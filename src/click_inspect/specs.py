@@ -0,0 +1,71 @@
+from typing import Any, Dict, Iterable, Mapping, Tuple
+
+import click
+
+
+class OptionSpec:
+    """Immutable description of an option which is derived from a parameter of an inspected function.
+
+    Instances are compact (`__slots__`), picklable and can be compared. They are hashable
+    if the keyword arguments are (e.g. not for list defaults, just like tuples containing lists).
+
+    Args:
+        name (str): The name of the parameter.
+        opts (tuple): The option names (declarations) for `click.option`.
+        kwargs (dict): The keyword arguments for `click.option`.
+    """
+
+    __slots__ = ('name', 'opts', '_kwargs')
+
+    def __init__(self, name: str, opts: Iterable[str], kwargs: Mapping[str, Any]):
+        set_attribute = object.__setattr__
+        set_attribute(self, 'name', name)
+        set_attribute(self, 'opts', tuple(opts))
+        set_attribute(self, '_kwargs', tuple(sorted(kwargs.items())))
+
+    @property
+    def kwargs(self) -> Dict[str, Any]:
+        """dict: The keyword arguments for `click.option` (a new dict on each access)."""
+        return dict(self._kwargs)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the value of a keyword argument for `click.option`.
+
+        Args:
+            key (str): The keyword.
+            default: Returned if the keyword is not present.
+
+        Returns:
+            The value of the keyword argument or `default`.
+        """
+        for k, v in self._kwargs:
+            if k == key:
+                return v
+        return default
+
+    def decorator(self):
+        """Return the `click.option` decorator which adds the option to a function or command."""
+        return click.option(*self.opts, **dict(self._kwargs))
+
+    def _key(self) -> Tuple[Any, ...]:
+        return self.name, self.opts, self._kwargs
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f'{type(self).__name__} is immutable')
+
+    def __delattr__(self, name):
+        raise AttributeError(f'{type(self).__name__} is immutable')
+
+    def __eq__(self, other):
+        if not isinstance(other, OptionSpec):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self):
+        return hash(self._key())
+
+    def __reduce__(self):
+        return type(self), (self.name, self.opts, dict(self._kwargs))
+
+    def __repr__(self):
+        return f'{type(self).__name__}({self.name!r}, {self.opts!r}, {dict(self._kwargs)!r})'
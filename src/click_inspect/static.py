@@ -0,0 +1,209 @@
+import ast
+import builtins
+import importlib.util
+import inspect
+import sys
+import types
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from . import persistent
+
+
+FunctionNode = Union[ast.FunctionDef, ast.AsyncFunctionDef]
+
+
+def split_target(target: str) -> Tuple[str, str]:
+    """Split a `"package.module:qualname"` target into module name and qualified name.
+
+    Args:
+        target (str): The target string.
+
+    Returns:
+        tuple: Module name and qualified name.
+
+    Raises:
+        ValueError: If the target is not of the form `"package.module:qualname"`.
+    """
+    module, sep, qualname = target.partition(':')
+    if not sep or not module or not qualname:
+        raise ValueError(f'Target must be of the form "package.module:qualname" (got {target!r})')
+    return module, qualname
+
+
+def find_source_file(module: str) -> Optional[str]:
+    """Find the source file of the given module without importing it (parent packages are imported though).
+
+    Args:
+        module (str): The name of the module.
+
+    Returns:
+        str: The path of the source file or None if it cannot be determined.
+    """
+    try:
+        spec = importlib.util.find_spec(module)
+    except (ImportError, ValueError):
+        return None
+    if spec is None or not spec.has_location or not (spec.origin or '').endswith('.py'):
+        return None
+    return spec.origin
+
+
+def find_definition(tree: ast.Module, qualname: str) -> Optional[Union[FunctionNode, ast.ClassDef]]:
+    """Find the (class or function) definition for `qualname` among the top-level nodes of `tree`.
+
+    Args:
+        tree (ast.Module): The parsed module.
+        qualname (str): The qualified name of the definition (e.g. `Class.method`).
+
+    Returns:
+        The definition node or None if it cannot be found.
+    """
+    node: ast.AST = tree
+    for name in qualname.split('.'):
+        for child in reversed(getattr(node, 'body', [])):  # The last definition wins.
+            if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)) and child.name == name:
+                node = child
+                break
+        else:
+            return None
+    return node  # type: ignore
+
+
+def get_summary(target: str) -> Optional[str]:
+    """Return the first paragraph of the docstring of the given target without importing its module.
+
+    The result is cached in the persistent cache (if enabled).
+
+    Args:
+        target (str): The target in the form `"package.module:qualname"`.
+
+    Returns:
+        str: The first paragraph of the docstring or None if it cannot be determined statically.
+    """
+    module, qualname = split_target(target)
+    path = find_source_file(module)
+    if path is None:
+        return None
+
+    def _compute():
+        with open(path, 'rb') as fh:
+            tree = ast.parse(fh.read(), filename=path)
+        node = find_definition(tree, qualname)
+        if node is None:
+            return None
+        return summarize(ast.get_docstring(node) or '')
+
+    return persistent.load_or_compute_for_source(target, path, {'summary': True}, _compute)
+
+
+def static_function(path: str, module: str, qualname: str) -> Optional[types.FunctionType]:
+    """Create a stand-in for a function from its source code, without importing its module.
+
+    The stand-in has the signature, annotations and docstring of the function and can be inspected
+    like the function itself (it must not be called though). Defaults must be literals. Names in
+    annotations are resolved from the builtins and from imports of modules which are already
+    imported; annotations which cannot be resolved that way are ignored.
+
+    Args:
+        path (str): The source file of the module.
+        module (str): The name of the module.
+        qualname (str): The qualified name of the function.
+
+    Returns:
+        function: The stand-in or None if the function cannot be found or is decorated, or if
+        its defaults are not literals.
+    """
+    with open(path, 'rb') as fh:
+        tree = ast.parse(fh.read(), filename=path)
+    node = find_definition(tree, qualname)
+    if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) or node.decorator_list:
+        return None
+    namespace = _imported_names(tree, module, is_package=path.endswith('__init__.py'))
+    try:
+        parameters = _parameters(node.args, namespace)
+    except ValueError:  # Defaults which are not literals.
+        return None
+    annotations = {p.name: p.annotation for p in parameters if p.annotation is not inspect.Parameter.empty}
+    func = types.FunctionType(_STAND_IN_CODE, namespace, node.name)
+    func.__module__, func.__qualname__ = module, qualname
+    func.__doc__ = ast.get_docstring(node)
+    func.__annotations__ = annotations
+    func.__signature__ = inspect.Signature(parameters)
+    return func
+
+
+# The code of stand-ins has no source file, so they are not cached persistently in place of the actual functions.
+_STAND_IN_CODE = next(x for x in compile('def stand_in(*args, **kwargs):\n'
+                                         '    raise RuntimeError("Static stand-ins cannot be called")\n',
+                                         '<static stand-in>', 'exec').co_consts
+                      if isinstance(x, types.CodeType))
+
+
+def _imported_names(tree: ast.Module, module: str, *, is_package: bool) -> Dict[str, Any]:
+    """Return the global namespace of the module as far as it consists of imports of already imported modules."""
+    package = module if is_package else module.rpartition('.')[0]
+    namespace: Dict[str, Any] = {'__builtins__': builtins, '__name__': f'<static {module}>'}
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                name = alias.name if alias.asname else alias.name.partition('.')[0]
+                if name in sys.modules and alias.name in sys.modules:
+                    namespace[alias.asname or name] = sys.modules[name]
+        elif isinstance(node, ast.ImportFrom):
+            try:
+                source = importlib.util.resolve_name('.' * node.level + (node.module or ''), package)
+            except (ImportError, ValueError):
+                continue
+            for alias in node.names:
+                if source in sys.modules and hasattr(sys.modules[source], alias.name):
+                    namespace[alias.asname or alias.name] = getattr(sys.modules[source], alias.name)
+    return namespace
+
+
+def _parameters(args: ast.arguments, namespace: Dict[str, Any]) -> List[inspect.Parameter]:
+    """Create the parameters of the signature, evaluating the defaults and annotations."""
+    positional = [*getattr(args, 'posonlyargs', []), *args.args]
+    defaults = [None] * (len(positional) - len(args.defaults)) + list(args.defaults)
+    kinds = [inspect.Parameter.POSITIONAL_ONLY] * len(getattr(args, 'posonlyargs', []))
+    kinds += [inspect.Parameter.POSITIONAL_OR_KEYWORD] * len(args.args)
+    items = list(zip(positional, kinds, defaults))
+    if args.vararg is not None:
+        items.append((args.vararg, inspect.Parameter.VAR_POSITIONAL, None))
+    items.extend((arg, inspect.Parameter.KEYWORD_ONLY, default)
+                 for arg, default in zip(args.kwonlyargs, args.kw_defaults))
+    if args.kwarg is not None:
+        items.append((args.kwarg, inspect.Parameter.VAR_KEYWORD, None))
+    return [inspect.Parameter(arg.arg, kind,
+                              default=inspect.Parameter.empty if default is None else ast.literal_eval(default),
+                              annotation=_annotation(arg.annotation, namespace))
+            for arg, kind, default in items]
+
+
+def _annotation(node: Optional[ast.expr], namespace: Dict[str, Any]) -> Any:
+    """Evaluate the annotation (also string annotations) or return `Parameter.empty` if that is not possible."""
+    if node is None:
+        return inspect.Parameter.empty
+    try:
+        value = eval(compile(ast.Expression(node), '<annotation>', 'eval'), namespace)
+        if isinstance(value, str):
+            value = eval(value, namespace)
+    except Exception:  # E.g. names which are defined in the module itself or in modules which are not imported.
+        return inspect.Parameter.empty
+    return value
+
+
+def summarize(doc: str) -> str:
+    """Return the first paragraph of a docstring (the text up to the first blank line).
+
+    Args:
+        doc (str): The docstring.
+
+    Returns:
+        str: The first paragraph.
+    """
+    lines = []
+    for line in doc.split('\f', 1)[0].strip().splitlines():
+        if not line.strip():
+            break
+        lines.append(line.strip())
+    return ' '.join(lines)
@@ -0,0 +1,186 @@
+import io
+import mmap
+import os
+import stat
+from typing import Any, Callable, Mapping
+import warnings
+
+import click
+
+
+class MappedChoice(click.Choice):
+    """A choice between strings which are converted to the corresponding values.
+
+    Args:
+        mapping (dict): Map the choices (as they are given on the command line) to the values.
+        case_sensitive (bool): Whether the choices are case sensitive.
+    """
+
+    def __init__(self, mapping: Mapping[str, Any], case_sensitive: bool = True):
+        super().__init__(list(mapping), case_sensitive=case_sensitive)
+        self.mapping = dict(mapping)
+
+    def convert(self, value, param, ctx):
+        """Convert the given choice to the corresponding value (values which are not strings are passed through)."""
+        if not isinstance(value, str):  # E.g. the default value.
+            return value
+        return self.mapping[super().convert(value, param, ctx)]
+
+
+class EnumChoice(MappedChoice):
+    """A choice between the values of an enum which are converted to the corresponding members.
+
+    Args:
+        enum (type): The enum class.
+        case_sensitive (bool): Whether the choices are case sensitive.
+    """
+
+    def __init__(self, enum, case_sensitive: bool = True):
+        super().__init__({str(member.value): member for member in enum}, case_sensitive=case_sensitive)
+        self.enum = enum
+
+
+class ArrayType(click.ParamType):
+    """An array of numbers which is converted in bulk via NumPy.
+
+    The value is given in one of the following forms:
+
+    * inline, separated by commas or whitespace (e.g. ``1,2,3`` or ``"1 2 3"``),
+    * ``@file.npy`` for a NumPy file (memory-mapped unless `mmap` is false),
+    * ``@file.txt`` for a text file with numbers separated by commas or whitespace,
+    * ``-`` for reading from stdin (either text or the NumPy file format).
+
+    NumPy is imported on first use; it is only required if such values are converted.
+
+    Args:
+        dtype: The data type of the array (defaults to `float` for text and the stored type for `.npy` files).
+        mmap (bool): Whether to memory-map `.npy` files (read-only) instead of loading them.
+    """
+
+    name = 'array'
+
+    def __init__(self, dtype=None, mmap: bool = True):
+        self.dtype = dtype
+        self.mmap = mmap
+
+    def convert(self, value, param, ctx):
+        """Convert the given value to an array (non-string values are passed to `numpy.asarray`)."""
+        np = _import_numpy(self, param, ctx)
+        if not isinstance(value, str):
+            return np.asarray(value, dtype=self.dtype)
+        if value == '-':
+            data = click.get_binary_stream('stdin').read()
+            if data.startswith(b'\x93NUMPY'):
+                return self._cast(np, np.load(io.BytesIO(data)))
+            return self._parse(np, data.decode(), 'stdin', param, ctx)
+        if not value.startswith('@'):
+            return self._parse(np, value, repr(value), param, ctx)
+        path = value[1:]
+        try:
+            if path.endswith('.npy'):
+                return self._cast(np, np.load(path, mmap_mode='r' if self.mmap else None))
+            with open(path) as fh:
+                text = fh.read()
+        except (OSError, ValueError) as err:
+            self.fail(f'Cannot read {path!r}: {err}', param, ctx)
+        return self._parse(np, text, repr(path), param, ctx)
+
+    def _parse(self, np, text: str, source: str, param, ctx):
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', DeprecationWarning)  # Older NumPy versions warn about invalid data.
+            try:
+                return np.fromstring(text.replace(',', ' '), dtype=self.dtype or float, sep=' ')
+            except (ValueError, DeprecationWarning):
+                self.fail(f'{source} is not a list of numbers separated by commas or whitespace', param, ctx)
+
+    def _cast(self, np, array):
+        return array if self.dtype is None or array.dtype == np.dtype(self.dtype) else array.astype(self.dtype)
+
+    def __repr__(self):
+        return f'ARRAY({self.dtype!r})' if self.dtype is not None else 'ARRAY'
+
+
+class BinaryInput(click.ParamType):
+    """Binary data which is read from a file (or ``-`` for stdin) without copying it into memory.
+
+    The value is converted to a read-only `memoryview` of the memory-mapped file or, if `stream`
+    is true, to a buffered reader of the file. Either is closed when the context is torn down
+    (i.e. after the command returns). Stdin is memory-mapped only if it is redirected from
+    a regular file, otherwise it is read into memory (or streamed as is).
+
+    Args:
+        stream (bool): Whether to convert to a buffered reader instead of a memoryview.
+    """
+
+    name = 'binary'
+
+    def __init__(self, stream: bool = False):
+        self.stream = stream
+
+    def convert(self, value, param, ctx):
+        """Open the given file (values which are neither strings nor paths are passed through)."""
+        if not isinstance(value, (str, os.PathLike)):  # E.g. the default value.
+            return value
+        path = os.fspath(value)
+        if path == '-':
+            stdin = click.get_binary_stream('stdin')
+            return stdin if self.stream else self._map_stdin(stdin, ctx)
+        try:
+            fh = open(path, 'rb')
+        except OSError as err:
+            self.fail(f'Cannot read {path!r}: {err.strerror}', param, ctx)
+        if self.stream:
+            _close_later(ctx, fh.close)
+            return fh
+        with fh:
+            try:
+                return self._map(fh.fileno(), ctx)
+            except (OSError, ValueError) as err:  # E.g. special files.
+                self.fail(f'Cannot map {path!r}: {err}', param, ctx)
+
+    def get_metavar(self, param):
+        """Return the metavar shown in the help text."""
+        return 'FILE'
+
+    def _map_stdin(self, stdin, ctx) -> memoryview:
+        try:
+            fd = stdin.fileno()
+        except (AttributeError, io.UnsupportedOperation):  # E.g. `click.testing.CliRunner`.
+            return memoryview(stdin.read())
+        if not stat.S_ISREG(os.fstat(fd).st_mode):  # Pipes and terminals cannot be mapped.
+            return memoryview(stdin.read())
+        return self._map(fd, ctx)
+
+    def _map(self, fd: int, ctx) -> memoryview:
+        if os.fstat(fd).st_size == 0:  # Empty files cannot be mapped.
+            return memoryview(b'')
+        mapped = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)  # Duplicates the file descriptor.
+        view = memoryview(mapped)
+
+        def _release():
+            try:
+                view.release()
+                mapped.close()
+            except BufferError:  # Still exported (e.g. by a `numpy.frombuffer` array); closed by the GC.
+                pass
+
+        _close_later(ctx, _release)
+        return view
+
+    def __repr__(self):
+        return 'BINARY(stream=True)' if self.stream else 'BINARY'
+
+
+def _close_later(ctx, close: Callable[[], None]) -> None:
+    """Close when the context is torn down (without a context, closing is left to the garbage collector)."""
+    ctx = ctx if ctx is not None else click.get_current_context(silent=True)
+    if ctx is not None:
+        ctx.call_on_close(close)
+
+
+def _import_numpy(param_type: click.ParamType, param, ctx):
+    try:
+        import numpy  # type: ignore
+    except ImportError:
+        param_type.fail('NumPy is required for array values (pip install numpy)', param, ctx)
+    return numpy
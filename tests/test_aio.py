@@ -0,0 +1,98 @@
+import asyncio
+import sys
+from types import SimpleNamespace
+
+import click
+from click.testing import CliRunner
+import pytest
+
+from click_inspect import add_options_from, aio, make_command
+from click_inspect.mapping import map_call
+
+
+async def fetch(*, url: str, delay: float = 0.0) -> str:
+    """Fetch the URL.
+
+    Args:
+        url (str): The URL.
+        delay (float): Simulated latency.
+    """
+    await asyncio.sleep(delay)
+    return f'<{url}>'
+
+
+class Concurrency:
+    def __init__(self):
+        self.current = self.maximum = 0
+
+    async def __call__(self, *, item: int) -> int:
+        self.current += 1
+        self.maximum = max(self.maximum, self.current)
+        await asyncio.sleep(0.01)
+        self.current -= 1
+        return item
+
+
+def test_run_reuses_the_loop():
+    loops = {aio.run(_current_loop()) for __ in range(3)}
+    assert loops == {aio.get_loop()}
+    assert aio.run(fetch(url='a')) == '<a>'
+
+
+def test_run_from_within_the_loop():
+    async def nested():
+        coroutine = fetch(url='a')
+        try:
+            aio.run(coroutine)
+        finally:
+            coroutine.close()
+
+    with pytest.raises(RuntimeError, match='within the loop'):
+        aio.run(nested())
+
+
+def test_gather_with_limit():
+    concurrency = Concurrency()
+    assert aio.gather(*(concurrency(item=i) for i in range(10)), limit=3) == list(range(10))
+    assert concurrency.maximum == 3
+
+
+def test_uvloop_is_used_if_installed(monkeypatch):
+    loops = []
+    monkeypatch.setitem(sys.modules, 'uvloop', SimpleNamespace(new_event_loop=lambda: loops.append(1) or 'uvloop'))
+    assert aio._new_event_loop() == 'uvloop'
+    assert loops == [1]
+
+
+def test_make_command_runs_coroutine_function():
+    result = CliRunner().invoke(make_command(fetch), ['--url', 'a'])
+    assert result.exit_code == 0
+    assert result.output == '<a>\n'
+
+
+def test_add_options_from_runs_coroutine_callback():
+    @click.command()
+    @add_options_from(fetch)
+    async def cmd(url, delay):
+        click.echo(await fetch(url=url, delay=delay))
+
+    assert CliRunner().invoke(cmd, ['--url', 'b']).output == '<b>\n'
+
+
+def test_map_call_async():
+    concurrency = Concurrency()
+    assert list(map_call(concurrency, 'item', range(20), {}, workers=4)) == list(range(20))
+    assert concurrency.maximum == 4
+    with pytest.raises(ValueError, match="Coroutine functions require executor='async'"):
+        map_call(fetch, 'url', [], {}, executor='thread')
+
+
+def test_make_command_map_over_async():
+    command = make_command(fetch, map_over='url', workers=2)
+    result = CliRunner().invoke(command, ['--url', 'a', '--url', 'b', '--delay', '0.01'])
+    assert result.exit_code == 0
+    assert result.output == '<a>\n<b>\n'
+
+
+async def _current_loop():
+    return asyncio.get_running_loop()
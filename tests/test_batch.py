@@ -0,0 +1,168 @@
+import textwrap
+import types
+from typing import List
+
+import click
+from click.testing import CliRunner
+import pytest
+
+from click_inspect import batch
+from click_inspect.batch import commands_from, inspect_module, members
+from click_inspect.cache import clear_cache
+from click_inspect.commands import make_command
+import click_inspect.parser
+from click_inspect.parser import type_resolver_for
+
+
+SOURCE = '''
+from typing import List
+
+from click import echo
+
+
+def first(x, *, y: int = 1):
+    """First function.
+
+    Args:
+        x (int): The x.
+        y (int): The y.
+    """
+    return x + y
+
+
+def second(names: List[str] = ()):
+    """Second function.
+
+    Args:
+        names (list of str): The names.
+    """
+    return ' '.join(names)
+
+
+def _private(x: int = 0):
+    pass
+
+
+class Service:
+    factor = 2
+
+    def scale(self, x: int = 1):
+        """Scale x.
+
+        Args:
+            x (int): The x.
+        """
+        return self.factor * x
+
+    @staticmethod
+    def double(x: int = 1):
+        return 2 * x
+
+    @classmethod
+    def triple(cls, x: int = 1):
+        return 3 * x
+
+    def _hidden(self):
+        pass
+'''
+
+
+@pytest.fixture
+def module():
+    module = types.ModuleType('batch_test_module')
+    exec(textwrap.dedent(SOURCE), vars(module))
+    yield module
+    clear_cache()
+
+
+def test_members_of_module(module):
+    assert [name for name, __ in members(module)] == ['first', 'second']  # Neither imported nor private.
+    assert [name for name, __ in members(module, predicate=lambda name, f: name != 'first')] == ['second']
+
+
+def test_members_of_class(module):
+    assert [name for name, __ in members(module.Service)] == ['double', 'triple']
+    instance = module.Service()
+    selected = members(instance)
+    assert [name for name, __ in selected] == ['scale', 'double', 'triple']
+    assert selected[0][1]() == 2
+
+
+def test_inspect_module(module):
+    results = inspect_module(module)
+    assert list(results) == ['first', 'second']
+    assert results['first'].docstring == {'x': {'help': 'The x.', 'type': int}, 'y': {'help': 'The y.', 'type': int}}
+    assert list(results['second'].signature.parameters) == ['names']
+
+
+def test_inspect_module_resolves_type_strings_once(module, monkeypatch):
+    calls = []
+    parse, error = click_inspect.parser._import_typestring_parser()
+    monkeypatch.setattr(click_inspect.parser, '_import_typestring_parser',
+                        lambda: (lambda text, func: calls.append(text) or parse(text, func=func), error))
+    for introspection in inspect_module(module).values():
+        introspection.docstring
+    assert sorted(calls) == ['int', 'list of str']
+
+
+@pytest.mark.parametrize('backend', ['napoleon', 'fast'])
+def test_commands_from_module(module, backend):
+    commands = commands_from(module, docstring_backend=backend)
+    expected = [make_command(f, docstring_backend=backend) for f in (module.first, module.second)]
+    assert [c.name for c in commands] == ['first', 'second']
+    assert [c.help for c in commands] == ['First function.', 'Second function.']
+    for command, reference in zip(commands, expected):
+        assert [(p.opts, p.type, p.default, p.multiple, p.help) for p in command.params] == \
+            [(p.opts, p.type, p.default, p.multiple, p.help) for p in reference.params]
+    group = click.Group(commands={c.name: c for c in commands})
+    assert CliRunner().invoke(group, ['first', '--x', '2']).output == '3\n'
+    assert CliRunner().invoke(group, ['second', '--names', 'a', '--names', 'b']).output == 'a b\n'
+
+
+def test_commands_from_instance(module):
+    commands = commands_from(module.Service(), cls=click.Command)
+    assert [c.name for c in commands] == ['scale', 'double', 'triple']
+    group = click.Group(commands={c.name: c for c in commands})
+    assert CliRunner().invoke(group, ['scale', '--x', '3']).output == '6\n'
+    assert CliRunner().invoke(group, ['triple']).output == '3\n'
+
+
+def test_commands_from_forwards_options(module):
+    commands = commands_from(module, predicate=lambda name, f: name == 'first', exclude={'y'})
+    assert [p.name for p in commands[0].params] == ['x']
+
+
+@pytest.mark.parametrize('backend', ['napoleon', 'fast'])
+def test_inspect_module_in_workers(module, backend):
+    serial = inspect_module(module, docstring_backend=backend)
+    clear_cache()
+    parallel = inspect_module(module, docstring_backend=backend, workers=2)
+    assert list(parallel) == list(serial)
+    assert parallel == serial
+
+
+def test_inspect_module_in_workers_resolves_module_names(module):
+    module.Real = float
+    module.first.__doc__ = module.first.__doc__.replace('x (int)', 'x (list of Real)')
+    module.second.__doc__ = module.second.__doc__.replace('list of str', 'list of Unknown')
+    module.str = bytes  # Shadowing names must be respected.
+    results = inspect_module(module, workers=2)
+    assert results['first'].docstring['x']['type'] == List[float]
+    assert 'type' not in results['second'].docstring['names']
+    assert "'Unknown' cannot be resolved" in results['second'].unresolved['names']
+    assert len(type_resolver_for(module.first)) == 3  # 'list of Real', 'list of Unknown' and 'int'.
+
+
+def test_inspect_module_falls_back_to_serial(module, monkeypatch):
+    class Unavailable:
+        def __init__(self, *args, **kwargs):
+            raise OSError
+
+    monkeypatch.setattr(batch, 'ProcessPoolExecutor', Unavailable)
+    assert inspect_module(module, workers=2)['first'].docstring['x'] == {'help': 'The x.', 'type': int}
+
+
+def test_commands_from_in_workers(module):
+    commands = commands_from(module, workers=0)
+    assert [c.name for c in commands] == ['first', 'second']
+    assert [p.type for p in commands[0].params] == [click.INT, click.INT]
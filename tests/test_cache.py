@@ -0,0 +1,131 @@
+import gc
+import weakref
+
+import pytest
+
+from click_inspect import add_options_from
+from click_inspect.cache import clear_cache, inspect_function
+import click_inspect.parser
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    clear_cache()
+    yield
+    clear_cache()
+
+
+def test_inspect_function_is_cached(base_function):
+    assert inspect_function(base_function) is inspect_function(base_function)
+
+
+def test_inspect_function_cached_per_backend(base_function):
+    napoleon = inspect_function(base_function, backend='napoleon')
+    fast = inspect_function(base_function, backend='fast')
+    assert napoleon is not fast
+    assert napoleon == fast
+    assert inspect_function(base_function, backend='napoleon') is napoleon
+
+
+@pytest.mark.parametrize('attribute, value', [
+    ('__doc__', 'Args:\n    b (str): Changed.'),
+    ('__annotations__', {}),
+    ('__defaults__', (2,)),
+    ('__kwdefaults__', {'d': 'changed', 'e': False}),
+])
+def test_inspect_function_detects_changes(base_function, attribute, value):
+    before = inspect_function(base_function)
+    setattr(base_function, attribute, value)
+    after = inspect_function(base_function)
+    assert after is not before
+    assert after is inspect_function(base_function)
+
+
+def test_inspect_function_detects_code_changes(base_function):
+    before = inspect_function(base_function)
+    base_function.__code__ = (lambda a, b=1, *, c, d='test', e=True: None).__code__
+    assert inspect_function(base_function) is not before
+
+
+def test_clear_cache(base_function):
+    before = inspect_function(base_function)
+    clear_cache()
+    assert inspect_function(base_function) is not before
+
+
+def test_inspect_function_does_not_keep_functions_alive():
+    def func(a: int, *, b: str = 'test'):
+        """
+        Args:
+            a (int): This is a.
+            b (str): This is b.
+        """
+
+    inspect_function(func)
+    ref = weakref.ref(func)
+    del func
+    gc.collect()
+    assert ref() is None
+
+
+def test_inspect_function_not_weak_referenceable():
+    assert inspect_function(divmod).signature.parameters.keys() == {'x', 'y'}
+
+
+def test_docstring_parameters_ignore_is_applied_after_caching():
+    def func(*, x: int):
+        """
+        Args:
+            x (UnknownType): Some parameter.
+        """
+
+    introspection = inspect_function(func)
+    with pytest.warns(UserWarning):
+        assert introspection.docstring_parameters() == {'x': {'help': 'Some parameter.'}}
+    with pytest.warns(UserWarning):  # Warnings are issued for every usage, not only the first.
+        introspection.docstring_parameters()
+    assert introspection.docstring_parameters(ignore={'x'}) == {'x': {'help': 'Some parameter.'}}
+
+
+def test_docstring_parameters_returns_copies(base_function):
+    introspection = inspect_function(base_function)
+    introspection.docstring_parameters(ignore={'b'})['b']['help'] = 'Modified.'
+    assert introspection.docstring_parameters()['b'] == {'help': 'This one should be added.', 'type': int}
+
+
+def test_docstring_types_are_resolved_on_demand(monkeypatch):
+    calls = []
+    parse, error = click_inspect.parser._import_typestring_parser()
+    monkeypatch.setattr(click_inspect.parser, '_import_typestring_parser',
+                        lambda: (lambda text, func=None: calls.append(text) or parse(text, func=func), error))
+
+    def func(*, x, y):
+        """
+        Args:
+            x (int): This is x.
+            y (UnknownType): This is y.
+        """
+
+    introspection = inspect_function(func)
+    assert calls == []
+    assert introspection.docstring_parameters(include={'x'}) == {'x': {'help': 'This is x.', 'type': int}}
+    assert introspection.docstring_parameters(include={'x'}) == {'x': {'help': 'This is x.', 'type': int}}
+    assert calls == ['int']
+    with pytest.warns(UserWarning, match="'UnknownType' cannot be resolved"):
+        assert introspection.docstring_parameters(include={'y'}) == {'y': {'help': 'This is y.'}}
+    assert introspection.unresolved.keys() == {'y'}
+    assert calls == ['int', 'UnknownType']
+
+
+def test_add_options_from_resolves_only_used_docstring_types(monkeypatch):
+    calls = []
+    parse, error = click_inspect.parser._import_typestring_parser()
+    monkeypatch.setattr(click_inspect.parser, '_import_typestring_parser',
+                        lambda: (lambda text, func=None: calls.append(text) or parse(text, func=func), error))
+    namespace = {}
+    exec('def func(*, {}): pass'.format(', '.join(f'p{i}=None' for i in range(60))), namespace)
+    func = namespace['func']
+    func.__doc__ = 'Summary.\n\n    Args:\n' + '\n'.join(f'        p{i} (list of int): Parameter {i}.' for i in range(60))
+
+    add_options_from(func, include={'p1', 'p2'})
+    assert calls == ['list of int']  # Shared by all parameters (and functions) of the module.
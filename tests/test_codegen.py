@@ -0,0 +1,269 @@
+import enum
+import importlib
+import sys
+import textwrap
+
+import click
+from click.testing import CliRunner
+import pytest
+
+from click_inspect import codegen, decorators
+from click_inspect.cli import main
+from click_inspect.errors import UnsupportedValue
+from click_inspect.specs import OptionSpec
+
+
+API = '''
+import enum
+from typing import List, Tuple
+
+
+class Color(enum.Enum):
+    RED = 'red'
+    BLUE = 'blue'
+
+
+def display(data, *, size: int, symbol: str = 'x', color: Color = Color.RED,
+            scale: float = float('inf'), tags: List[str] = (), point: Tuple[int, int] = (0, 0),
+            verbose: bool = False):
+    """Display something.
+
+    Args:
+        data: Not used.
+        size (int): Size of the grid.
+        symbol (str): Symbol for data points.
+        color (Color): The color.
+        scale (float): The scale.
+        tags (list of str): Some tags.
+        point ((int, int)): A point.
+        verbose (bool): Verbose output.
+    """
+'''
+
+CLI = '''
+import click
+
+from click_inspect import add_options_from
+
+from .api import display
+
+
+@click.group()
+def cli():
+    pass
+
+
+@cli.command()
+@add_options_from(display, names={'size': ['-s', '--size']}, exclude={'tags'})
+def first(**kwargs):
+    pass
+
+
+@cli.command()
+@add_options_from(display, include={'symbol', 'scale'}, custom={'symbol': {'type': click.Choice(['x', 'o'])}})
+@add_options_from(display, include={'verbose'}, lazy=True)
+def second(**kwargs):
+    pass
+'''
+
+
+@pytest.fixture
+def package(tmp_path, monkeypatch):
+    root = tmp_path / 'cg_pkg'
+    root.mkdir()
+    (root / '__init__.py').write_text('')
+    (root / 'api.py').write_text(textwrap.dedent(API))
+    (root / 'cli.py').write_text(textwrap.dedent(CLI))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.chdir(tmp_path)
+    yield root
+    codegen.unregister_all()
+    for name in [name for name in sys.modules if name.startswith('cg_pkg')]:
+        del sys.modules[name]
+
+
+def _describe_type(tp):
+    return type(tp), getattr(tp, 'choices', None), [_describe_type(x) for x in getattr(tp, 'types', ())]
+
+
+def _describe(group):
+    return {name: [(p.name, p.opts, p.secondary_opts, _describe_type(p.type), p.default, p.required, p.multiple,
+                    p.help) for p in command.params]
+            for name, command in group.commands.items()}
+
+
+def test_generated_module_replaces_inspection(package, monkeypatch):
+    expected = _describe(importlib.import_module('cg_pkg.cli').cli)
+    (package / '_options.py').write_text(codegen.generate('cg_pkg.cli'))
+    del sys.modules['cg_pkg.cli']
+
+    def _fail(*args, **kwargs):
+        raise AssertionError('Should not inspect')
+
+    monkeypatch.setattr(decorators, '_compute_option_specs', _fail)
+    importlib.import_module('cg_pkg._options')
+    assert _describe(importlib.import_module('cg_pkg.cli').cli) == expected
+
+
+def test_generated_module_content(package):
+    source = codegen.generate('cg_pkg.cli')
+    assert 'import cg_pkg.api' in source
+    assert "'default': cg_pkg.api.Color.RED" in source
+    assert "'type': (int, int)" in source
+    assert "'default': float('inf')" in source
+    assert 'pickle.loads(' in source  # click.Choice has no source representation.
+    namespace = {}
+    exec(source, namespace)
+    assert len(namespace['SPECS']) == 3
+    assert list(namespace['FINGERPRINTS']) == ['cg_pkg.api:display']
+    assert codegen.stale_functions(namespace['FINGERPRINTS']) == []
+
+
+def test_generate_is_deterministic(package):
+    assert codegen.generate('cg_pkg.cli') == codegen.generate('cg_pkg.cli')
+
+
+def test_check(package):
+    runner = CliRunner()
+    output = str(package / '_options.py')
+    result = runner.invoke(main, ['codegen', 'cg_pkg.cli', '--check', '-o', output])
+    assert result.exit_code == 1
+    assert 'outdated' in result.output
+
+    assert runner.invoke(main, ['codegen', 'cg_pkg.cli', '-o', output]).exit_code == 0
+    result = runner.invoke(main, ['codegen', 'cg_pkg.cli', '--check', '-o', output])
+    assert result.exit_code == 0
+    assert 'up-to-date' in result.output
+
+    with open(package / 'api.py', 'a') as fh:
+        fh.write('\n\ndef display(*, size: int = 1):\n    """Args:\n        size (int): Changed."""\n')
+    for name in ('cg_pkg.cli', 'cg_pkg.api'):
+        del sys.modules[name]
+    result = runner.invoke(main, ['codegen', 'cg_pkg.cli', '--check', '-o', output])
+    assert result.exit_code == 1
+
+
+def test_stale_functions(package):
+    namespace = {}
+    exec(codegen.generate('cg_pkg.cli'), namespace)
+    with open(package / 'api.py', 'a') as fh:
+        fh.write('\n\ndef display(*, size: int = 1):\n    pass\n')
+    del sys.modules['cg_pkg.api']
+    assert codegen.stale_functions(namespace['FINGERPRINTS']) == ['cg_pkg.api:display']
+    assert codegen.stale_functions({'cg_pkg.api:missing': ''}) == ['cg_pkg.api:missing']
+
+
+def test_generate_warns_for_local_functions(tmp_path, monkeypatch):
+    (tmp_path / 'cg_local.py').write_text(textwrap.dedent('''
+        import click
+        from click_inspect import add_options_from
+
+        def _make():
+            def func(x: int = 1): pass
+            return func
+
+        @click.command()
+        @add_options_from(_make())
+        def cmd(**kwargs): pass
+    '''))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    try:
+        with pytest.warns(UserWarning, match='Cannot precompile'):
+            source = codegen.generate('cg_local')
+    finally:
+        sys.modules.pop('cg_local', None)
+    assert 'SPECS = {\n}' in source
+
+
+def test_generate_excludes_functions_with_unsupported_defaults(tmp_path, monkeypatch):
+    (tmp_path / 'cg_default.py').write_text(textwrap.dedent('''
+        from decimal import Decimal
+
+        import click
+        from click_inspect import add_options_from
+
+        def func(*, x: Decimal = Decimal('1.5'), y: int = 1): pass
+
+        def other(*, z: int = 2): pass
+
+        @click.command()
+        @add_options_from(func)
+        @add_options_from(other)
+        def cmd(**kwargs): pass
+    '''))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    try:
+        with pytest.warns(UserWarning, match=r"Cannot precompile .*Decimal\('1.5'\)"):
+            source = codegen.generate('cg_default')
+    finally:
+        sys.modules.pop('cg_default', None)
+    assert 'pickle' not in source
+    namespace = {}
+    exec(source, namespace)
+    assert list(namespace['FINGERPRINTS']) == ['cg_default:other']
+
+
+def test_generate_references_sentinels_of_function_module(tmp_path, monkeypatch):
+    (tmp_path / 'cg_sentinel.py').write_text(textwrap.dedent('''
+        import click
+        from click_inspect import add_options_from
+
+        _MISSING = object()
+
+        def func(*, x: str = _MISSING): pass
+
+        @click.command()
+        @add_options_from(func)
+        def cmd(**kwargs): pass
+    '''))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    try:
+        source = codegen.generate('cg_sentinel')
+        assert "'default': cg_sentinel._MISSING" in source
+        namespace = {}
+        exec(source, namespace)
+        (specs,) = namespace['SPECS'].values()
+        assert specs[0].kwargs['default'] is sys.modules['cg_sentinel']._MISSING
+    finally:
+        sys.modules.pop('cg_sentinel', None)
+        codegen.unregister_all()
+
+
+def test_render_default_is_not_pickled():
+    imports = set()
+    source = codegen._render(OptionSpec('x', ('--x',), {'type': click.Choice(['a']), 'default': 'a'}), imports)
+    assert 'pickle.loads(' in source and 'pickle' in imports  # Only the type.
+    with pytest.raises(UnsupportedValue):
+        codegen._render(OptionSpec('x', ('--x',), {'default': (1, _Color.RED, object())}), set())
+
+
+class _Unpicklable:
+    def __reduce__(self):
+        raise TypeError
+
+
+class _Color(enum.Enum):
+    RED = 1
+
+
+@pytest.mark.parametrize('value', [
+    None, True, 1, 1.5, 'test', b'test', (), (1,), [1, 'a'], {1, 2}, frozenset(), set(), {'a': (1, 2)},
+    int, click.INT, float('nan'), float('-inf'), _Color.RED, click.Choice(['a', 'b']),
+])
+def test_render_roundtrip(value):
+    imports = set()
+    source = codegen._render(value, imports)
+    namespace = {name.split('.')[0]: importlib.import_module(name.split('.')[0]) for name in imports}
+    result = eval(source, namespace)
+    if isinstance(value, click.Choice):
+        assert result.choices == value.choices
+    elif value != value:
+        assert result != result
+    else:
+        assert result == value
+        assert type(result) is type(value)
+
+
+def test_render_unsupported():
+    with pytest.raises(UnsupportedValue):
+        codegen._render(_Unpicklable(), set())
@@ -0,0 +1,110 @@
+import enum
+from typing import List, Tuple
+
+import click
+from click.testing import CliRunner
+import pytest
+
+from click_inspect import add_options_from, make_command
+from click_inspect.collapsed import collapse, CollapsedOption
+from click_inspect.decorators import inspect_options
+
+
+class Mode(enum.Enum):
+    FAST = 'fast'
+    SLOW = 'slow'
+
+
+def configure(*, name: str, level: int = 1, ratio: float = 0.5, tags: List[str] = (),
+              point: Tuple[int, int] = (0, 0), verbose: bool = False, mode: Mode = Mode.FAST,
+              seed: int = None, limit: int):
+    """Configure.
+
+    Args:
+        name: The name.
+        level: The level.
+        ratio: The ratio.
+        tags: The tags.
+        point: The point.
+        verbose: Verbose output.
+        mode: The mode.
+        seed: The seed.
+        limit: The limit.
+    """
+    return dict(name=name, level=level, ratio=ratio, tags=tags, point=point, verbose=verbose, mode=mode,
+                seed=seed, limit=limit)
+
+
+@pytest.fixture()
+def command():
+    calls = []
+
+    @click.command()
+    @add_options_from(configure, expose=2)
+    def cmd(**kwargs):
+        calls.append(configure(**kwargs))
+
+    cmd.calls = calls
+    return cmd
+
+
+def invoke(command, args):
+    result = CliRunner().invoke(command, args)
+    assert result.exit_code == 0, result.output
+    return command.calls[-1]
+
+
+def test_exposed_options(command):
+    assert [p.name for p in command.params] == ['name', 'level', 'set']
+    assert isinstance(command.params[2], CollapsedOption)
+    assert list(command.params[2].specs) == ['ratio', 'tags', 'point', 'verbose', 'mode', 'seed', 'limit']
+
+
+def test_values_are_converted_per_name(command):
+    values = invoke(command, ['--name', 'x', '--set', 'ratio=0.25', '--set', 'tags=a', '--set', 'tags=b',
+                              '--set', 'point=1,2', '--set', 'verbose', '--set', 'mode=slow', '--set', 'limit=3'])
+    assert values == dict(name='x', level=1, ratio=0.25, tags=('a', 'b'), point=(1, 2), verbose=True,
+                          mode=Mode.SLOW, seed=None, limit=3)
+
+
+def test_defaults(command):
+    values = invoke(command, ['--name', 'x', '--set', 'limit=3', '--set', 'verbose=false', '--set', 'seed=7'])
+    assert values == dict(name='x', level=1, ratio=0.5, tags=(), point=(0, 0), verbose=False,
+                          mode=Mode.FAST, seed=7, limit=3)
+
+
+@pytest.mark.parametrize('args, message', [
+    (['--set', 'limit=1', '--set', 'rattio=1'], "No such parameter: 'rattio'. Did you mean ratio?"),
+    (['--set', 'limit=1', '--set', 'seed'], "'seed' is not of the form NAME=VALUE."),
+    (['--set', 'limit=a'], "Invalid value for '--set': limit=a is not a valid integer"),
+    ([], 'limit=... is required.'),
+])
+def test_errors(command, args, message):
+    result = CliRunner().invoke(command, ['--name', 'x', *args])
+    assert result.exit_code == 2
+    assert message in result.output
+
+
+def test_help_lists_collapsed_names(command):
+    output = CliRunner().invoke(command, ['--help']).output
+    assert '--set NAME=VALUE' in output
+    assert 'Set any of the following 7 parameters' in output
+
+
+def test_expose_names_and_option_name():
+    specs = collapse(inspect_options(configure), {'limit', 'name'}, ('-D', '--define'))
+    assert [spec.name for spec in specs] == ['name', 'limit', 'define']
+    assert collapse(specs[:2], 5) == specs[:2]  # Nothing to collapse.
+
+
+def test_make_command_with_collapsed_options():
+    command = make_command(configure, expose={'name'}, set_option=['-D'])
+    result = CliRunner().invoke(command, ['--name', 'x', '-D', 'limit=4', '-D', 'level=2'])
+    assert result.exit_code == 0
+    assert "'level': 2" in result.output and "'limit': 4" in result.output
+
+
+def test_collapsed_options_are_created_on_demand(command):
+    option = command.params[2]
+    invoke(command, ['--name', 'x', '--set', 'limit=3'])
+    assert set(option._options) == {'limit'}
@@ -0,0 +1,43 @@
+import sys
+
+import click
+from click.testing import CliRunner
+import pytest
+
+from click_inspect.commands import make_command, resolve_target
+
+
+def test_make_command(readme_example_function):
+    command = make_command(readme_example_function)
+    assert command.name == 'display-data'
+    assert command.help == 'Display the given data points in a 2D ASCII grid.'
+    assert [p.name for p in command.params] == ['data', 'size', 'symbol', 'empty']
+
+
+@pytest.mark.skipif(sys.version_info < (3, 8), reason='Positional-only parameters require Python 3.8.')
+def test_make_command_echoes_result():
+    namespace = {}
+    exec('def add(a: int, /, b: int = 1, *, c: int = 0): return a + b + c', namespace)
+    add = namespace['add']
+
+    command = make_command(add, name='plus')
+    result = CliRunner().invoke(command, ['--a', '1', '--b', '2', '--c', '3'])
+    assert result.exit_code == 0
+    assert result.output == '6\n'
+
+
+def test_make_command_no_output_for_none():
+    def func(x: int = 0):
+        pass
+
+    assert CliRunner().invoke(make_command(func)).output == ''
+
+
+def test_make_command_forwards_options(base_function):
+    command = make_command(base_function, exclude={'a'}, names={'b': ['-b']})
+    assert [p.opts for p in command.params] == [['-b'], ['--c'], ['--d'], ['--e']]
+
+
+def test_resolve_target():
+    assert resolve_target('click.testing:CliRunner.invoke') is CliRunner.invoke
+    assert resolve_target('click:command') is click.command
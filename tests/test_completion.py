@@ -0,0 +1,151 @@
+import enum
+import json
+
+import click
+from click._bashcomplete import get_choices
+from click.testing import CliRunner
+import pytest
+
+from click_inspect import add_options_from
+from click_inspect.cli import main
+from click_inspect.completion import build_index, complete, handle, load_index, write_index
+
+
+class Color(enum.Enum):
+    RED = 'red'
+    GREEN = 'green'
+
+
+def display(*, size: int, color: Color = Color.RED, tags=('a',), verbose: bool = False):
+    """Display something.
+
+    Args:
+        size (int): The size.
+        color (Color): The color.
+        tags (list of str): Some tags.
+        verbose (bool): Verbose output.
+    """
+
+
+@click.group()
+def cli():
+    """The CLI."""
+
+
+@cli.command()
+@add_options_from(display, names={'size': ['-s', '--size']})
+def show(**kwargs):
+    """Show something."""
+
+
+@cli.command()
+@click.argument('mode', type=click.Choice(['fast', 'slow']))
+@click.argument('files', nargs=-1, type=click.Choice(['x.txt', 'y.txt']))
+@click.option('--level', type=click.Choice(['1', '2']), multiple=True)
+def run(**kwargs):
+    """Run it."""
+
+
+@cli.command(hidden=True)
+def secret():
+    pass
+
+
+@cli.group()
+def nested():
+    """Nested group."""
+
+
+@nested.command()
+@click.option('--point', nargs=2, type=int)
+@click.option('--name', type=click.Choice(['ab', 'ac']))
+def leaf(**kwargs):
+    """A leaf."""
+
+
+@pytest.fixture(scope='module')
+def index():
+    return json.loads(json.dumps(build_index(cli)))
+
+
+@pytest.mark.parametrize('args, incomplete', [
+    ([], ''),
+    ([], 's'),
+    ([], '-'),
+    (['show'], '-'),
+    (['show'], '--'),
+    (['show'], '--c'),
+    (['show', '--color'], ''),
+    (['show', '--color'], 'g'),
+    (['show', '--color', 'red'], '--'),
+    (['show', '-s', '1'], '-'),
+    (['show'], '--color='),
+    (['show'], '--no'),
+    (['run'], ''),
+    (['run'], 'f'),
+    (['run', 'fast'], ''),
+    (['run', 'fast', 'x.txt'], 'y'),
+    (['run', '--level', '1'], '--'),
+    (['run', '--level'], ''),
+    (['nested'], ''),
+    (['nested', 'leaf'], '--'),
+    (['nested', 'leaf', '--point', '1'], ''),
+    (['nested', 'leaf', '--point', '1', '2'], ''),
+    (['nested', 'leaf', '--name'], 'a'),
+    (['nested', 'leaf', '--', '--name'], '-'),
+])
+def test_complete_matches_click(index, args, incomplete):
+    assert complete(index, args, incomplete) == get_choices(cli, 'cli', list(args), incomplete)
+
+
+def test_index_contents(index):
+    show = index['command']['commands']['show']
+    assert {tuple(o['opts']): o['choices'] for o in show['options']}[('--color',)] == ['red', 'green']
+    assert [o['secondary_opts'] for o in show['options'] if o['is_flag']] == [['--no-verbose']]
+    assert [o['required'] for o in show['options']] == [True, False, False, False]
+    assert index['command']['commands']['secret']['hidden'] is True
+
+
+@pytest.mark.parametrize('instruction, words, cword, expected', [
+    ('complete', 'cli show --co', '2', '--color\n'),
+    ('complete_zsh', 'cli show --co', '2', '--color\nThe color.\n'),
+    ('complete_zsh', 'cli sh', '1', 'show\nShow something.\n'),
+    ('complete_fish', 'cli show', '--co', '--color\tThe color.\n'),
+])
+def test_handle(tmp_path, monkeypatch, capsys, instruction, words, cword, expected):
+    path = tmp_path / 'index.json'
+    write_index(cli, path)
+    monkeypatch.setenv('_MY_CLI_COMPLETE', instruction)
+    monkeypatch.setenv('COMP_WORDS', words)
+    monkeypatch.setenv('COMP_CWORD', cword)
+    with pytest.raises(SystemExit):
+        handle(path, 'my-cli')
+    assert capsys.readouterr().out == expected
+
+
+def test_handle_returns_if_not_completing(tmp_path, monkeypatch):
+    path = tmp_path / 'index.json'
+    write_index(cli, path)
+    monkeypatch.delenv('_MY_CLI_COMPLETE', raising=False)
+    assert handle(path, 'my-cli') is None
+    monkeypatch.setenv('_MY_CLI_COMPLETE', 'source_bash')
+    assert handle(path, 'my-cli') is None  # The completion script is provided by click.
+    monkeypatch.setenv('_MY_CLI_COMPLETE', 'complete')
+    assert handle(tmp_path / 'missing.json', 'my-cli') is None
+
+
+def test_load_index(tmp_path):
+    path = tmp_path / 'index.json'
+    path.write_text('{"version": 0}')
+    assert load_index(path) is None
+    path.write_text('corrupt')
+    assert load_index(path) is None
+
+
+def test_completion_index_cli(tmp_path):
+    path = tmp_path / 'index.json'
+    result = CliRunner().invoke(main, ['completion-index', f'{__name__}:cli', '-o', str(path)])
+    assert result.exit_code == 0
+    assert load_index(path) == build_index(cli)
+    result = CliRunner().invoke(main, ['completion-index', f'{__name__}:cli'])
+    assert json.loads(result.output) == build_index(cli)
@@ -0,0 +1,285 @@
+import enum
+from pathlib import Path, PurePath
+import sys
+from typing import BinaryIO, Dict, List, NamedTuple, Optional, Tuple, Union
+
+import click
+from click.testing import CliRunner
+import pytest
+
+from click_inspect import add_options_from, converters
+from click_inspect.types import ArrayType, BinaryInput, EnumChoice, MappedChoice
+
+
+class Color(enum.Enum):
+    RED = 'red'
+    BLUE = 'blue'
+
+
+class Level(enum.IntEnum):
+    LOW = 1
+    HIGH = 2
+
+
+@pytest.fixture(autouse=True)
+def registry(monkeypatch):
+    monkeypatch.setattr(converters, '_converters', dict(converters._converters))
+    monkeypatch.setattr(converters, '_memo', {})
+
+
+def test_convert_defaults():
+    assert converters.convert(int) == dict(type=int)
+    assert converters.convert(Optional[int]) == dict(type=int)
+    assert converters.convert(List) == dict(multiple=True)
+    assert converters.convert(Dict[str, int]) == dict(type=dict)
+    assert converters.convert(Path) == dict(type=Path)
+
+
+class Point(NamedTuple):
+    x: int
+    y: int
+
+
+def test_classes_of_sequences_are_used_directly():
+    assert converters.convert(tuple) == dict(type=tuple)
+    assert converters.convert(Point) == dict(type=Point)
+    assert converters.convert(list) == dict(type=list)
+    assert converters.convert(Tuple[int, str]) == dict(type=(int, str))
+
+    def func(*, x: tuple = ('a',), p: Point = None):
+        pass
+
+    @click.command()
+    @add_options_from(func)
+    def cmd(x, p):
+        click.echo(f'{x} {p}')
+
+    result = CliRunner().invoke(cmd, [])
+    assert result.exit_code == 0, result.output
+    assert result.output == "('a',) None\n"
+
+
+def test_convert_is_memoized():
+    calls = []
+    converters.register(dict, lambda tp: calls.append(tp) or dict(type=str))
+    tp = Dict[str, int]
+    assert converters.convert(tp) == converters.convert(tp) == dict(type=str)
+    assert calls == [tp]
+    converters.convert(tp)['type'] = int  # Results are copies.
+    assert converters.convert(tp) == dict(type=str)
+
+
+def test_memo_is_bounded(monkeypatch):
+    monkeypatch.setattr(converters, '_MEMO_SIZE', 3)
+    for __ in range(2):
+        converters.convert(List[int])
+    assert [tp for tp, __ in converters._memo] == [int, List[int]]  # Including the nested hint.
+    for tp in (str, float):
+        converters.convert(tp)
+    assert [tp for tp, __ in converters._memo] == [List[int], str, float]
+
+
+@pytest.mark.skipif(sys.version_info < (3, 9), reason='Requires typing.Annotated')
+def test_unhashable_hints_are_not_memoized():
+    from typing import Annotated
+    tp = Annotated[int, {'unhashable': True}]
+    assert converters.convert(tp) == converters.convert(tp)
+    assert not converters._memo
+
+
+def test_memo_distinguishes_equal_unions():
+    assert converters.convert(Union[int, str]) == dict(type=int)
+    assert converters.convert(Union[str, int]) == dict(type=str)
+
+
+def test_register_clears_memo():
+    assert converters.convert(Dict[str, int]) == dict(type=dict)
+    converters.register(dict, lambda tp: dict(type=str))
+    assert converters.convert(Dict[str, int]) == dict(type=str)
+    converters.unregister(dict)
+    assert converters.convert(Dict[str, int]) == dict(type=dict)
+
+
+def test_register_as_decorator_applies_to_subclasses():
+    @converters.register(PurePath)
+    def _convert_path(tp):
+        return dict(type=click.Path(dir_okay=False))
+
+    assert isinstance(converters.convert(Path)['type'], click.Path)
+    assert isinstance(converters.convert(List[Path])['type'], click.Path)
+
+
+def test_nested_hints_use_registered_converters():
+    converters.register(int, lambda tp: dict(type=click.IntRange(0, 10)))
+    assert isinstance(converters.convert(List[int])['type'], click.IntRange)
+    assert converters.convert(bool) == dict(is_flag=True, type=bool)  # Exact match takes precedence.
+
+
+@pytest.mark.parametrize('enum_cls, args, expected', [
+    (Color, ['--x', 'blue'], Color.BLUE),
+    (Color, [], Color.RED),
+    (Level, ['--x', '2'], Level.HIGH),
+])
+def test_enum(enum_cls, args, expected):
+    def func(x: enum_cls = list(enum_cls)[0]):
+        pass
+
+    @click.command()
+    @add_options_from(func)
+    def cmd(x):
+        click.echo(repr(x))
+
+    assert isinstance(cmd.params[0].type, EnumChoice)
+    assert CliRunner().invoke(cmd, args).output == f'{expected!r}\n'
+    result = CliRunner().invoke(cmd, ['--x', 'green'])
+    assert result.exit_code == 2
+    assert 'invalid choice: green' in result.output
+
+
+@pytest.mark.skipif(sys.version_info < (3, 8), reason='typing.Literal requires Python 3.8.')
+def test_literal():
+    from typing import Literal
+
+    def func(*, mode: Literal['fast', 'slow'] = 'fast', level: Literal[1, 2] = 1):
+        pass
+
+    @click.command()
+    @add_options_from(func)
+    def cmd(mode, level):
+        click.echo(f'{mode!r} {level!r}')
+
+    assert all(isinstance(p.type, MappedChoice) for p in cmd.params)
+    assert CliRunner().invoke(cmd, ['--mode', 'slow', '--level', '2']).output == "'slow' 2\n"
+    assert CliRunner().invoke(cmd, []).output == "'fast' 1\n"
+    assert CliRunner().invoke(cmd, ['--level', '3']).exit_code == 2
+
+
+def test_register_by_qualified_name():
+    class Custom:
+        pass
+
+    class Derived(Custom):
+        pass
+
+    converters.register(f'{__name__}.{Custom.__qualname__}', lambda tp: dict(type=str))
+    assert converters.convert(Derived) == dict(type=str)
+
+
+def test_ndarray():
+    np = pytest.importorskip('numpy')
+    npt = pytest.importorskip('numpy.typing')
+
+    def func(*, x: np.ndarray = (1, 2), y: npt.NDArray[np.int32] = None):
+        pass
+
+    @click.command()
+    @add_options_from(func)
+    def cmd(x, y):
+        click.echo(f'{x!r} {y!r}')
+
+    assert [(type(p.type), p.type.dtype) for p in cmd.params] == [(ArrayType, None), (ArrayType, np.int32)]
+    assert CliRunner().invoke(cmd, ['--x', '1,2.5', '--y', '3 4']).output == \
+        'array([1. , 2.5]) array([3, 4], dtype=int32)\n'
+    assert CliRunner().invoke(cmd, []).output == 'array([1, 2]) None\n'
+
+
+def test_array_type():
+    np = pytest.importorskip('numpy')
+
+    @click.command()
+    @click.option('--x', type=ArrayType())
+    @click.option('--n', type=ArrayType(np.int64, mmap=False))
+    def cmd(x, n):
+        click.echo(f'{type(x).__name__} {x.tolist()}' if x is not None else f'{n.dtype} {n.tolist()}')
+
+    runner = CliRunner()
+    with runner.isolated_filesystem():
+        np.save('data.npy', np.arange(3.))
+        with open('data.txt', 'w') as fh:
+            fh.write('1, 2\n3 4\n')
+        assert runner.invoke(cmd, ['--x', '1,2, 3']).output == 'ndarray [1.0, 2.0, 3.0]\n'
+        assert runner.invoke(cmd, ['--x', '@data.npy']).output == 'memmap [0.0, 1.0, 2.0]\n'
+        assert runner.invoke(cmd, ['--n', '@data.npy']).output == 'int64 [0, 1, 2]\n'
+        assert runner.invoke(cmd, ['--x', '@data.txt']).output == 'ndarray [1.0, 2.0, 3.0, 4.0]\n'
+        assert runner.invoke(cmd, ['--x', '-'], input='5 6').output == 'ndarray [5.0, 6.0]\n'
+        with open('data.npy', 'rb') as fh:
+            assert runner.invoke(cmd, ['--n', '-'], input=fh.read()).output == 'int64 [0, 1, 2]\n'
+        result = runner.invoke(cmd, ['--x', '1,a'])
+        assert result.exit_code == 2
+        assert "'1,a' is not a list of numbers" in result.output
+        result = runner.invoke(cmd, ['--x', '@missing.txt'])
+        assert result.exit_code == 2
+        assert "Cannot read 'missing.txt'" in result.output
+
+
+def test_array_type_without_numpy(monkeypatch):
+    monkeypatch.setitem(sys.modules, 'numpy', None)
+
+    @click.command()
+    @click.option('--x', type=ArrayType())
+    def cmd(x):
+        pass
+
+    result = CliRunner().invoke(cmd, ['--x', '1'])
+    assert result.exit_code == 2
+    assert 'NumPy is required' in result.output
+
+
+def test_binary_input():
+    def func(*, data: bytes = None, view: memoryview = None, stream: BinaryIO = None):
+        pass
+
+    views, streams = [], []
+
+    @click.command()
+    @add_options_from(func)
+    def cmd(data, view, stream):
+        if data is not None:
+            views.append(data)
+            click.echo(f'{type(data).__name__} {bytes(data[:3])!r} {len(data)}')
+        if stream is not None:
+            streams.append(stream)
+            click.echo(f'{stream.read(3)!r} {stream.closed}')
+
+    assert [(type(p.type), p.type.stream) for p in cmd.params] == \
+        [(BinaryInput, False), (BinaryInput, False), (BinaryInput, True)]
+
+    runner = CliRunner()
+    with runner.isolated_filesystem():
+        Path('data.bin').write_bytes(b'abcdef')
+        Path('empty.bin').write_bytes(b'')
+        assert runner.invoke(cmd, ['--data', 'data.bin']).output == "memoryview b'abc' 6\n"
+        with pytest.raises(ValueError):  # Released after the command returned.
+            views[-1].tobytes()
+        assert runner.invoke(cmd, ['--data', 'empty.bin']).output == "memoryview b'' 0\n"
+        assert runner.invoke(cmd, ['--data', '-'], input=b'xyz').output == "memoryview b'xyz' 3\n"
+        assert runner.invoke(cmd, ['--stream', 'data.bin']).output == "b'abc' False\n"
+        assert streams[-1].closed
+        assert runner.invoke(cmd, ['--stream', '-'], input=b'xyz').output == "b'xyz' False\n"
+        result = runner.invoke(cmd, ['--data', 'missing.bin'])
+        assert result.exit_code == 2
+        assert "Cannot read 'missing.bin'" in result.output
+        assert '--data FILE' in runner.invoke(cmd, ['--help']).output
+
+
+def test_binary_input_maps_redirected_stdin(tmp_path, monkeypatch):
+    path = tmp_path / 'data.bin'
+    path.write_bytes(b'abc')
+    with open(path, 'rb') as fh:
+        monkeypatch.setattr(click, 'get_binary_stream', lambda name: fh)
+        ctx = click.Context(click.Command('cmd'))
+        with ctx:
+            view = BinaryInput().convert('-', None, ctx)
+            assert view.readonly and view.tobytes() == b'abc'
+        with pytest.raises(ValueError):
+            view.tobytes()
+        assert not fh.closed
+
+
+def test_binary_input_keeps_exported_views_valid(tmp_path):
+    np = pytest.importorskip('numpy')
+    path = tmp_path / 'data.bin'
+    path.write_bytes(bytes(range(4)))
+    with click.Context(click.Command('cmd')) as ctx:
+        array = np.frombuffer(BinaryInput().convert(str(path), None, ctx), dtype=np.uint8)
+    assert array.tolist() == [0, 1, 2, 3]
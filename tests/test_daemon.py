@@ -0,0 +1,145 @@
+import os
+from pathlib import Path
+import subprocess
+import sys
+import textwrap
+
+from click.testing import CliRunner
+import pytest
+
+from click_inspect import daemon
+from click_inspect.cli import main
+
+
+pytestmark = pytest.mark.skipif(not daemon.is_available(), reason='Requires Unix sockets and os.fork')
+
+CLI = '''
+import os
+import sys
+
+import click
+
+from click_inspect import add_options_from
+
+
+def greet(name: str = 'world', *, times: int = 1):
+    """Greet someone.
+
+    Args:
+        name (str): The name.
+        times (int): How often.
+    """
+
+
+@click.command()
+@add_options_from(greet)
+def main(name, times):
+    data = sys.stdin.read()
+    click.echo(f'{name} {times} {os.getcwd()} {os.environ.get("GREETING")} {data} {os.getpid()}')
+    sys.exit(3 if name == 'fail' else 0)
+'''
+
+CLIENT = '''
+import sys
+
+from click_inspect.daemon import run
+
+run('daemon_pkg:main', path=sys.argv.pop(1), prog_name='greet')
+'''
+
+
+@pytest.fixture
+def package(tmp_path, monkeypatch):
+    (tmp_path / 'daemon_pkg.py').write_text(textwrap.dedent(CLI))
+    (tmp_path / 'client.py').write_text(textwrap.dedent(CLIENT))
+    src = str(Path(daemon.__file__).parents[1])
+    monkeypatch.setenv('PYTHONPATH', os.pathsep.join([src, str(tmp_path)]))
+    return tmp_path
+
+
+@pytest.fixture
+def server(package):
+    path = package / 'daemon.sock'
+    process = subprocess.Popen([sys.executable, '-m', 'click_inspect', 'daemon', 'daemon_pkg:main',
+                                '--socket', str(path)], stderr=subprocess.PIPE)
+    assert process.stderr.readline().decode().strip() == f'Listening on {path}'
+    yield process, path
+    process.terminate()
+    process.wait(timeout=10)
+
+
+def _client(package, path, *args, **kwargs):
+    return subprocess.run([sys.executable, str(package / 'client.py'), str(path), *args],
+                          stdout=subprocess.PIPE, stderr=subprocess.PIPE, **kwargs)
+
+
+def test_daemon(package, server, tmp_path):
+    process, path = server
+    cwd = tmp_path / 'cwd'
+    cwd.mkdir()
+    result = _client(package, path, '--name', 'test', '--times', '2', input=b'data', cwd=str(cwd),
+                     env={**os.environ, 'GREETING': 'hi'})
+    name, times, result_cwd, greeting, data, pid = result.stdout.decode().split()
+    assert result.returncode == 0
+    assert (name, times, result_cwd, greeting, data) == ('test', '2', str(cwd), 'hi', 'data')
+    assert int(pid) not in (process.pid, os.getpid())
+    assert _client(package, path, '--name', 'fail').returncode == 3
+    result = _client(package, path, '--times', 'x')
+    assert result.returncode == 2
+    assert b'Usage: greet [OPTIONS]' in result.stderr
+
+
+def test_daemon_removes_socket_on_termination(server):
+    process, path = server
+    assert path.exists()
+    process.terminate()
+    process.wait(timeout=10)
+    assert not path.exists()
+
+
+def test_client_falls_back_to_in_process_execution(package):
+    result = _client(package, package / 'missing.sock', '--name', 'local', input=b'')
+    assert result.returncode == 0
+    assert result.stdout.decode().startswith('local 1 ')
+
+
+def test_call_without_daemon(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        daemon.call(tmp_path / 'missing.sock', [])
+
+
+def test_socket_path(monkeypatch, tmp_path):
+    monkeypatch.setenv('XDG_RUNTIME_DIR', str(tmp_path))
+    path = daemon.socket_path('pkg.cli:main')
+    assert path.parent == tmp_path / 'click-inspect'
+    assert path != daemon.socket_path('pkg.cli:other')
+
+
+def test_socket_directory_must_be_private(package):
+    directory = package / 'shared'
+    directory.mkdir()
+    directory.chmod(0o777)
+    path = directory / 'daemon.sock'
+    with pytest.raises(PermissionError, match='not accessible by others'):
+        daemon.call(path, [])
+    with pytest.raises(PermissionError, match='not accessible by others'):
+        daemon.serve('daemon_pkg:main', path)
+    assert not path.exists()
+    result = _client(package, path, '--name', 'local', input=b'')  # Falls back to in-process execution.
+    assert result.returncode == 0
+    assert b'Not using the daemon' in result.stderr
+
+
+def test_cli_reports_socket_directory_error(package):
+    directory = package / 'shared'
+    directory.mkdir()
+    directory.chmod(0o777)
+    result = CliRunner().invoke(main, ['daemon', 'daemon_pkg:main', '--socket', str(directory / 'daemon.sock')])
+    assert result.exit_code == 1
+    assert 'Error: The socket directory' in result.output
+    assert result.exception is None or isinstance(result.exception, SystemExit)
+
+
+def test_socket_is_private(server):
+    __, path = server
+    assert path.stat().st_mode & 0o777 == 0o600
@@ -373,3 +373,29 @@ def test_parse_type_hint_into_kwargs_list_with_union():
 def test_parse_type_hint_into_kwargs_union_with_list():
     assert _parse_type_hint_into_kwargs(Union[List[int], List[str]]) == dict(multiple=True, type=int)
     assert _parse_type_hint_into_kwargs(Union[List[str], List[int]]) == dict(multiple=True, type=str)
+
+
+def test_add_options_from_fast_docstring_backend(base_function):
+    @click.command()
+    @add_options_from(base_function, docstring_backend='fast')
+    def test(): pass
+
+    assert [p.help for p in test.params] == [
+        'This one should be added.',
+        'This one should be added too.',
+        'And so should this one.',
+        'Boolean flag.',
+    ]
+
+
+def test_add_options_from_inspects_function_once(base_function, monkeypatch):
+    import click_inspect.cache
+    calls = []
+    extract = click_inspect.cache._extract_fields
+    monkeypatch.setattr(click_inspect.cache, '_extract_fields', lambda *a, **kw: calls.append(a) or extract(*a, **kw))
+
+    for include in ({'b'}, {'c', 'd'}, ()):
+        @add_options_from(base_function, include=include)
+        def test(): pass
+
+    assert len(calls) == 1
@@ -0,0 +1,229 @@
+import inspect
+import sys
+import textwrap
+
+import click
+from click.testing import CliRunner
+import pytest
+
+from click_inspect.commands import make_command, make_static_command, StaticCommand
+from click_inspect.groups import LazyGroup
+from click_inspect.static import get_summary, static_function
+
+
+API = '''
+def display(*, size: int, symbol: str = 'x'):
+    """Display a grid of the given size.
+
+    Args:
+        size (int): Size of the grid.
+        symbol (str): Symbol to be used.
+    """
+    return symbol * size
+
+
+def undocumented(x: int = 1):
+    return x
+
+
+def computed(x: float = float('inf')):
+    return x
+'''
+
+HEAVY = '''
+import os.path
+from typing import List
+
+from .not_installed import Array
+
+
+def process(data: Array, *, scale: 'float' = 1.0, tags: List[str] = (), verbose=False):
+    """Process the data.
+
+    Args:
+        data (Array): The data.
+        scale: The scale.
+        tags (list of str): Some tags.
+        verbose (bool): Verbose output.
+    """
+'''
+
+CLI = '''
+import click
+
+
+@click.command()
+@click.option('--name', default='world')
+def hello(name):
+    """Say hello.
+
+    Long description.
+    """
+    click.echo(f'Hello {name}!')
+'''
+
+
+@pytest.fixture
+def package(tmp_path, monkeypatch):
+    root = tmp_path / 'lazy_pkg'
+    root.mkdir()
+    (root / '__init__.py').write_text('')
+    (root / 'api.py').write_text(textwrap.dedent(API))
+    (root / 'cli.py').write_text(textwrap.dedent(CLI))
+    (root / 'heavy.py').write_text(textwrap.dedent(HEAVY))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield 'lazy_pkg'
+    for name in ('lazy_pkg', 'lazy_pkg.api', 'lazy_pkg.cli', 'lazy_pkg.heavy'):
+        sys.modules.pop(name, None)
+
+
+@pytest.fixture
+def cli(package):
+    return LazyGroup(name='cli', lazy_commands={
+        'display': f'{package}.api:display',
+        'hello': f'{package}.cli:hello',
+        'undocumented': f'{package}.api:undocumented',
+    })
+
+
+def test_help_does_not_import_targets(cli, package):
+    result = CliRunner().invoke(cli, ['--help'])
+    assert result.exit_code == 0
+    assert 'display       Display a grid of the given size.' in result.output
+    assert 'hello         Say hello.' in result.output
+    assert 'undocumented' in result.output
+    assert f'{package}.api' not in sys.modules
+    assert f'{package}.cli' not in sys.modules
+
+
+def test_invoke_function_target(cli, package):
+    result = CliRunner().invoke(cli, ['display', '--size', '3', '--symbol', '#'])
+    assert result.exit_code == 0
+    assert result.output == '###\n'
+    assert f'{package}.api' in sys.modules
+    assert f'{package}.cli' not in sys.modules
+
+
+def test_invoke_command_target(cli):
+    result = CliRunner().invoke(cli, ['hello', '--name', 'test'])
+    assert result.exit_code == 0
+    assert result.output == 'Hello test!\n'
+
+
+def test_command_help(cli):
+    result = CliRunner().invoke(cli, ['display', '--help'])
+    assert result.exit_code == 0
+    assert '--size INTEGER  Size of the grid.  [required]' in result.output
+
+
+def test_help_consistent_after_loading(cli):
+    before = CliRunner().invoke(cli, ['--help']).output
+    for name in cli.lazy_commands:
+        cli.get_command(None, name)
+    assert CliRunner().invoke(cli, ['--help']).output == before
+
+
+def test_unknown_command(cli):
+    result = CliRunner().invoke(cli, ['unknown'])
+    assert result.exit_code == 2
+    assert 'No such command' in result.output
+
+
+def test_group_decorator(package):
+    @click.group(cls=LazyGroup, lazy_commands={'display': f'{package}.api:display'})
+    def group(): pass
+
+    @group.command()
+    def eager(): pass
+
+    assert group.list_commands(None) == ['display', 'eager']
+    assert CliRunner().invoke(group, ['display', '--size', '2']).output == 'xx\n'
+
+
+def test_get_summary(package):
+    assert get_summary(f'{package}.api:display') == 'Display a grid of the given size.'
+    assert get_summary(f'{package}.api:undocumented') == ''
+    assert get_summary(f'{package}.api:missing') is None
+    assert get_summary(f'{package}.missing:missing') is None
+
+
+def test_get_summary_invalid_target():
+    with pytest.raises(ValueError):
+        get_summary('no_colon')
+
+
+@pytest.fixture
+def static_cli(package):
+    return LazyGroup(name='cli', static=True, lazy_commands={
+        'display': f'{package}.api:display',
+        'hello': f'{package}.cli:hello',
+        'computed': f'{package}.api:computed',
+        'process': f'{package}.heavy:process',
+    })
+
+
+def test_static_command_help_does_not_import_target(static_cli, cli, package):
+    result = CliRunner().invoke(static_cli, ['display', '--help'])
+    assert result.exit_code == 0
+    assert f'{package}.api' not in sys.modules
+    assert result.output == CliRunner().invoke(cli, ['display', '--help']).output
+
+
+def test_static_command_with_unavailable_imports(static_cli, package):
+    result = CliRunner().invoke(static_cli, ['process', '--help'])
+    assert result.exit_code == 0
+    assert 'Process the data.' in result.output
+    assert '--scale FLOAT' in result.output
+    assert '--tags TEXT' in result.output
+    assert '--verbose / --no-verbose' in result.output
+    assert f'{package}.heavy' not in sys.modules
+    result = CliRunner().invoke(static_cli, ['process', '--data', 'x'])  # Now the module is imported.
+    assert isinstance(result.exception, ImportError)
+
+
+def test_static_command_invoke_imports_target(static_cli, package):
+    command = static_cli.get_command(None, 'display')
+    assert isinstance(command, StaticCommand)
+    result = CliRunner().invoke(static_cli, ['display', '--size', '3', '--symbol', '#'])
+    assert result.exit_code == 0
+    assert result.output == '###\n'
+    assert f'{package}.api' in sys.modules
+    assert CliRunner().invoke(command, ['--size', '2']).output == 'xx\n'
+
+
+def test_static_command_completion_does_not_import_target(static_cli, package):
+    command = static_cli.get_command(None, 'display')
+    ctx = command.make_context('display', ['--size'], resilient_parsing=True)
+    assert ctx.command is command
+    assert f'{package}.api' not in sys.modules
+
+
+def test_static_command_fallback(static_cli, package):
+    assert CliRunner().invoke(static_cli, ['hello', '--name', 'test']).output == 'Hello test!\n'
+    assert CliRunner().invoke(static_cli, ['computed']).output == 'inf\n'
+    assert make_static_command(f'{package}.cli:hello') is None  # Decorated.
+    assert make_static_command(f'{package}.api:computed') is None  # Default is not a literal.
+    assert make_static_command(f'{package}.missing:missing') is None
+
+
+@pytest.mark.parametrize('kwargs', [dict(map_over='symbol'), dict(map_over='symbol', expose=['size'])])
+def test_static_command_pipeline(package, kwargs):
+    static = make_static_command(f'{package}.api:display', **kwargs)
+    assert f'{package}.api' not in sys.modules
+    import lazy_pkg.api
+    command = make_command(lazy_pkg.api.display, **kwargs)
+    assert ([(p.name, p.opts, p.multiple, p.default) for p in static.params]
+            == [(p.name, p.opts, p.multiple, p.default) for p in command.params])
+    assert CliRunner().invoke(static, ['--help']).output == CliRunner().invoke(command, ['--help']).output
+
+
+def test_static_function(package):
+    import lazy_pkg.api
+    path = lazy_pkg.api.__file__
+    func = static_function(path, f'{package}.api', 'display')
+    assert inspect.signature(func) == inspect.signature(lazy_pkg.api.display)
+    assert inspect.getdoc(func) == inspect.getdoc(lazy_pkg.api.display)
+    assert (func.__module__, func.__qualname__) == (f'{package}.api', 'display')
+    assert static_function(path, f'{package}.api', 'missing') is None
+    with pytest.raises(RuntimeError):
+        func(size=1)
@@ -0,0 +1,109 @@
+import importlib
+import os
+import textwrap
+
+import click
+from click.testing import CliRunner
+import pytest
+
+from click_inspect import add_options_from, make_command, persistent
+from click_inspect.helptext import CachedHelpCommand
+
+
+SOURCE = '''
+def func(*, size: int = 1, symbol: str = 'x'):
+    """Display something.
+
+    Args:
+        size (int): The size of the grid which is used for displaying the data points, in both dimensions.
+        symbol (str): The symbol.
+    """
+'''
+
+
+@pytest.fixture
+def module(tmp_path, monkeypatch):
+    path = tmp_path / 'helptext_test_module.py'
+    path.write_text(textwrap.dedent(SOURCE))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    module = importlib.import_module('helptext_test_module')
+    yield module
+    del importlib.sys.modules['helptext_test_module']
+
+
+@pytest.fixture
+def format_calls(monkeypatch):
+    calls = []
+    format_help = CachedHelpCommand.format_help
+
+    def _format_help(self, ctx, formatter):
+        calls.append(formatter.width)
+        return format_help(self, ctx, formatter)
+
+    monkeypatch.setattr(CachedHelpCommand, 'format_help', _format_help)
+    return calls
+
+
+def _help(command, width=None):
+    return CliRunner().invoke(command, ['--help'], terminal_width=width).output
+
+
+def test_cached_help(module, format_calls):
+    @click.command(cls=CachedHelpCommand)
+    @add_options_from(module.func)
+    def test(**kwargs):
+        """Test command."""
+
+    @click.command()
+    @add_options_from(module.func)
+    def expected(**kwargs):
+        """Test command."""
+
+    assert _help(test) == _help(expected).replace('expected', 'test')
+    assert _help(test) == _help(test)
+    assert len(format_calls) == 1
+    assert _help(test, width=60) == _help(expected, width=60).replace('expected', 'test')
+    assert _help(test, width=60) != _help(test)
+    _help(test, width=60)
+    assert len(format_calls) == 2
+
+
+def test_cached_help_make_command(module, format_calls):
+    command = make_command(module.func, cls=CachedHelpCommand)
+    assert 'The size of the grid' in _help(command)
+    _help(command)
+    assert len(format_calls) == 1
+
+
+def test_cached_help_persistent(module, format_calls, tmp_path, monkeypatch):
+    monkeypatch.setenv(persistent.ENV_VARIABLE, str(tmp_path / 'cache'))
+    text = _help(make_command(module.func, cls=CachedHelpCommand))
+    assert _help(make_command(module.func, cls=CachedHelpCommand)) == text
+    assert len(format_calls) == 1
+
+    path = tmp_path / 'helptext_test_module.py'
+    path.write_text(path.read_text().replace('The symbol.', 'The new symbol.'))
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    del importlib.sys.modules['helptext_test_module']
+    module = importlib.import_module('helptext_test_module')
+    assert 'The new symbol.' in _help(make_command(module.func, cls=CachedHelpCommand))
+    assert len(format_calls) == 2
+
+
+def test_cached_help_persistent_lazy(module, format_calls, tmp_path, monkeypatch):
+    monkeypatch.setenv(persistent.ENV_VARIABLE, str(tmp_path / 'cache'))
+
+    def _command():
+        @click.command(cls=CachedHelpCommand)
+        @add_options_from(module.func, lazy=True)
+        def test(**kwargs):
+            """Test command."""
+        return test
+
+    command = _command()
+    text = command.get_help(click.Context(command, info_name='test'))
+    command = _command()
+    assert command.get_help(click.Context(command, info_name='test')) == text
+    assert command.params._pending  # Not inspected.
+    assert len(format_calls) == 1
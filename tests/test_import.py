@@ -0,0 +1,59 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+
+# Budget for the cumulative import time of `from click_inspect import add_options_from` (in microseconds).
+IMPORT_BUDGET_US = int(os.environ.get('CLICK_INSPECT_IMPORT_BUDGET_US', 20_000))
+
+
+def _run(code, *options):
+    return subprocess.run([sys.executable, *options, '-c', code],
+                          check=True, capture_output=True, text=True)
+
+
+# Sum the cumulative import times of the top-level imports of modules of `package` by `code`
+# (modules which are imported on attribute access via PEP 562 are reported as top-level imports).
+def _cumulative_import_time(code, package):
+    stderr = _run(code, '-X', 'importtime').stderr
+    total = 0
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue  # pragma: no cover
+        _, _, cumulative, name = line.replace('|', ':').split(':')
+        if not name.startswith('  ') and name.strip().split('.')[0] == package:  # Nested imports are included.
+            total += int(cumulative)
+    if not total:
+        raise LookupError(f'{package!r} not found in import time report')  # pragma: no cover
+    return total
+
+
+def test_import_time_within_budget():
+    code = 'from click_inspect import add_options_from\nadd_options_from'
+    assert min(_cumulative_import_time(code, 'click_inspect') for __ in range(3)) < IMPORT_BUDGET_US
+
+
+@pytest.mark.parametrize('heavy_module', ['sphinx', 'typestring_parser', 'multiprocessing', 'pickle', 'difflib', 'mmap'])
+def test_import_does_not_load_heavy_backends(heavy_module):
+    code = ('import sys, click_inspect\n'
+            'click_inspect.add_options_from\n'
+            f'print({heavy_module!r} in sys.modules)')
+    assert _run(code).stdout.strip() == 'False'
+
+
+def test_heavy_backends_loaded_on_first_use():
+    code = ('import sys\n'
+            'from click_inspect.parser import parse_docstring\n'
+            'parse_docstring("Args:\\n    x (int): Test.")\n'
+            'print("sphinx" in sys.modules, "typestring_parser" in sys.modules)')
+    assert _run(code).stdout.strip() == 'True True'
+
+
+def test_fast_backend_does_not_load_sphinx():
+    code = ('import sys\n'
+            'from click_inspect.parser import parse_docstring\n'
+            'parse_docstring("Args:\\n    x (int): Test.", backend="fast")\n'
+            'print("sphinx" in sys.modules)')
+    assert _run(code).stdout.strip() == 'False'
@@ -0,0 +1,126 @@
+import click
+from click.testing import CliRunner
+import pytest
+
+from click_inspect import decorators
+from click_inspect.decorators import add_options_from
+from click_inspect.lazy import Deferred, LazyParams
+
+
+@pytest.fixture
+def compute_calls(monkeypatch):
+    calls = []
+    compute = decorators._compute_option_specs
+
+    def _compute(func, **kwargs):
+        calls.append(func)
+        return compute(func, **kwargs)
+
+    monkeypatch.setattr(decorators, '_compute_option_specs', _compute)
+    return calls
+
+
+def _describe(command):
+    return [(p.name, p.opts, p.secondary_opts, p.type, p.default, p.required, getattr(p, 'help', None))
+            for p in command.params]
+
+
+def test_lazy_equals_eager(base_function):
+    @click.command()
+    @add_options_from(base_function)
+    def eager(): pass
+
+    @click.command()
+    @add_options_from(base_function, lazy=True)
+    def lazy(): pass
+
+    assert isinstance(lazy.params, LazyParams)
+    assert _describe(lazy) == _describe(eager)
+
+
+def test_lazy_defers_inspection(base_function, compute_calls):
+    @click.command()
+    @add_options_from(base_function, lazy=True)
+    def test(): pass
+
+    assert compute_calls == []
+    assert len(test.params) == 4
+    assert compute_calls == [base_function]
+    assert len(test.params) == 4
+    assert compute_calls == [base_function]
+
+
+def test_lazy_group_inspects_invoked_command_only(base_function, readme_example_function, compute_calls):
+    @click.group()
+    def cli(): pass
+
+    @cli.command()
+    @add_options_from(base_function, lazy=True)
+    def first(**kwargs):
+        click.echo(sorted(kwargs.items()))
+
+    @cli.command()
+    @add_options_from(readme_example_function, lazy=True)
+    def second(**kwargs): pass
+
+    result = CliRunner().invoke(cli, ['--help'])
+    assert result.exit_code == 0
+    assert compute_calls == []
+
+    result = CliRunner().invoke(cli, ['first', '--c', '5'])
+    assert result.exit_code == 0
+    assert result.output == "[('b', 1), ('c', 5), ('d', 'test'), ('e', True)]\n"
+    assert compute_calls == [base_function]
+
+
+def test_lazy_help(base_function):
+    @click.command()
+    @add_options_from(base_function, lazy=True)
+    def test(): pass
+
+    result = CliRunner().invoke(test, ['--help'])
+    assert result.exit_code == 0
+    assert '--c INTEGER' in result.output
+    assert 'Boolean flag.' in result.output
+
+
+def test_lazy_order_with_other_parameters(base_function):
+    def _command(lazy):
+        @click.command()
+        @click.option('--first')
+        @add_options_from(base_function, include={'b', 'c'}, lazy=lazy)
+        @click.argument('second')
+        @add_options_from(base_function, include={'d', 'e'}, lazy=lazy)
+        @click.option('--last')
+        def test(): pass
+        return test
+
+    eager, lazy = _command(False), _command(True)
+    assert [p.name for p in lazy.params] == ['first', 'b', 'c', 'second', 'd', 'e', 'last']
+    assert _describe(lazy) == _describe(eager)
+
+
+def test_lazy_applied_to_command(base_function):
+    @add_options_from(base_function, include={'b', 'c'}, lazy=True)
+    @click.command()
+    @click.option('--first')
+    def lazy(): pass
+
+    @add_options_from(base_function, include={'b', 'c'})
+    @click.command()
+    @click.option('--first')
+    def eager(): pass
+
+    assert _describe(lazy) == _describe(eager)
+
+
+def test_lazy_params_append_and_reverse_do_not_materialize():
+    calls = []
+    params = LazyParams()
+    params.append('z')
+    params.append(Deferred(lambda: calls.append(1) or ['x', 'y'], reverse=False))
+    params.reverse()
+    assert params
+    assert calls == []
+    assert params == ['y', 'x', 'z']
+    assert calls == [1]
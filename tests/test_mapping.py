@@ -0,0 +1,152 @@
+import threading
+import time
+from typing import List
+
+import click
+from click.testing import CliRunner
+import pytest
+
+from click_inspect import add_options_from, make_command
+from click_inspect.errors import MapError
+from click_inspect.mapping import map_call
+
+
+def square(*, item: int, offset: int = 0) -> int:
+    """Square the item.
+
+    Args:
+        item (int): The item.
+        offset (int): Added to the result.
+    """
+    if item < 0:
+        raise ValueError(f'negative: {item}')
+    time.sleep(0.01 * (item % 3))
+    return item * item + offset
+
+
+def test_map_call_ordered():
+    assert list(map_call(square, 'item', range(10), {'offset': 1}, workers=3)) == [x * x + 1 for x in range(10)]
+
+
+def test_map_call_unordered():
+    results = list(map_call(square, 'item', range(10), {}, workers=3, ordered=False))
+    assert sorted(results) == [x * x for x in range(10)]
+
+
+def test_map_call_process_executor():
+    assert list(map_call(square, 'item', [1, 2, 3], {}, workers=2, executor='process')) == [1, 4, 9]
+
+
+def test_map_call_bounds_pending_calls():
+    consumed = []
+
+    def items():
+        for x in range(100):
+            consumed.append(x)
+            yield x
+
+    results = map_call(square, 'item', items(), {}, workers=2)
+    assert consumed == []  # Lazy.
+    assert next(results) == 0
+    assert len(consumed) <= 4
+    results.close()
+    assert len(consumed) <= 5
+
+
+def test_map_call_fail_fast():
+    with pytest.raises(ValueError, match='negative: -1'):
+        list(map_call(square, 'item', [1, -1, 2], {}, workers=2))
+
+
+def test_map_call_collect_errors():
+    results = []
+    with pytest.raises(MapError) as exc_info:
+        for result in map_call(square, 'item', [-2, 1, -1, 2], {}, workers=2, fail_fast=False):
+            results.append(result)
+    assert results == [1, 4]
+    assert [(item, str(exc)) for item, exc in exc_info.value.failures] == [(-2, 'negative: -2'), (-1, 'negative: -1')]
+
+
+def test_map_call_propagates_keyboard_interrupt():
+    calls = []
+    lock = threading.Lock()
+
+    def func(*, item):
+        with lock:
+            calls.append(item)
+        if item == 1:
+            raise KeyboardInterrupt
+        time.sleep(0.01)
+
+    with pytest.raises(KeyboardInterrupt):
+        list(map_call(func, 'item', range(100), {}, workers=2, fail_fast=False))
+    assert len(calls) < 10
+
+
+def test_map_call_invalid_executor():
+    with pytest.raises(ValueError, match='executor'):
+        map_call(square, 'item', [], {}, executor='fiber')
+
+
+@pytest.mark.parametrize('lazy', [False, True])
+def test_add_options_from_map_over(lazy):
+    @click.command()
+    @add_options_from(square, map_over='item', workers=2, lazy=lazy)
+    def cmd(item, offset):
+        click.echo(' '.join(map(str, item)) + f' (offset={offset})')
+
+    result = CliRunner().invoke(cmd, ['--item', '1', '--item', '2', '--item', '3', '--offset', '1'])
+    assert result.exit_code == 0
+    assert result.output == '2 5 10 (offset=1)\n'
+
+
+def test_add_options_from_map_over_sequence():
+    def func(*, item: List[int] = (1, 2)):
+        return item * 10
+
+    @click.command()
+    @add_options_from(func, map_over='item')
+    def cmd(item):
+        click.echo(list(item))
+
+    assert cmd.params[0].multiple and cmd.params[0].default == (1, 2)
+    assert CliRunner().invoke(cmd, ['--item', '3', '--item', '4']).output == '[30, 40]\n'  # Called per element.
+
+
+def test_add_options_from_map_over_renamed_options():
+    @click.command()
+    @add_options_from(square, map_over='item', names={'item': ['-i', '--value'], 'offset': ['--shift']})
+    def cmd(value, shift):
+        click.echo(' '.join(map(str, value)) + f' (shift={shift})')
+
+    result = CliRunner().invoke(cmd, ['-i', '1', '--value', '2', '--shift', '3'])
+    assert result.exit_code == 0, result.output
+    assert result.output == '4 7 (shift=3)\n'
+
+
+def test_add_options_from_map_over_renamed_other_option():
+    def repeat(*, text: str, times: int = 1):
+        return text * times
+
+    @click.command()
+    @add_options_from(repeat, map_over='text', names={'times': ['--count']})
+    def cmd(text, count):
+        click.echo(' '.join(text))
+
+    result = CliRunner().invoke(cmd, ['--text', 'a', '--text', 'b', '--count', '3'])
+    assert result.exit_code == 0, result.output
+    assert result.output == 'aaa bbb\n'
+
+
+def test_add_options_from_map_over_invalid():
+    with pytest.raises(ValueError, match="Cannot map over 'missing'"):
+        add_options_from(square, map_over='missing')
+    with pytest.raises(ValueError, match='executor'):
+        add_options_from(square, map_over='item', executor='fiber')
+
+
+def test_make_command_map_over():
+    command = make_command(square, map_over='item', workers=2, executor='process')
+    result = CliRunner().invoke(command, ['--item', '2', '--item', '3'])
+    assert result.exit_code == 0
+    assert result.output == '4\n9\n'
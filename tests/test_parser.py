@@ -1,9 +1,17 @@
-from typing import Union
+import types
+from typing import List, Union
 
 import pytest
 
+import click_inspect.parser
 from click_inspect.errors import UnsupportedDocstringStyle
-from click_inspect.parser import parse_docstring
+from click_inspect.parser import (
+    clear_type_cache,
+    parse_docstring,
+    type_cache_info,
+    type_resolver_for,
+    TypeCacheInfo,
+)
 
 
 @pytest.fixture
@@ -110,30 +118,41 @@ def doc_func_or_string(request):
     return request.getfixturevalue(request.param)
 
 
-def test_parse_docstring(doc_func_or_string):
+@pytest.fixture(params=['napoleon', 'fast'])
+def backend(request):
+    return request.param
+
+
+def test_parse_docstring(doc_func_or_string, backend):
     with pytest.warns(UserWarning) as warninfo:
-        assert parse_docstring(doc_func_or_string) == {
+        assert parse_docstring(doc_func_or_string, backend=backend) == {
             'foo': {'help': 'This is foo.', 'type': int},
             'bar': {'help': 'This is bar.'},
             'baz': {'help': 'This is baz.', 'type': Union[float, str]},
             'a_b_c': {'help': 'This is a_b_c.'},
         }
-    assert len(warninfo) == 1
-    assert str(warninfo[0].message.args[0]).startswith("Type hint 'CustomType' cannot be resolved.")
+    user_warnings = [w for w in warninfo if issubclass(w.category, UserWarning)]  # Not from importing backends.
+    assert len(user_warnings) == 1
+    assert str(user_warnings[0].message.args[0]).startswith("Type hint 'CustomType' cannot be resolved.")
 
 
-def test_parse_docstring_no_warning_if_ignored(doc_func_or_string):
-    assert parse_docstring(doc_func_or_string, ignore={'a_b_c'})
+def test_parse_docstring_no_warning_if_ignored(doc_func_or_string, backend):
+    assert parse_docstring(doc_func_or_string, ignore={'a_b_c'}, backend=backend)
 
 
-def test_parse_docstring_raises():
+def test_parse_docstring_raises(backend):
     with pytest.raises(UnsupportedDocstringStyle) as excinfo:
-        parse_docstring('This docstring contains no parameters')
+        parse_docstring('This docstring contains no parameters', backend=backend)
     assert excinfo.value.args[0] == 'This docstring contains no parameters'
 
 
-def test_parse_docstring_base_function(base_function):
-    assert parse_docstring(base_function.__doc__) == {
+def test_parse_docstring_raises_on_unknown_backend(google_style_func):
+    with pytest.raises(ValueError):
+        parse_docstring(google_style_func, backend='unknown')
+
+
+def test_parse_docstring_base_function(base_function, backend):
+    assert parse_docstring(base_function.__doc__, backend=backend) == {
         'a': {'help': 'This parameter should be skipped.', 'type': str},
         'b': {'help': 'This one should be added.', 'type': int},
         'c': {'help': 'This one should be added too.', 'type': int},
@@ -142,15 +161,147 @@ def test_parse_docstring_base_function(base_function):
     }
 
 
-def test_parse_docstring_pass_on_unsupported_type_string():
+@pytest.fixture
+def resolved_type_strings(monkeypatch):
+    clear_type_cache()  # Type strings which were resolved before are not resolved again.
+    calls = []
+    parse, error = click_inspect.parser._import_typestring_parser()
+    monkeypatch.setattr(click_inspect.parser, '_import_typestring_parser',
+                        lambda: (lambda text, func=None: calls.append(text) or parse(text, func=func), error))
+    return calls
+
+
+def test_parse_docstring_include(base_function, backend, resolved_type_strings):
+    assert parse_docstring(base_function, include={'b', 'e'}, backend=backend) == {
+        'b': {'help': 'This one should be added.', 'type': int},
+        'e': {'help': 'Boolean flag.', 'type': bool},
+    }
+    assert resolved_type_strings == ['int', 'bool']
+
+
+def test_parse_docstring_include_no_warning_for_other_parameters(doc_func_or_string, backend):
+    assert parse_docstring(doc_func_or_string, include={'foo'}, backend=backend) == {
+        'foo': {'help': 'This is foo.', 'type': int}}
+
+
+def test_parse_docstring_pass_on_unsupported_type_string(backend):
     def _f():
         """
         Args:
             x (int and str): Type string is not supported.
         """
-    assert parse_docstring(_f) == {'x': {'help': 'Type string is not supported.'}}
+    assert parse_docstring(_f, backend=backend) == {'x': {'help': 'Type string is not supported.'}}
 
 
-def test_parse_docstring_return_empty_dict_if_no_doc():
+def test_parse_docstring_return_empty_dict_if_no_doc(backend):
     def test(): pass
-    assert parse_docstring(test) == {}
+    assert parse_docstring(test, backend=backend) == {}
+
+
+@pytest.mark.parametrize('doc', [
+    """
+    Args:
+        x ((int, str)):
+            Description on the next line.
+        y, z (list of int): Multiple parameters.
+        w (int): - A list item.
+
+    Returns:
+        int: Not a parameter.
+    """,
+    """
+    Args:
+        a (str): A.
+
+    Keyword Args:
+        b (int): Keyword arguments are not parameters.
+    """,
+    """
+    Parameters
+    ----------
+    x, y : float or str
+        Multiple parameters.
+
+        Second paragraph.
+    z : (int, str)
+    w
+        1. A list item.
+
+    Returns
+    -------
+    int
+        Not a parameter.
+    """,
+])
+def test_parse_docstring_fast_backend_matches_napoleon(doc):
+    assert parse_docstring(doc, backend='fast') == parse_docstring(doc, backend='napoleon')
+
+
+@pytest.fixture
+def type_cache():
+    clear_type_cache()
+    yield
+    clear_type_cache()
+
+
+def _module_with_functions(name):
+    module = types.ModuleType(name)
+    exec('def f(): pass\ndef g(): pass\n', vars(module))
+    return module
+
+
+def test_type_resolver_is_shared_by_the_functions_of_a_module(type_cache):
+    module = _module_with_functions('type_cache_test_module')
+    resolver = type_resolver_for(module.f)
+    assert type_resolver_for(module.g) is resolver
+    assert resolver('list of int') == List[int]
+    assert type_resolver_for(module.g)('list of int') == List[int]
+    assert type_cache_info() == TypeCacheInfo(hits=1, misses=1, invalidations=0, modules=1, size=1)
+    assert type_resolver_for(_module_with_functions('type_cache_test_module').f) is not resolver  # Recreated.
+
+
+def test_type_resolver_invalidates_rebound_names(type_cache):
+    module = _module_with_functions('type_cache_test_module')
+    resolve = type_resolver_for(module.f)
+    with pytest.raises(NameError):
+        resolve('Custom')
+    with pytest.raises(NameError):
+        resolve('Custom')
+    module.Custom = int
+    assert resolve('Custom') is int
+    module.Custom = float
+    assert resolve('Custom') is float
+    assert resolve('int') is int
+    module.int = str  # Shadowing builtins.
+    assert resolve('int') is str
+    assert type_cache_info()[:3] == (1, 5, 3)
+
+
+def test_type_resolver_add_builtin(type_cache):
+    module = _module_with_functions('type_cache_test_module')
+    module.str = bytes
+    resolve = type_resolver_for(module.f)
+    resolve.add_builtin('int', int)
+    resolve.add_builtin('str', str)  # Discarded since `str` is shadowed.
+    assert resolve('int') is int
+    assert resolve('str') is bytes
+    assert type_cache_info()[:2] == (1, 1)
+
+
+def test_clear_type_cache(type_cache):
+    module = _module_with_functions('type_cache_test_module')
+    type_resolver_for(module.f)('int')
+    clear_type_cache()
+    assert type_cache_info() == TypeCacheInfo(hits=0, misses=0, invalidations=0, modules=0, size=0)
+
+
+def test_parse_docstring_uses_the_type_resolver_of_the_module(type_cache, backend):
+    module = _module_with_functions('type_cache_test_module')
+    module.f.__doc__ = 'F.\n\nArgs:\n    x (list of int): The x.\n    y (int): The y.'
+    module.g.__doc__ = 'G.\n\nArgs:\n    z (int): The z.'
+    assert parse_docstring(module.f, backend=backend) == {'x': {'help': 'The x.', 'type': List[int]},
+                                                          'y': {'help': 'The y.', 'type': int}}
+    assert parse_docstring(module.g, backend=backend) == {'z': {'help': 'The z.', 'type': int}}
+    assert type_cache_info() == TypeCacheInfo(hits=1, misses=2, invalidations=0, modules=1, size=2)
+    parse_docstring('Args:\n    x (int): The x.', backend=backend)  # Strings have no module.
+    assert type_cache_info().modules == 1
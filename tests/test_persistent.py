@@ -0,0 +1,257 @@
+import importlib
+import os
+import pickle
+import textwrap
+
+import click
+from click.testing import CliRunner
+import pytest
+
+from click_inspect import converters, decorators, persistent
+from click_inspect.cli import main
+from click_inspect.decorators import add_options_from
+
+
+SOURCE = '''
+from typing import List, Optional
+
+from persistent_test_types import Color, Shade
+
+
+def func(a, *, b: int = 1, c: List[str] = (), d=None):
+    """Test function.
+
+    Args:
+        a: Not used.
+        b (int): This is b.
+        c (list of str): This is c.
+        d: This is d.
+    """
+
+
+MISSING = object()
+
+
+def sentinel(*, value: str = MISSING):
+    """Test function with a sentinel default.
+
+    Args:
+        value: The value.
+    """
+
+
+def colored(*, color: Optional[Color] = None, shade):
+    """Test function with types from another module.
+
+    Args:
+        color: The color.
+        shade (Shade): The shade.
+    """
+'''
+
+TYPES = '''
+import enum
+
+
+class Color(enum.Enum):
+    RED = 'red'
+
+
+class Shade(enum.Enum):
+    DARK = 'dark'
+'''
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv(persistent.ENV_VARIABLE, str(tmp_path / 'cache'))
+    return tmp_path / 'cache'
+
+
+@pytest.fixture
+def module(tmp_path, monkeypatch):
+    (tmp_path / 'persistent_test_module.py').write_text(SOURCE)
+    (tmp_path / 'persistent_test_types.py').write_text(TYPES)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    module = importlib.import_module('persistent_test_module')
+    yield module
+    del importlib.sys.modules['persistent_test_module']
+    del importlib.sys.modules['persistent_test_types']
+
+
+@pytest.fixture
+def compute_calls(monkeypatch):
+    calls = []
+    compute = decorators._compute_option_specs
+
+    def _compute(func, **kwargs):
+        calls.append(func)
+        return compute(func, **kwargs)
+
+    monkeypatch.setattr(decorators, '_compute_option_specs', _compute)
+    return calls
+
+
+def _command(func, **kwargs):
+    @click.command()
+    @add_options_from(func, **kwargs)
+    def test(): pass
+    return test
+
+
+def _describe(command):
+    return [(p.name, p.opts, p.type, p.default, p.multiple, p.help) for p in command.params]
+
+
+def test_disabled_by_default(monkeypatch, module, compute_calls):
+    monkeypatch.delenv(persistent.ENV_VARIABLE, raising=False)
+    assert persistent.get_directory() is None
+    _command(module.func)
+    _command(module.func)
+    assert len(compute_calls) == 2
+
+
+@pytest.mark.parametrize('setting', ['1', 'true'])
+def test_default_directory(monkeypatch, tmp_path, setting):
+    monkeypatch.setenv(persistent.ENV_VARIABLE, setting)
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path))
+    assert persistent.get_directory() == tmp_path / 'click-inspect'
+
+
+def test_enable_and_disable(monkeypatch, tmp_path):
+    monkeypatch.delenv(persistent.ENV_VARIABLE, raising=False)
+    monkeypatch.setattr(persistent, '_enabled', None)  # Restore the original state afterwards.
+    monkeypatch.setattr(persistent, '_directory', None)
+    persistent.enable(tmp_path)
+    assert persistent.get_directory() == tmp_path
+    persistent.disable()
+    assert persistent.get_directory() is None
+
+
+def test_warm_start_skips_computation(cache_dir, module, compute_calls):
+    cold = _command(module.func)
+    warm = _command(module.func)
+    assert len(compute_calls) == 1
+    assert _describe(warm) == _describe(cold)
+    assert len(list(cache_dir.glob(f'*{persistent.SUFFIX}'))) == 1
+
+
+def test_warm_start_keeps_default_objects(cache_dir, module, compute_calls):
+    for __ in range(2):
+        command = _command(module.sentinel)
+        assert command.params[0].default is module.MISSING
+    assert len(compute_calls) == 1
+
+
+def test_different_arguments_are_cached_separately(cache_dir, module, compute_calls):
+    first = _command(module.func, include={'b'})
+    second = _command(module.func, exclude={'b'})
+    assert [p.name for p in first.params] == ['b']
+    assert [p.name for p in second.params] == ['c', 'd']
+    assert [p.name for p in _command(module.func, include={'b'}).params] == ['b']
+    assert len(compute_calls) == 2
+    (path, entry), = persistent.entries(cache_dir)
+    assert len(entry.values) == 2
+
+
+def test_invalidated_when_source_changes(cache_dir, module, compute_calls):
+    _command(module.func)
+    path = module.__file__
+    with open(path, 'a') as fh:
+        fh.write('\n# Modified.\n')
+    _command(module.func)
+    assert len(compute_calls) == 2
+
+
+@pytest.mark.parametrize('name', ['Color', 'Shade'])
+def test_invalidated_when_types_change(cache_dir, module, compute_calls, name):
+    _command(module.colored)
+    _command(module.colored)
+    assert len(compute_calls) == 1
+    types = importlib.sys.modules['persistent_test_types']
+    with open(types.__file__, 'a') as fh:
+        fh.write(f'\n{name}.DARK = "modified"\n')
+    _command(module.colored)
+    assert len(compute_calls) == 2
+
+
+def test_invalidated_when_converters_change(cache_dir, module, compute_calls, monkeypatch):
+    monkeypatch.setattr(converters, '_converters', dict(converters._converters))
+    monkeypatch.setattr(converters, '_memo', {})
+    assert _command(module.func).params[0].type is click.INT
+    converters.register(int, lambda tp: dict(type=click.IntRange(0, 10)))
+    assert isinstance(_command(module.func).params[0].type, click.IntRange)
+    assert len(compute_calls) == 2
+
+
+def test_invalidated_when_version_changes(cache_dir, module, compute_calls, monkeypatch):
+    _command(module.func)
+    monkeypatch.setattr(persistent, '_version', lambda: 'other-version')
+    _command(module.func)
+    assert len(compute_calls) == 2
+
+
+def test_corrupt_file_is_ignored(cache_dir, module, compute_calls):
+    _command(module.func)
+    (path, __), = persistent.entries(cache_dir)
+    path.write_bytes(b'corrupt')
+    assert _command(module.func).params
+    assert len(compute_calls) == 2
+    assert persistent.entries(cache_dir).__next__()[1] is not None
+
+
+def test_warnings_are_replayed(cache_dir, module, compute_calls):
+    for __ in range(2):
+        with pytest.warns(UserWarning, match="No type hint for parameter 'a'"):
+            _command(module.func, include={'a'})
+    assert len(compute_calls) == 1
+
+
+def test_local_functions_are_not_cached(cache_dir, base_function, compute_calls):
+    _command(base_function)
+    _command(base_function)
+    assert len(compute_calls) == 2
+    assert not cache_dir.exists()
+
+
+def test_unstable_arguments_are_not_cached(cache_dir, module, compute_calls):
+    custom = {'b': {'callback': lambda ctx, param, value: value}}
+    _command(module.func, custom=custom)
+    _command(module.func, custom=custom)
+    assert len(compute_calls) == 2
+
+
+def test_arguments_key_is_order_independent():
+    assert (persistent.arguments_key({'include': {'a', 'b', 'c'}, 'names': {'x': ['-x'], 'y': ['-y']}})
+            == persistent.arguments_key({'names': {'y': ['-y'], 'x': ['-x']}, 'include': {'c', 'b', 'a'}}))
+
+
+def test_no_temporary_files_left(cache_dir, module):
+    _command(module.func)
+    _command(module.func, include={'b'})
+    assert [p.suffix for p in cache_dir.iterdir()] == [persistent.SUFFIX]
+
+
+def test_cli_info_and_purge(cache_dir, module):
+    runner = CliRunner()
+    _command(module.func)
+    result = runner.invoke(main, ['cache', 'info'])
+    assert result.exit_code == 0
+    assert 'persistent_test_module:func  valid  1 variant(s)' in result.output
+
+    assert runner.invoke(main, ['cache', 'path']).output.strip() == str(cache_dir)
+
+    result = runner.invoke(main, ['cache', 'purge', '--stale'])
+    assert result.output.strip() == 'Removed 0 cache file(s).'
+    os.utime(module.__file__, ns=(0, 0))
+    assert 'stale' in runner.invoke(main, ['cache', 'info']).output
+    result = runner.invoke(main, ['cache', 'purge', '--stale'])
+    assert result.output.strip() == 'Removed 1 cache file(s).'
+    assert not list(persistent.entries(cache_dir))
+
+
+def test_cli_disabled(monkeypatch):
+    monkeypatch.delenv(persistent.ENV_VARIABLE, raising=False)
+    result = CliRunner().invoke(main, ['cache', 'info'])
+    assert result.exit_code == 1
+    assert 'disabled' in result.output
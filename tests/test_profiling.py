@@ -0,0 +1,107 @@
+import json
+import os
+import subprocess
+import sys
+import textwrap
+
+import click
+import pytest
+
+from click_inspect import add_options_from, profiling
+from click_inspect.cache import clear_cache
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    clear_cache()
+    yield
+    clear_cache()
+
+
+def test_profile_records_phases_and_counters(base_function):
+    target = f'{base_function.__module__}:{base_function.__qualname__}'
+    with profiling.profile() as profile:
+        for __ in range(2):
+            add_options_from(base_function)(lambda: None)
+    data = profile.as_dict()
+    assert list(data) == [target]
+    assert set(data[target]['phases']) == {*profiling.TOP_LEVEL_PHASES, *profiling.NESTED_PHASES}
+    assert data[target]['total'] == pytest.approx(
+        sum(data[target]['phases'][phase] for phase in profiling.TOP_LEVEL_PHASES))
+    assert data[target]['counters'] == {'cache_misses': 1, 'cache_hits': 1, 'parameters': 8, 'warnings': 0}
+    assert json.loads(profile.to_json()) == data
+    lines = profile.report().splitlines()
+    assert lines[1].split() == ['function', 'total', 'compute_specs', *profiling.NESTED_PHASES, 'create_options',
+                                *profiling.COUNTERS]
+    assert lines[2].startswith(target)
+
+
+def test_profile_counts_and_reissues_warnings():
+    def func(a, b):
+        pass
+
+    with profiling.profile() as profile:
+        with pytest.warns(UserWarning, match='No type hint'):
+            add_options_from(func, include={'a', 'b'})
+    assert profile.as_dict()[f'{__name__}:{func.__qualname__}']['counters']['warnings'] == 2
+
+
+def test_profile_is_sorted_by_total():
+    profile = profiling.Profile()
+    profile.add_time('a', 'compute_specs', 1.)
+    profile.add_time('b', 'compute_specs', 2.)
+    profile.add_time('b', 'parse_docstring', 10.)  # Nested phases do not contribute to the total.
+    profile.count('c', 'cache_hits')
+    assert profile.targets() == ['b', 'a', 'c']
+
+
+def test_nothing_recorded_without_profile(base_function):
+    assert profiling.phase(base_function, 'compute_specs') is profiling._NULL
+    assert profiling.count_warnings(base_function) is profiling._NULL
+    with profiling.profile() as profile:
+        pass
+    add_options_from(base_function)
+    assert profile.as_dict() == {}
+
+
+def test_lazy_options_are_recorded(base_function):
+    with profiling.profile() as profile:
+        @click.command()
+        @add_options_from(base_function, lazy=True)
+        def cmd(**kwargs):
+            pass
+
+        assert profile.as_dict() == {}
+        assert len(cmd.params) == 4
+    assert 'create_options' in profile.as_dict()[f'{base_function.__module__}:{base_function.__qualname__}']['phases']
+
+
+SCRIPT = textwrap.dedent('''
+    from click_inspect import add_options_from
+
+    def func(x: int = 1):
+        """Args:
+            x (int): The x.
+        """
+
+    add_options_from(func)
+''')
+
+
+def _run_script(setting):
+    env = dict(os.environ, **{profiling.ENV_VARIABLE: setting})
+    env['PYTHONPATH'] = os.pathsep.join(sys.path)
+    return subprocess.run([sys.executable, '-c', SCRIPT], env=env, check=True, capture_output=True, text=True)
+
+
+def test_environment_variable_prints_report():
+    stderr = _run_script('1').stderr.splitlines()
+    assert stderr[0] == 'click-inspect profile (times in ms)'
+    assert stderr[2].startswith('__main__:func')
+
+
+def test_environment_variable_writes_json(tmp_path):
+    path = tmp_path / 'profile.json'
+    assert _run_script(str(path)).stderr == ''
+    data = json.loads(path.read_text())
+    assert data['__main__:func']['counters']['parameters'] == 1
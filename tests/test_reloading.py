@@ -0,0 +1,149 @@
+import importlib
+import os
+import sys
+import textwrap
+import threading
+
+import click
+from click.testing import CliRunner
+import pytest
+
+from click_inspect import add_options_from, make_command
+from click_inspect.reloading import Reloader
+
+
+SOURCE = '''
+def greet(*, name: str = 'world', punctuation: str = '!'):
+    """Greet.
+
+    Args:
+        name: Who to greet.
+        punctuation: The end of the greeting.
+    """
+    return f'Hello {name}{punctuation}'
+
+
+def count(*, start: int = 0):
+    """Count.
+
+    Args:
+        start: The start.
+    """
+    return start
+'''
+
+
+@pytest.fixture()
+def module(tmp_path, monkeypatch):
+    monkeypatch.syspath_prepend(str(tmp_path))
+    path = tmp_path / 'reloadable.py'
+    path.write_text(SOURCE)
+    module = importlib.import_module('reloadable')
+    yield module
+    sys.modules.pop('reloadable', None)
+
+
+def edit(module, old, new):
+    path = module.__file__
+    with open(path) as fh:
+        source = fh.read()
+    with open(path, 'w') as fh:
+        fh.write(source.replace(textwrap.dedent(old), textwrap.dedent(new)))
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))  # Coarse file system timestamps.
+
+
+def test_reload_replaces_changed_options_only(module):
+    @click.command()
+    @click.option('--verbose', is_flag=True)
+    @add_options_from(module.greet)
+    @add_options_from(module.count)
+    def cmd(**kwargs):
+        click.echo(sorted(kwargs))
+
+    reloader = Reloader(cmd)
+    assert reloader.reload() == []
+    count_params = [p for p in cmd.params if p.name == 'start']
+
+    edit(module, "punctuation: str = '!'", "shout: bool = False")
+    edit(module, 'punctuation: The end of the greeting.', 'shout: Whether to shout.')
+    greet = module.greet
+    assert reloader.reload() == [greet]
+    assert [p.name for p in cmd.params] == ['verbose', 'name', 'shout', 'start']
+    assert [p for p in cmd.params if p.name == 'start'] == count_params  # Untouched.
+    assert cmd.params[2].is_flag and cmd.params[2].help == 'Whether to shout.'
+    assert reloader.reload() == []
+
+
+def test_reload_updates_functions_in_place(module):
+    greet = module.greet
+    command = make_command(greet)
+    reloader = Reloader(command)
+
+    edit(module, "return f'Hello {name}{punctuation}'", "return f'Hi {name}{punctuation}'")
+    assert reloader.reload() == [greet]  # The code changed, the options did not.
+    assert greet() == 'Hi world!'
+    assert CliRunner().invoke(command, ['--name', 'you']).output == 'Hi you!\n'
+
+    edit(module, "name: str = 'world'", "name: str = 'there'")
+    reloader.reload()
+    assert CliRunner().invoke(command, []).output == 'Hi there!\n'
+
+
+def test_reload_skips_unchanged_functions(module):
+    command = make_command(module.count)
+    reloader = Reloader(command)
+    params = list(command.params)
+    edit(module, "return f'Hello", "return f'Bye")
+    assert reloader.reload() == []
+    assert command.params == params
+
+
+def test_reload_warns_about_broken_modules(module):
+    command = make_command(module.count)
+    reloader = Reloader(command)
+    edit(module, 'return start', 'return start +')
+    with pytest.warns(UserWarning, match="Cannot reload 'reloadable'"):
+        assert reloader.reload() == []
+    assert reloader.reload() == []  # Not retried until the file changes again.
+
+
+def test_watch(module):
+    command = make_command(module.count)
+    reloaded = threading.Event()
+    with Reloader(command).watch(interval=0.01, on_reload=lambda functions: reloaded.set()):
+        edit(module, 'start: int = 0', 'start: int = 1')
+        assert reloaded.wait(5)
+    assert command.params[0].default == 1
+
+
+def test_reload_keeps_map_mode(module):
+    @click.command()
+    @add_options_from(module.greet, map_over='name', workers=1)
+    def cmd(name, **kwargs):
+        click.echo(' '.join(name))
+
+    greet = module.greet
+    reloader = Reloader(cmd)
+    edit(module, "return f'Hello {name}{punctuation}'", "return f'Hi {name}{punctuation}'")
+    edit(module, "punctuation: str = '!'", "punctuation: str = '?'")
+    assert reloader.reload() == [greet]
+    assert cmd.params[0].multiple
+    result = CliRunner().invoke(cmd, ['--name', 'xy', '--name', 'z'])
+    assert result.output == 'Hi xy? Hi z?\n'
+
+
+def test_reload_keeps_collapsed_options(module):
+    @click.command()
+    @add_options_from(module.greet, expose=1)
+    def cmd(**kwargs):
+        click.echo(module.greet(**kwargs))
+
+    greet = module.greet
+    reloader = Reloader(cmd)
+    edit(module, "return f'Hello {name}{punctuation}'", "return f'Hi {name}{punctuation}'")
+    edit(module, "punctuation: str = '!'", "punctuation: str = '?'")
+    assert reloader.reload() == [greet]
+    assert [p.name for p in cmd.params] == ['name', 'set']
+    assert CliRunner().invoke(cmd, ['--set', 'punctuation=.']).output == 'Hi world.\n'
+    assert CliRunner().invoke(cmd, []).output == 'Hi world?\n'
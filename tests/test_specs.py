@@ -0,0 +1,56 @@
+import pickle
+
+import click
+import pytest
+
+from click_inspect import inspect_options, OptionSpec
+
+
+def test_inspect_options(base_function):
+    specs = inspect_options(base_function, names={'b': ['-b']}, exclude={'d'})
+    assert specs == [
+        OptionSpec('b', ('-b',), {'default': 1, 'help': 'This one should be added.', 'type': int}),
+        OptionSpec('c', ('--c',), {'required': True, 'help': 'This one should be added too.', 'type': int}),
+        OptionSpec('e', ('--e/--no-e',), {'default': True, 'help': 'Boolean flag.', 'is_flag': True, 'type': bool}),
+    ]
+    assert [spec.name for spec in inspect_options(base_function, include={'e'})] == ['e']
+
+
+def test_inspect_options_returns_new_lists(base_function):
+    inspect_options(base_function).clear()
+    assert len(inspect_options(base_function)) == 4
+
+
+def test_option_spec_is_immutable_and_hashable():
+    spec = OptionSpec('x', ['--x'], {'type': int, 'default': 1})
+    assert spec.opts == ('--x',)
+    assert spec.kwargs == {'default': 1, 'type': int}
+    assert spec.get('type') is int
+    assert spec.get('help') is None
+    spec.kwargs['default'] = 2
+    assert spec.get('default') == 1
+    with pytest.raises(AttributeError):
+        spec.name = 'y'
+    with pytest.raises(AttributeError):
+        spec.extra = 'y'
+    assert not hasattr(spec, '__dict__')
+    assert spec == OptionSpec('x', ('--x',), {'default': 1, 'type': int})
+    assert spec != OptionSpec('x', ('--x',), {'default': 2, 'type': int})
+    assert len({spec, OptionSpec('x', ('--x',), {'default': 1, 'type': int})}) == 1
+    with pytest.raises(TypeError):
+        hash(OptionSpec('x', ('--x',), {'default': []}))
+
+
+def test_option_spec_pickle():
+    spec = OptionSpec('x', ('--x',), {'type': int, 'default': 1, 'multiple': True})
+    assert pickle.loads(pickle.dumps(spec)) == spec
+
+
+def test_option_spec_decorator():
+    @click.command()
+    @OptionSpec('x', ('-x', '--ex'), {'type': int, 'default': 1, 'help': 'The x.'}).decorator()
+    def test(x):
+        pass
+
+    option, = test.params
+    assert (option.name, option.opts, option.type, option.default) == ('ex', ['-x', '--ex'], click.INT, 1)